@@ -0,0 +1,15 @@
+"""
+Micro-benchmarks for rjgtoys.xc
+
+Each module can be run on its own from the top of the source tree,
+for example::
+
+    python -m benchmarks.bench_raise
+
+To run them all, save the results, and compare them with a baseline, use
+:mod:`benchmarks.run`::
+
+    python -m benchmarks.run --save-baseline      # once, to record a baseline
+    python -m benchmarks.run --output results.json
+
+"""
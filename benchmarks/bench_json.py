@@ -0,0 +1,183 @@
+"""
+Benchmarks for decoding JSON problem reports.
+
+Run as a script, this also reports the memory held by a corpus
+of decoded reports, as Things, compact Things and records, and the
+peak memory used to scan a batch of them.
+"""
+
+import atexit
+import gc
+import io
+import os
+import random
+import tempfile
+import tracemalloc
+
+from rjgtoys.xc import Error, Title
+from rjgtoys.xc._json import (
+    json_dumps,
+    json_dumps_iter,
+    json_iter,
+    json_load,
+    json_load_file,
+    json_loads,
+)
+from rjgtoys.xc._thing import record_class
+
+from benchmarks.common import run
+
+
+class NotFound(Error):
+    """A resource was not found."""
+
+    status = 404
+
+    detail = "No {kind} called {name}"
+
+    kind: str = Title("The kind of resource")
+    name: str = Title("The name of the resource")
+
+
+class Conflict(Error):
+    """A resource is in use."""
+
+    status = 409
+
+    detail = "{name} is in use by {owner}"
+
+    name: str = Title("The name of the resource")
+    owner: str = Title("Who is using it")
+    since: int = Title("When they started")
+
+
+class Invalid(Error):
+    """A request was invalid."""
+
+    detail = "Invalid request: {reason}"
+
+    reason: str = Title("What is wrong")
+    fields: list = Title("The fields at fault")
+
+
+# Records for the reports, and the content of each type
+
+RECORDS = [
+    record_class(json_loads(d), name='Record') for d in (
+        '{"content": {}, "detail": "", "instance": "", "status": 0, "title": "", "type": ""}',
+        '{"kind": "", "name": ""}',
+        '{"name": "", "owner": "", "since": 0}',
+        '{"reason": "", "fields": []}',
+    )
+]
+
+# How to decode each way
+
+MODES = {
+    '': {},
+    ' compact': dict(compact=True),
+    ' records': dict(records=RECORDS),
+}
+
+
+def corpus(count=20000, seed=1):
+    """Generate `count` JSON problem reports."""
+
+    rnd = random.Random(seed)
+    docs = []
+    for i in range(count):
+        choice = rnd.randrange(3)
+        if choice == 0:
+            e = NotFound(kind=rnd.choice(['user', 'file', 'order']), name='n%d' % (i))
+        elif choice == 1:
+            e = Conflict(name='r%d' % (i), owner='u%d' % (rnd.randrange(100)), since=i)
+        else:
+            e = Invalid(reason='bad %d' % (i), fields=['f%d' % (i), 'g'])
+        docs.append(json_dumps(e.to_dict()))
+    return docs
+
+
+def retained(docs, **kwargs):
+    """Return the memory held by the decoded forms of `docs`."""
+
+    gc.collect()
+    tracemalloc.start()
+    kept = [json_loads(d, **kwargs) for d in docs]
+    (size, _) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def batch(docs):
+    """Return a batch document that holds `docs`, as bytes."""
+
+    return ('{"errors": [%s]}' % (', '.join(docs))).encode('utf-8')
+
+
+def scan_load(data):
+    return sum(1 for _ in json_load(io.BytesIO(data)).errors)
+
+
+def scan_iter(data):
+    return sum(1 for _ in json_iter(io.BytesIO(data), 'errors.*'))
+
+
+def peak(fn, data):
+    """Return the peak memory used by `fn(data)`."""
+
+    gc.collect()
+    tracemalloc.start()
+    fn(data)
+    (_, size) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size
+
+
+def write_file(data):
+    """Write `data` to a temporary file; return its name."""
+
+    (fd, path) = tempfile.mkstemp(suffix='.json')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    atexit.register(os.unlink, path)
+    return path
+
+
+def load_file(path):
+    with open(path, 'rb') as f:
+        return json_load(f)
+
+
+def cases():
+    doc = corpus(1)[0]
+    data = batch(corpus(1000))
+    path = write_file(batch(corpus(10)))
+    reports = json_loads(data)
+    yield ('json_loads problem report', lambda: json_loads(doc))
+    yield ('json_loads problem report compact', lambda: json_loads(doc, compact=True))
+    yield ('json_loads problem report records', lambda: json_loads(doc, records=RECORDS))
+    yield ('json_load batch of 1000', lambda: scan_load(data))
+    yield ('json_iter batch of 1000', lambda: scan_iter(data))
+    yield ('json_dumps batch of 1000', lambda: json_dumps(reports))
+    yield ('json_dumps_iter batch of 1000', lambda: sum(len(c) for c in json_dumps_iter(reports)))
+    yield ('json_load file of 10', lambda: load_file(path))
+    yield ('json_load_file file of 10', lambda: json_load_file(path))
+
+
+def main():
+    run(cases())
+
+    docs = corpus()
+    for (mode, kwargs) in MODES.items():
+        name = 'retained by %d reports%s' % (len(docs), mode)
+        print("%-48s %12.1f KiB" % (name, retained(docs, **kwargs) / 1024))
+
+    data = batch(docs)
+    for fn in (scan_load, scan_iter):
+        name = 'peak %s of %d reports' % (fn.__name__, len(docs))
+        print("%-48s %12.1f KiB" % (name, peak(fn, data) / 1024))
+
+
+if __name__ == '__main__':
+    main()
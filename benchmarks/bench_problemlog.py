@@ -0,0 +1,57 @@
+"""
+Benchmarks for reading problem logs.
+
+The cases use a single process; run as a script, this also reports
+how the time to read a larger log scales with the number of workers.
+"""
+
+import atexit
+import os
+import shutil
+import tempfile
+import time
+
+from rjgtoys.xc.problemlog import log_stats, read_log
+
+from benchmarks.bench_json import corpus
+from benchmarks.common import run
+
+
+def write_log(count):
+    """Write a log of `count` reports in a temporary directory; return its name."""
+
+    directory = tempfile.mkdtemp()
+    atexit.register(shutil.rmtree, directory, True)
+
+    path = os.path.join(directory, 'errors.log')
+    with open(path, 'w') as f:
+        for doc in corpus(count):
+            f.write(doc + '\n')
+    return path
+
+
+def count_problems(path, workers):
+    return sum(1 for _ in read_log(path, workers=workers))
+
+
+def cases():
+    path = write_log(1000)
+    yield ('log_stats 1000 reports', lambda: log_stats(path, workers=1))
+    yield ('read_log 1000 reports', lambda: count_problems(path, workers=1))
+
+
+def main():
+    run(cases())
+
+    path = write_log(200000)
+    size = os.path.getsize(path)
+    for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+        for fn in (log_stats, count_problems):
+            start = time.perf_counter()
+            fn(path, workers=workers)
+            elapsed = time.perf_counter() - start
+            print("%-36s %2d workers %8.1f MB/s" % (fn.__name__, workers, size / elapsed / 1e6))
+
+
+if __name__ == '__main__':
+    main()
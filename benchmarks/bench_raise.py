@@ -0,0 +1,102 @@
+"""
+Compare the cost of raising and catching default and lightweight XCs.
+
+Each exception is raised a few frames below the handler, through
+a function decorated with :func:`raises`.  The handler keeps
+the exceptions it catches, which is where the lightweight mode
+makes a difference: default exceptions keep all the frames they
+passed through (and their local variables) alive.
+"""
+
+import gc
+import tracemalloc
+
+from rjgtoys.xc import Error
+from rjgtoys.xc.raises import raises
+
+from benchmarks.common import run
+
+
+class HeavyMiss(Error):
+    """A cache miss, raised in the default way."""
+
+    key: str
+
+
+class LightMiss(Error):
+    """A cache miss, raised in lightweight mode."""
+
+    lightweight = True
+
+    key: str
+
+
+def _lookup(exc, depth):
+    padding = bytearray(1024)  # a local that a retained frame keeps alive
+    if depth:
+        return _lookup(exc, depth - 1)
+    raise exc(key='missing')
+
+
+@raises(HeavyMiss)
+def heavy(depth):
+    return _lookup(HeavyMiss, depth)
+
+
+@raises(LightMiss)
+def light(depth):
+    return _lookup(LightMiss, depth)
+
+
+def catch(f, depth, keep):
+    try:
+        f(depth)
+    except Error as e:
+        if keep is not None:
+            keep.append(e.detach() if e.lightweight else e)
+
+
+DEPTH = 5
+
+
+def cases():
+    yield ('raise/catch default', lambda: catch(heavy, DEPTH, None))
+    yield ('raise/catch lightweight', lambda: catch(light, DEPTH, None))
+
+    kept = []
+
+    def keep_heavy():
+        catch(heavy, DEPTH, kept)
+        del kept[:]
+
+    def keep_light():
+        catch(light, DEPTH, kept)
+        del kept[:]
+
+    yield ('raise/catch/keep default', keep_heavy)
+    yield ('raise/catch/keep lightweight', keep_light)
+
+
+def retained(f, count=1000):
+    """Return the memory held by `count` caught exceptions."""
+
+    gc.collect()
+    tracemalloc.start()
+    kept = []
+    for _ in range(count):
+        catch(f, DEPTH, kept)
+    (size, _) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size
+
+
+def main():
+    run(cases())
+    for (name, f) in (('default', heavy), ('lightweight', light)):
+        print(
+            "%-48s %12.1f KiB" % ('retained by 1000 %s' % (name), retained(f) / 1024)
+        )
+
+
+if __name__ == '__main__':
+    main()
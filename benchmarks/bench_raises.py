@@ -0,0 +1,36 @@
+"""
+Benchmark the overhead per call of the :func:`raises` decorator.
+"""
+
+from rjgtoys.xc import Error
+from rjgtoys.xc.raises import raises
+
+from benchmarks.common import run
+
+
+class Declared(Error):
+    """An exception that may be raised."""
+
+
+def plain(x):
+    return x
+
+
+@raises(Declared)
+def declared(x):
+    return x
+
+
+@raises(Declared, result=True)
+def declared_result(x):
+    return x
+
+
+def cases():
+    yield ('undecorated call', lambda: plain(1))
+    yield ('@raises call', lambda: declared(1))
+    yield ('@raises(result=True) call', lambda: declared_result(1))
+
+
+if __name__ == '__main__':
+    run(cases())
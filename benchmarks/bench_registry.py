@@ -0,0 +1,49 @@
+"""
+Benchmark :meth:`XC.from_obj` against class trees of different sizes.
+
+Creating the larger trees takes a few seconds.
+"""
+
+from rjgtoys.xc import Error
+
+from benchmarks.common import run
+
+
+SIZES = (10, 100, 1000, 10000)
+
+
+def make_tree(size):
+    """Make a base class with `size` subclasses; return the base and a document
+    for the last subclass."""
+
+    base = type(
+        'Base%d' % (size),
+        (Error,),
+        {'__module__': __name__, '__doc__': "Base of %d" % (size)},
+    )
+
+    for i in range(size):
+        leaf = type(
+            'Leaf%d_%d' % (size, i),
+            (base,),
+            {
+                '__module__': __name__,
+                '__doc__': "Leaf %d" % (i),
+                '__annotations__': {'n': int},
+            },
+        )
+
+    return (base, leaf(n=1).to_dict())
+
+
+def cases():
+    for size in SIZES:
+        (base, doc) = make_tree(size)
+        yield (
+            'from_obj %d classes' % (size),
+            lambda base=base, doc=doc: base.from_obj(doc),
+        )
+
+
+if __name__ == '__main__':
+    run(cases())
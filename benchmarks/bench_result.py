@@ -0,0 +1,90 @@
+"""
+Compare raising and catching exceptions with returning a :class:`Result`,
+for lookups that fail at different rates.
+
+Each case performs 100 lookups, of which the given
+percentage miss.
+"""
+
+from rjgtoys.xc import Error, Ok, Err
+from rjgtoys.xc.raises import raises
+
+from benchmarks.common import run
+
+
+class Missing(Error):
+    """A lookup failed."""
+
+    key: int
+
+
+TABLE = {}
+
+
+def lookup_raise(key):
+    try:
+        return TABLE[key]
+    except KeyError:
+        raise Missing(key=key)
+
+
+def lookup_result(key):
+    try:
+        return Ok(TABLE[key])
+    except KeyError:
+        return Err(Missing, key=key)
+
+
+@raises(Missing)
+def lookup_raise_declared(key):
+    return lookup_raise(key)
+
+
+@raises(Missing, result=True)
+def lookup_result_declared(key):
+    return lookup_result(key)
+
+
+def use_raise(lookup, keys):
+    found = 0
+    for k in keys:
+        try:
+            lookup(k)
+            found += 1
+        except Missing:
+            pass
+    return found
+
+
+def use_result(lookup, keys):
+    found = 0
+    for k in keys:
+        if lookup(k):
+            found += 1
+    return found
+
+
+def keys_for(rate):
+    """Return 100 keys, of which `rate` percent are missing."""
+
+    TABLE.update((k, k) for k in range(100))
+    return [k + (1000 if k < rate else 0) for k in range(100)]
+
+
+def cases():
+    for rate in (0, 1, 10, 50, 90):
+        keys = keys_for(rate)
+        yield ('raise %d%% miss' % (rate), lambda keys=keys: use_raise(lookup_raise, keys))
+        yield ('result %d%% miss' % (rate), lambda keys=keys: use_result(lookup_result, keys))
+        yield (
+            '@raises raise %d%% miss' % (rate),
+            lambda keys=keys: use_raise(lookup_raise_declared, keys),
+        )
+        yield (
+            '@raises result %d%% miss' % (rate),
+            lambda keys=keys: use_result(lookup_result_declared, keys),
+        )
+
+
+if __name__ == '__main__':
+    run(cases())
@@ -0,0 +1,91 @@
+"""
+Benchmarks for :class:`Thing`.
+"""
+
+from rjgtoys.xc._thing import Thing, ThingChain, ThingPaths, compile_path
+from rjgtoys.xc._json import json_loads
+
+from benchmarks.common import run
+
+
+DOC = json_loads(
+    '{"a": {"b": {"c": {"d": 1}}}, "x": 2, "list": [1, 2, 3],'
+    ' "server": {"host": "localhost", "port": 8000}}'
+)
+
+
+def layer(i):
+    return json_loads(
+        '{"server": {"port": %d, "options": {"debug": false, "n%d": %d}}, "k%d": %d}'
+        % (8000 + i, i, i, i, i)
+    )
+
+
+def legacy_getitem(thing, name):
+    """The dotted lookup that :meth:`Thing.__getitem__` used to do."""
+
+    try:
+        return dict.__getitem__(thing, name)
+    except KeyError:
+        if '.' not in name:
+            raise
+
+    (prefix, tail) = name.split('.', 1)
+
+    return legacy_getitem(thing[prefix], tail)
+
+
+def copied(value):
+    """Copy nested mappings."""
+
+    if isinstance(value, dict):
+        return Thing((k, copied(v)) for (k, v) in value.items())
+    return value
+
+
+def merge(layers):
+    """Merge layers with :meth:`Thing.merge`.
+
+    That changes mappings of the layers in place, so it is given copies
+    of them; the time includes making those.
+    """
+
+    result = Thing()
+    for l in layers:
+        result.merge(copied(l))
+    return result
+
+
+def cases():
+    yield ('attribute access', lambda: DOC.x)
+    yield ('item access', lambda: DOC['x'])
+    yield ('dotted access depth 2', lambda: DOC['server.port'])
+    yield ('dotted access depth 4', lambda: DOC['a.b.c.d'])
+    yield ('chained attribute access depth 4', lambda: DOC.a.b.c.d)
+    yield ('legacy dotted access depth 4', lambda: legacy_getitem(DOC, 'a.b.c.d'))
+
+    path = compile_path('a.b.c.d')
+    yield ('compiled path depth 4', lambda: path.get(DOC))
+    yield ('get_path depth 4', lambda: DOC.get_path('a.b.c.d'))
+
+    names = ('a.b.c.d', 'server.host', 'server.port')
+    paths = ThingPaths(names)
+    yield ('legacy dotted access 3 paths', lambda: [legacy_getitem(DOC, n) for n in names])
+    yield ('ThingPaths 3 paths', lambda: paths.get(DOC))
+
+    layers = [layer(i) for i in range(10)]
+    chain = ThingChain(*reversed(layers))
+    yield ('ThingChain dotted access 10 layers', lambda: chain['server.options.n0'])
+    yield ('ThingChain attribute access 10 layers', lambda: chain.server.options.n0)
+    yield (
+        'ThingChain uncached access 10 layers',
+        lambda: (chain.invalidate(), chain['server.options.n0']),
+    )
+
+    yield ('merge 10 layers', lambda: merge(layers))
+    yield ('copy 10 layers', lambda: [copied(l) for l in layers])
+    yield ('merged 10 layers', lambda: Thing.merged(*layers))
+
+
+if __name__ == '__main__':
+    run(cases())
@@ -0,0 +1,56 @@
+"""
+Benchmarks for the basic operations on XC exceptions.
+"""
+
+from rjgtoys.xc import Error, Title
+from rjgtoys.xc._json import json_dumps, json_loads
+
+from benchmarks.common import run
+
+
+class Plain(Error):
+    """An exception with no fields."""
+
+    detail = "Plain error"
+
+
+class Fielded(Error):
+    """An exception with some fields."""
+
+    name: str = Title("A name")
+    code: int = Title("A code")
+    tags: list = []
+
+    detail = "Fielded error: name={name} code={code}"
+
+
+def raise_catch():
+    try:
+        raise Fielded(name='n', code=1)
+    except Error as e:
+        return e
+
+
+def cases():
+    yield ('construct without fields', lambda: Plain())
+    yield ('construct with fields', lambda: Fielded(name='n', code=1, tags=['a']))
+    yield ('raise/catch', raise_catch)
+
+    e = Fielded(name='n', code=1, tags=['a', 'b'])
+    yield ('__str__', e.__str__)
+    yield ('to_dict', e.to_dict)
+    yield ('to_bytes', e.to_bytes)
+
+    d = e.to_dict()
+    text = json_dumps(d)
+    data = e.to_bytes()
+    yield ('from_obj', lambda: Error.from_obj(d))
+    yield ('from_bytes', lambda: Error.from_bytes(data))
+    yield ('from_json', lambda: Error.from_json(text))
+    yield ('json_dumps problem', lambda: json_dumps(d))
+    yield ('json_loads problem', lambda: json_loads(text))
+    yield ('json round trip', lambda: Error.from_json(json_dumps(e.to_dict())))
+
+
+if __name__ == '__main__':
+    run(cases())
@@ -0,0 +1,60 @@
+"""
+Benchmarks for loading YAML into Things.
+
+These need PyYAML; without it, there are no cases.
+"""
+
+import atexit
+import os
+import tempfile
+
+from rjgtoys.xc._thing import Thing
+
+from benchmarks.common import run
+
+
+def config(count=200):
+    """Return a YAML document like a largish configuration file."""
+
+    lines = []
+    for i in range(count):
+        lines.append('service%d:' % (i))
+        lines.append('  host: host%d.example.com' % (i))
+        lines.append('  port: %d' % (8000 + i))
+        lines.append('  tags: [a, b, c]')
+        lines.append('  limits: {cpu: 2, memory: 512}')
+    return '\n'.join(lines) + '\n'
+
+
+def to_thing(obj):
+    """Convert what :func:`yaml.load` returns into Things, the way it used to be done."""
+
+    if isinstance(obj, dict):
+        return Thing((k, to_thing(v)) for (k, v) in obj.items())
+    if isinstance(obj, list):
+        return [to_thing(v) for v in obj]
+    return obj
+
+
+def cases():
+    try:
+        import yaml
+    except ImportError:
+        return
+
+    from rjgtoys.xc._yaml import yaml_load_file, yaml_loads
+
+    text = config()
+
+    (fd, path) = tempfile.mkstemp(suffix='.yaml')
+    with os.fdopen(fd, 'w') as f:
+        f.write(text)
+    atexit.register(os.unlink, path)
+
+    yield ('safe_load and convert', lambda: to_thing(yaml.safe_load(text)))
+    yield ('yaml_loads', lambda: yaml_loads(text))
+    yield ('yaml_load_file cached', lambda: yaml_load_file(path))
+
+
+if __name__ == '__main__':
+    run(cases())
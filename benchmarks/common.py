@@ -0,0 +1,31 @@
+"""
+Support shared by the benchmark modules.
+
+Each benchmark module provides a function `cases()` that
+generates `(name, callable)` pairs; each callable performs
+the operation being measured once.
+"""
+
+import timeit
+
+
+def measure(fn, repeat=5):
+    """Return the best time, in seconds, for one call of `fn`."""
+
+    timer = timeit.Timer(fn)
+    (number, _) = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run(cases):
+    """Measure and report each of a set of cases.
+
+    Returns a dict that maps case names to times in seconds.
+    """
+
+    results = {}
+    for (name, fn) in cases:
+        t = measure(fn)
+        results[name] = t
+        print("%-48s %12.3f us" % (name, t * 1e6))
+    return results
@@ -0,0 +1,153 @@
+"""
+Run all the benchmarks, save the results and compare them with a baseline.
+
+Usage::
+
+    python -m benchmarks.run [--output FILE] [--baseline FILE]
+                             [--save-baseline] [--threshold RATIO]
+                             [--only PATTERN]
+
+Results are saved as JSON: a dict with members `python`, `platform`
+and `results`; the last maps `module:case` names to the time for
+one operation, in seconds.
+
+When a baseline is available, each result is compared with it, and
+the exit status is non-zero if any case is slower than the baseline
+by more than the threshold ratio.
+
+Timings depend on the machine, so no baseline is kept in the source
+tree; the default, ``benchmarks/baseline.json``, is ignored by git.
+Record one on the machine that will do the comparison, from the code
+you want to compare against, for example::
+
+    git stash                                   # or check out the base revision
+    python -m benchmarks.run --save-baseline
+    git stash pop
+    python -m benchmarks.run
+
+Use ``--baseline FILE`` to keep several.
+"""
+
+import argparse
+import fnmatch
+import importlib
+import json
+import os
+import pkgutil
+import platform
+import sys
+
+from benchmarks.common import measure
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_BASELINE = os.path.join(HERE, 'baseline.json')
+
+
+def bench_modules():
+    """Generate the names of all the benchmark modules."""
+
+    for info in sorted(pkgutil.iter_modules([HERE]), key=lambda i: i.name):
+        if info.name.startswith('bench_'):
+            yield info.name
+
+
+def run_all(pattern='*'):
+    """Run every case whose `module:case` name matches `pattern`."""
+
+    # Don't even import modules that can't match; some have expensive setup
+
+    (module_pattern, sep, _) = pattern.partition(':')
+    if not sep:
+        module_pattern = '*'
+
+    results = {}
+    for name in bench_modules():
+        if not fnmatch.fnmatch(name, module_pattern):
+            continue
+        module = importlib.import_module('benchmarks.' + name)
+        for (case, fn) in module.cases():
+            key = '%s:%s' % (name, case)
+            if not fnmatch.fnmatch(key, pattern):
+                continue
+            t = measure(fn)
+            results[key] = t
+            print("%-64s %12.3f us" % (key, t * 1e6))
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Compare results with a baseline; return the names of the regressions."""
+
+    regressions = []
+    print()
+    print("%-64s %10s" % ('Comparison with baseline', 'ratio'))
+    for (key, t) in sorted(results.items()):
+        try:
+            base = baseline[key]
+        except KeyError:
+            continue
+        ratio = t / base
+        flag = ''
+        if ratio > threshold:
+            flag = '  SLOWER'
+            regressions.append(key)
+        elif ratio < 1 / threshold:
+            flag = '  faster'
+        print("%-64s %10.2f%s" % (key, ratio, flag))
+    return regressions
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser('python -m benchmarks.run')
+    p.add_argument('--output', help="File in which to save the results")
+    p.add_argument(
+        '--baseline', default=DEFAULT_BASELINE, help="Results to compare with"
+    )
+    p.add_argument(
+        '--save-baseline',
+        action='store_true',
+        help="Save the results as the new baseline",
+    )
+    p.add_argument(
+        '--threshold',
+        type=float,
+        default=1.25,
+        help="Slow-down ratio that counts as a regression",
+    )
+    p.add_argument('--only', default='*', help="Only run cases matching this pattern")
+    args = p.parse_args(argv)
+
+    results = run_all(args.only)
+
+    doc = dict(
+        python=sys.version,
+        platform=platform.platform(),
+        results=results,
+    )
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(doc, f, indent=2, sort_keys=True)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(doc, f, indent=2, sort_keys=True)
+        return 0
+
+    try:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+    except FileNotFoundError:
+        print("No baseline in %s; record one with --save-baseline" % (args.baseline))
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print("%d regression(s)" % (len(regressions)))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
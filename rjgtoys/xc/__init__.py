@@ -1,8 +1,14 @@
 """
 Control imports for XC
+
+Declaring exceptions needs only what is imported here.  Other
+parts of the package, some of which need heavier dependencies,
+are imported when first used, by :func:`__getattr__`.
 """
 
-from ._xc import XC, Title
+import importlib
+
+from ._xc import XC, Title, UnknownXC, _Title, declare_types
 
 # The following are put here simply so that their fully qualified
 # names do not include _xc
@@ -29,7 +35,8 @@ class Error(XC):
 
 
 class _ExceptionField:
-    """Allows a Pydantic model to have fields that hold an exception value."""
+    """Allows a Pydantic model to have fields that hold an exception value,
+    or a summary of one."""
 
     @classmethod
     def __get_validators__(cls):
@@ -37,22 +44,55 @@ class _ExceptionField:
 
     @classmethod
     def _validate(cls, v):
-        assert isinstance(v, Exception)
+        from ._summary import ExceptionSummary
+
+        if isinstance(v, dict):
+            return ExceptionSummary.parse_obj(v)
+        assert isinstance(v, (Exception, ExceptionSummary))
         return v
 
+    @classmethod
+    def __modify_schema__(cls, field_schema):
+        from ._summary import ExceptionSummary
+
+        # The JSON form is always a summary
+
+        schema = ExceptionSummary.schema()
+        field_schema.update(
+            type='object', properties=schema['properties'], required=schema['required']
+        )
+
 
 class BadExceptionBug(Bug):
     """Raised when some function or method raises an exception
     that it has not declared itself capable of raising.
 
     :param raised: The exception that was raised (and which is
-            not in the allowed set)
+            not in the allowed set), or an :class:`ExceptionSummary` of it
+
+    The JSON representation always holds a summary of the exception.
     """
 
-    raised: _ExceptionField = Title("The disallowed exception")
+    raised: _ExceptionField = _Title("The disallowed exception")
 
     detail = "Disallowed exception raised: {raised}"
 
+    def _summary(self):
+        from ._summary import ExceptionSummary
+
+        raised = self.raised
+        if isinstance(raised, Exception):
+            raised = ExceptionSummary.from_exception(raised)
+        return raised
+
+    def __str__(self):
+        return self.detail.format(raised=self._summary())
+
+    def _content_dict(self):
+        content = super()._content_dict()
+        content['raised'] = self._summary().dict()
+        return content
+
 
 class BadExceptionsInTestBug(Bug):
 
@@ -69,3 +109,31 @@ class BadExceptionsInTestBug(Bug):
 
     def unpack(self):
         self.exclist = ", ".join(map(repr, self.exceptions))
+
+
+# Names that are imported when first used, and where they come from
+
+_LAZY = {
+    'ExceptionSummary': '._summary',
+    'set_schema_cache': '._schema',
+    'Result': '._result',
+    'Ok': '._result',
+    'Err': '._result',
+    'XCGroup': '._group',
+    'XCCollector': '._group',
+}
+
+
+def __getattr__(name):
+    try:
+        module = _LAZY[name]
+    except KeyError:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()).union(_LAZY))
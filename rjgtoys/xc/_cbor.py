@@ -0,0 +1,241 @@
+"""
+A small CBOR (RFC 8949) encoder and decoder, used for the compact
+binary form of :class:`XC` exceptions.
+
+Only the subset of CBOR needed to carry JSON-like data is supported:
+integers, floats, strings, bytes, arrays, maps, booleans and null.
+As with :func:`json_dumps`, map keys are sorted so that the output
+is consistent and repeatable.
+
+Maps are decoded as :class:`Thing`.
+"""
+
+import struct
+
+from ._thing import Thing
+
+
+_PACK_FLOAT = struct.Struct('>d').pack
+_UNPACK_FLOAT = struct.Struct('>d').unpack_from
+
+_UINT_FORMATS = {
+    24: struct.Struct('>B'),
+    25: struct.Struct('>H'),
+    26: struct.Struct('>I'),
+    27: struct.Struct('>Q'),
+}
+
+# Tags for bignums that don't fit in 64 bits
+
+_TAG_POS_BIGNUM = 2
+_TAG_NEG_BIGNUM = 3
+
+_SIMPLE_VALUES = {20: False, 21: True, 22: None}
+
+# Initial bytes of items that are decoded in line: unsigned
+# integers below 24, and text strings of fewer than 24 bytes
+
+_SMALL_INT_END = 0x18
+_SHORT_STR = 0x60
+_SHORT_STR_END = 0x78
+
+
+def _head(out, major, n):
+    """Append a CBOR item head to `out`."""
+
+    major <<= 5
+    if n < 24:
+        out.append(major | n)
+    elif n < 0x100:
+        out.append(major | 24)
+        out.append(n)
+    elif n < 0x10000:
+        out.append(major | 25)
+        out += n.to_bytes(2, 'big')
+    elif n < 0x100000000:
+        out.append(major | 26)
+        out += n.to_bytes(4, 'big')
+    else:
+        out.append(major | 27)
+        out += n.to_bytes(8, 'big')
+
+
+def _encode(out, obj):
+    """Append the encoding of `obj` to `out`."""
+
+    t = type(obj)
+
+    if t is str:
+        b = obj.encode('utf-8')
+        _head(out, 3, len(b))
+        out += b
+    elif t is bool:
+        out.append(0xF5 if obj else 0xF4)
+    elif t is int:
+        if 0 <= obj < 0x10000000000000000:
+            _head(out, 0, obj)
+        elif -0x10000000000000000 <= obj < 0:
+            _head(out, 1, -1 - obj)
+        else:
+            (tag, n) = (
+                (_TAG_POS_BIGNUM, obj) if obj >= 0 else (_TAG_NEG_BIGNUM, -1 - obj)
+            )
+            b = n.to_bytes((n.bit_length() + 7) // 8, 'big')
+            _head(out, 6, tag)
+            _head(out, 2, len(b))
+            out += b
+    elif t is float:
+        out.append(0xFB)
+        out += _PACK_FLOAT(obj)
+    elif obj is None:
+        out.append(0xF6)
+    elif isinstance(obj, dict):
+        _head(out, 5, len(obj))
+        for k in sorted(obj):
+            _encode(out, k)
+            _encode(out, obj[k])
+    elif isinstance(obj, (list, tuple)):
+        _head(out, 4, len(obj))
+        for item in obj:
+            _encode(out, item)
+    elif isinstance(obj, (bytes, bytearray)):
+        _head(out, 2, len(obj))
+        out += obj
+    elif isinstance(obj, str):
+        _encode(out, str(obj))
+    elif isinstance(obj, int):
+        _encode(out, int(obj))
+    elif isinstance(obj, float):
+        _encode(out, float(obj))
+    else:
+        raise TypeError(
+            "Object of type %s is not CBOR serializable" % (type(obj).__name__)
+        )
+
+
+def cbor_dumps(obj):
+    """Produce consistent repeatable CBOR from an object."""
+
+    out = bytearray()
+    _encode(out, obj)
+    return bytes(out)
+
+
+def _decode(data, pos, object_hook):
+    """Decode the item at `pos` in `data`, returning it and the next position.
+
+    Short strings and small integers, which are most of what exceptions
+    carry, are decoded in line by the loops over arrays and maps, rather
+    than by a call for each.
+    """
+
+    initial = data[pos]
+    pos += 1
+
+    major = initial >> 5
+    n = initial & 0x1F
+
+    if major == 7:
+        if n == 27:
+            return (_UNPACK_FLOAT(data, pos)[0], pos + 8)
+        try:
+            return (_SIMPLE_VALUES[n], pos)
+        except KeyError:
+            raise ValueError(
+                "Unsupported CBOR simple value %d at offset %d" % (n, pos - 1)
+            )
+
+    if n >= 24:
+        try:
+            fmt = _UINT_FORMATS[n]
+        except KeyError:
+            raise ValueError(
+                "Unsupported CBOR additional information %d at offset %d"
+                % (n, pos - 1)
+            )
+        n = fmt.unpack_from(data, pos)[0]
+        pos += fmt.size
+
+    if major == 3:
+        end = pos + n
+        if end > len(data):
+            raise ValueError("Truncated CBOR data at offset %d" % (pos))
+        return (data[pos:end].decode(), end)
+    if major == 0:
+        return (n, pos)
+    if major == 5:
+        pairs = {}
+        size = len(data)
+        for _ in range(n):
+            b = data[pos]
+            if _SHORT_STR <= b < _SHORT_STR_END:
+                end = pos + b - _SHORT_STR + 1
+                if end > size:
+                    raise ValueError("Truncated CBOR data at offset %d" % (pos))
+                k = data[pos + 1 : end].decode()
+                pos = end
+            else:
+                (k, pos) = _decode(data, pos, object_hook)
+            b = data[pos]
+            if b < _SMALL_INT_END:
+                pairs[k] = b
+                pos += 1
+            elif _SHORT_STR <= b < _SHORT_STR_END:
+                end = pos + b - _SHORT_STR + 1
+                if end > size:
+                    raise ValueError("Truncated CBOR data at offset %d" % (pos))
+                pairs[k] = data[pos + 1 : end].decode()
+                pos = end
+            else:
+                (pairs[k], pos) = _decode(data, pos, object_hook)
+        return (object_hook(pairs), pos)
+    if major == 4:
+        items = []
+        size = len(data)
+        for _ in range(n):
+            b = data[pos]
+            if b < _SMALL_INT_END:
+                items.append(b)
+                pos += 1
+            elif _SHORT_STR <= b < _SHORT_STR_END:
+                end = pos + b - _SHORT_STR + 1
+                if end > size:
+                    raise ValueError("Truncated CBOR data at offset %d" % (pos))
+                items.append(data[pos + 1 : end].decode())
+                pos = end
+            else:
+                (v, pos) = _decode(data, pos, object_hook)
+                items.append(v)
+        return (items, pos)
+    if major == 1:
+        return (-1 - n, pos)
+    if major == 2:
+        end = pos + n
+        if end > len(data):
+            raise ValueError("Truncated CBOR data at offset %d" % (pos))
+        return (bytes(data[pos:end]), end)
+
+    # major == 6: a tag
+
+    if n in (_TAG_POS_BIGNUM, _TAG_NEG_BIGNUM):
+        (b, pos) = _decode(data, pos, object_hook)
+        v = int.from_bytes(b, 'big')
+        return (v if n == _TAG_POS_BIGNUM else -1 - v, pos)
+    raise ValueError("Unsupported CBOR tag %d at offset %d" % (n, pos))
+
+
+def cbor_loads(data, object_hook=None):
+    """Load an object from CBOR, returning maps as :class:`Thing`."""
+
+    # Slices of bytes can be decoded directly, which is quickest
+
+    if type(data) is not bytes:
+        data = bytes(data)
+
+    try:
+        (result, pos) = _decode(data, 0, object_hook or Thing)
+    except (IndexError, struct.error):
+        raise ValueError("Truncated CBOR data")
+    if pos != len(data):
+        raise ValueError("Extra data after CBOR item at offset %d" % (pos))
+    return result
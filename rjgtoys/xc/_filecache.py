@@ -0,0 +1,80 @@
+"""
+A cache of things loaded from files.
+
+Each entry is checked against the modification time, size and inode
+of its file whenever it is used, so a changed file is simply loaded
+again.   The least recently used entries are dropped when the cache is full.
+
+The values are shared by everyone who loads the same file, so the
+loader should make something that can't be changed.
+
+.. autoclass:: FileCache
+   :members:
+
+"""
+
+import collections
+import os
+import threading
+
+
+def _stamp(st):
+    """Return what identifies a version of a file, from its status."""
+
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class FileCache:
+    """Load files, and keep what was loaded from them.
+
+    :param load: A function that makes a value from the content of a file, as bytes
+    :param maxsize: The largest number of files to keep
+    """
+
+    def __init__(self, load, maxsize=64):
+        self.load = load
+        self.maxsize = maxsize
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path):
+        """Return the value loaded from a file, loading it if need be."""
+
+        path = os.path.abspath(os.fspath(path))
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == _stamp(os.stat(path)):
+                self._entries.move_to_end(path)
+                return entry[1]
+
+        # Read it all at once, and take the stamp from the file that was read
+
+        with open(path, 'rb') as f:
+            stamp = _stamp(os.fstat(f.fileno()))
+            data = f.read()
+
+        value = self.load(data)
+
+        with self._lock:
+            self._entries[path] = (stamp, value)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+        return value
+
+    def discard(self, path):
+        """Forget what was loaded from a file."""
+
+        with self._lock:
+            self._entries.pop(os.path.abspath(os.fspath(path)), None)
+
+    def clear(self):
+        """Forget everything."""
+
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
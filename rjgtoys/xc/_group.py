@@ -0,0 +1,203 @@
+"""
+Groups of exceptions that are reported together.
+
+.. autoexception:: XCGroup
+
+.. autoclass:: XCCollector
+
+"""
+
+from rjgtoys.xc import Error
+from rjgtoys.xc._xc import XC, _compact_json, _unpickle
+
+# ExceptionGroup is only built in from Python 3.11
+
+try:
+    _GROUP_BASES = (ExceptionGroup,)
+except NameError:
+    _GROUP_BASES = ()
+
+
+class XCGroup(Error, *_GROUP_BASES):
+    """Several errors, reported together.
+
+    The members are available as the `exceptions` attribute.
+
+    Where Python provides :exc:`ExceptionGroup`, this is a subclass of it,
+    so ``except*`` can be used to handle the members.
+
+    The RFC7807 representation is the usual problem report, with an
+    extra `errors` member that holds the reports for the members.
+
+    :param errors: The member exceptions; each must be an :class:`XC`
+    :param message: A description of the group as a whole
+    """
+
+    # Keep the name independent of where this happens to be defined
+
+    typename = 'rjgtoys.xc.XCGroup'
+
+    message: str = "Multiple errors"
+
+    detail = "{message}"
+
+    def __new__(cls, errors, **kwargs):
+        errors = list(errors)
+        for e in errors:
+            if not isinstance(e, XC):
+                raise TypeError("%s members must be XC, not %r" % (cls.__name__, e))
+
+        message = kwargs.get('message', cls._model.__fields__['message'].default)
+        if _GROUP_BASES:
+            return super().__new__(cls, message, errors)
+
+        self = super().__new__(cls)
+        self.exceptions = tuple(errors)
+        self.args = (message, errors)
+        return self
+
+    def __init__(self, errors, **kwargs):
+        # Keep the args set by __new__, as ExceptionGroup does
+
+        args = self.args
+        super().__init__(**kwargs)
+        self.args = args
+
+    def __reduce__(self):
+        # As for XC, but the members must be passed to __new__
+
+        content = self._content
+        args = (type(self), content.__dict__, content.__fields_set__, list(self.exceptions))
+        return (_unpickle, args)
+
+    def derive(self, excs):
+        """Make a group like this one, with different members.
+
+        This is used by :meth:`ExceptionGroup.split` and ``except*``.
+        """
+
+        return self.__class__(excs, **self._content.dict())
+
+    def to_dict(self, budget=None):
+        """Produce the problem report for the group, with an `errors` member.
+
+        If there is a `budget` (see :meth:`XC.to_dict`), it applies to
+        each member, and the `errors` array is limited to about that many
+        characters too, though it always holds at least one report.   If
+        any are dropped, `truncated` has an entry for `errors` that gives
+        the number of members and the number that were kept.
+        """
+
+        data = super().to_dict(budget=budget)
+
+        if budget is None:
+            budget = self.size_budget
+
+        errors = []
+        used = 2
+        for e in self.exceptions:
+            report = e.to_dict(budget=budget)
+            if budget is not None:
+                used += len(_compact_json(report)) + 1
+                if used > budget and errors:
+                    break
+            errors.append(report)
+
+        data['errors'] = errors
+        if len(errors) < len(self.exceptions):
+            truncated = data.setdefault('truncated', {})
+            truncated['errors'] = dict(length=len(self.exceptions), kept=len(errors))
+        return data
+
+    @classmethod
+    def _from_document(cls, data):
+        errors = [XC.from_obj(e) for e in data['errors']]
+        return cls(errors, **data['content'])
+
+    @classmethod
+    def _construct(cls, values, fields_set=None, errors=()):
+        message = values.get('message', cls._model.__fields__['message'].default)
+        self = super()._construct(values, fields_set, errors, message=message)
+        self.args = (message, list(errors))
+        return self
+
+    @classmethod
+    def _construct_document(cls, data):
+        errors = [XC.from_obj(e) for e in data.get('errors', ())]
+        return cls._construct(data.get('content', {}), None, errors)
+
+    def _to_parts(self):
+        parts = super()._to_parts()
+        parts.append([e._to_parts() for e in self.exceptions])
+        return parts
+
+    @classmethod
+    def _from_parts(cls, parts):
+        errors = [XC._decode_parts(p) for p in parts[2]]
+        return cls(errors, **parts[1])
+
+
+class XCCollector:
+    """Collects errors, for example while validating a batch of items,
+    so that they can be reported together as an :exc:`XCGroup`.
+
+    Identical errors (the same class, with the same content) are
+    only collected once.
+
+    An error can be added as an exception, or as an exception class and
+    its content; in the latter case, the exception itself is only constructed
+    when the group is made, and duplicates are never constructed at all::
+
+        errors = XCCollector()
+        for item in batch:
+            if item.size > limit:
+                errors.add(TooBig, id=item.id, size=item.size)
+        errors.check()
+
+    :param message: The message for the group
+    """
+
+    def __init__(self, message=None):
+        self.message = message
+        self._errors = {}
+
+    def add(self, error, **content):
+        """Add an error: an :class:`XC` instance, or an :class:`XC` subclass and content."""
+
+        if isinstance(error, XC):
+            key = (error.typename, _compact_json(error._content_dict()))
+        else:
+            key = (error.typename, _compact_json(content))
+            error = (error, content)
+
+        self._errors.setdefault(key, error)
+
+    def __len__(self):
+        return len(self._errors)
+
+    def __bool__(self):
+        return bool(self._errors)
+
+    def errors(self):
+        """Return a list of the errors collected so far."""
+
+        return [
+            e if isinstance(e, XC) else e[0](**e[1]) for e in self._errors.values()
+        ]
+
+    def group(self):
+        """Return an :exc:`XCGroup` of the errors, or None if there are none."""
+
+        if not self._errors:
+            return None
+
+        if self.message is None:
+            return XCGroup(self.errors())
+        return XCGroup(self.errors(), message=self.message)
+
+    def check(self):
+        """Raise an :exc:`XCGroup` if any errors have been collected."""
+
+        group = self.group()
+        if group is not None:
+            raise group
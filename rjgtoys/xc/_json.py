@@ -3,24 +3,522 @@ A basic wrapper over :mod:`json` that ensures input uses :class:`Thing`
 and that output is consistent and repeatable.
 """
 
+import codecs
+import functools
 import io
 import json
+import re
 
-from ._thing import Thing
+from ._filecache import FileCache
+from ._thing import (
+    CompactThing,
+    Thing,
+    ThingRecord,
+    _freeze,
+    compact_thing,
+    frozen_thing,
+    record_hook,
+)
 
 
-def json_loads(s, object_hook=None):
-    """Load a string from JSON returning a :class:`Thing`."""
+@functools.lru_cache(maxsize=64)
+def _record_hook(records):
+    return record_hook(records)
 
-    return json.loads(s, object_hook=object_hook or Thing)
 
+def _hooks(object_hook, compact, records):
+    """Return the keyword arguments that tell :mod:`json` how to make objects."""
 
-def json_load(stream, object_hook=None):
-    """Load JSON from a stream and return a :class:`Thing`."""
-    return json.load(io.TextIOWrapper(stream), object_hook=object_hook or Thing)
+    if sum(map(bool, (object_hook, compact, records))) > 1:
+        raise ValueError("Only one of object_hook, compact and records may be given")
+
+    if records:
+        return dict(object_pairs_hook=_record_hook(tuple(records)))
+    if compact:
+        return dict(object_pairs_hook=compact_thing)
+    return dict(object_hook=object_hook or Thing)
+
+
+def json_loads(s, object_hook=None, compact=False, records=None):
+    """Load a string from JSON returning a :class:`Thing`.
+
+    If `compact` is True, objects are instead returned as read-only
+    :class:`CompactThing` objects that share their (interned) keys
+    with others, which saves a lot of memory when many similar
+    documents are kept.
+
+    If `records` is a list of :class:`ThingRecord` classes (see :func:`record_class`),
+    objects are returned as records of the first of those classes that
+    they fit, or as a :class:`Thing` if they fit none.
+    """
+
+    return json.loads(s, **_hooks(object_hook, compact, records))
+
+
+def json_load(stream, object_hook=None, compact=False, records=None):
+    """Load JSON from a stream and return a :class:`Thing`.
+
+    The stream is read all at once; :mod:`json` works out how
+    the content is encoded, if it's binary.
+
+    See :func:`json_loads` for the meaning of `compact` and `records`.
+    """
+
+    return json.loads(stream.read(), **_hooks(object_hook, compact, records))
+
+
+def _load_frozen(data):
+    return _freeze(json.loads(data, object_pairs_hook=frozen_thing))
+
+
+_files = FileCache(_load_frozen)
+
+
+def json_load_file(path):
+    """Load JSON from a file, and return a read-only :class:`FrozenThing`.
+
+    What is loaded is kept, and returned again for as long as the
+    file stays the same, so it is shared by every caller; that's why
+    it is read-only.   Arrays are loaded as tuples, for the same
+    reason.   The cache holds the most recently used files; its
+    size is ``json_load_file.cache.maxsize``.
+    """
+
+    return _files.get(path)
+
+
+json_load_file.cache = _files
+
+
+# Things the scanner looks for
+
+_SPACE = re.compile(r'[ \t\n\r]*')
+_NESTED = re.compile(r'[\[\]{}"]')
+_STRING_END = re.compile(r'["\\]')
+_SCALAR_END = re.compile(r'[ \t\n\r,\]}]')
+
+# The length of the longest token other than a string (false),
+# or escape sequence in a string (\uXXXX)
+
+_LONGEST_TOKEN = 6
+
+
+class _Scanner:
+    """Finds the values in a JSON document in a binary stream.
+
+    Only the values that are wanted are kept in memory, and those are
+    decoded by :mod:`json`; everything else is skipped over as it is read.
+    """
+
+    def __init__(self, stream, hooks, chunk_size):
+        self.stream = stream
+        self.decoder = json.JSONDecoder(**hooks)
+        self.utf8 = codecs.getincrementaldecoder('utf-8')()
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+
+        # How much of the stream has been dropped from the buffer
+
+        self.base = 0
+
+        # The start of the value being kept, or None
+
+        self.mark = None
+
+    def fill(self):
+        """Read more input, dropping what is no longer needed; False at the end."""
+
+        drop = min(self.pos if self.mark is None else self.mark, len(self.buf))
+
+        # Read more at once if a large value is being kept, so that
+        # the cost of copying it stays proportional to its size
+
+        size = max(self.chunk_size, len(self.buf) - drop)
+        data = ''
+        while not data:
+            raw = self.stream.read(size)
+            data = self.utf8.decode(raw, final=not raw)
+            if not raw:
+                break
+        if not data:
+            return False
+
+        self.buf = self.buf[drop:] + data
+        self.base += drop
+        self.pos -= drop
+        if self.mark is not None:
+            self.mark -= drop
+        return True
+
+    def error(self, message, pos):
+        return ValueError("%s at offset %d" % (message, self.base + pos))
+
+    def need(self):
+        if not self.fill():
+            raise self.error("Unexpected end of JSON input", len(self.buf))
+
+    def peek(self):
+        """Skip white space and return the next character, or None at the end."""
+
+        while True:
+            self.pos = _SPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return None
+
+    def expect(self, c):
+        if self.peek() != c:
+            raise self.error("Expected %r" % (c), self.pos)
+        self.pos += 1
+
+    def skip_string(self):
+        """Skip to the end of a string; the opening quote has been read."""
+
+        while True:
+            m = _STRING_END.search(self.buf, self.pos)
+            if m is None:
+                self.pos = len(self.buf)
+                self.need()
+                continue
+            if m.group() == '"':
+                self.pos = m.end()
+                return
+            self.pos = m.end() + 1
+            while self.pos > len(self.buf):
+                self.need()
+
+    def skip(self):
+        """Skip a value."""
+
+        c = self.peek()
+        if c is None:
+            raise self.error("Unexpected end of JSON input", len(self.buf))
+
+        self.pos += 1
+        if c == '"':
+            self.skip_string()
+            return
+
+        if c in '[{':
+            depth = 1
+            while depth:
+                m = _NESTED.search(self.buf, self.pos)
+                if m is None:
+                    self.pos = len(self.buf)
+                    self.need()
+                    continue
+                self.pos = m.end()
+                c = m.group()
+                if c == '"':
+                    self.skip_string()
+                elif c in '[{':
+                    depth += 1
+                else:
+                    depth -= 1
+            return
+
+        while True:
+            m = _SCALAR_END.search(self.buf, self.pos)
+            if m is not None:
+                self.pos = m.start()
+                return
+            self.pos = len(self.buf)
+            if not self.fill():
+                return
+
+    def truncated(self, e):
+        """Might a decoding error be due to the end of the buffer?"""
+
+        return e.pos >= len(self.buf) - _LONGEST_TOKEN or e.msg.startswith('Unterminated string')
+
+    def value(self):
+        """Read and decode a value."""
+
+        if self.peek() is None:
+            raise self.error("Unexpected end of JSON input", self.pos)
+
+        # Decode what is in the buffer, reading more until it holds
+        # the whole value, and whatever follows it.   A number or literal
+        # may have been cut short (1.|25), so it's only complete if
+        # a delimiter follows it, or the input ends.
+
+        self.mark = self.pos
+        scalar = self.buf[self.mark] not in '[{"'
+        while True:
+            try:
+                (value, end) = self.decoder.raw_decode(self.buf, self.mark)
+            except json.JSONDecodeError as e:
+                if not self.truncated(e) or not self.fill():
+                    raise
+                continue
+            if end < len(self.buf) and (not scalar or _SCALAR_END.match(self.buf, end)):
+                break
+            if not self.fill():
+                break
+
+        self.pos = end
+        self.mark = None
+        return value
+
+    def key(self):
+        """Read the key of a member of an object, and the colon after it."""
+
+        self.expect('"')
+        self.mark = self.pos - 1
+        self.skip_string()
+        data = self.buf[self.mark : self.pos]
+        self.mark = None
+        self.expect(':')
+        if '\\' in data:
+            return json.loads(data)
+        return data[1:-1]
+
+    def items(self, path):
+        """Generate the values at `path` in the next value."""
+
+        if not path:
+            yield self.value()
+            return
+
+        (step, rest) = (path[0], path[1:])
+        c = self.peek()
+
+        if step == '*':
+            if c != '[':
+                self.skip()
+                return
+            self.pos += 1
+            if self.peek() == ']':
+                self.pos += 1
+                return
+            while True:
+                yield from self.items(rest)
+                c = self.peek()
+                self.pos += 1
+                if c == ']':
+                    return
+                if c != ',':
+                    raise self.error("Expected ',' or ']'", self.pos - 1)
+
+        if c != '{':
+            self.skip()
+            return
+        self.pos += 1
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            if self.key() == step:
+                yield from self.items(rest)
+            else:
+                self.skip()
+            c = self.peek()
+            self.pos += 1
+            if c == '}':
+                return
+            if c != ',':
+                raise self.error("Expected ',' or '}'", self.pos - 1)
+
+
+def json_iter(stream, path='*', object_hook=None, compact=False, records=None, chunk_size=65536):
+    """Generate values from a JSON document in a binary stream, one at a time.
+
+    :param stream: A binary stream to read from
+    :param path: A dotted path to the values to generate: each step is
+        either the name of a member of an object, or ``*`` for each element
+        of an array.   The default, ``*``, generates the elements of an
+        array at the top level; ``errors.*`` generates the elements of
+        the array `errors` in a top-level object.   An empty path
+        generates the whole document.
+    :param chunk_size: How much to read from the stream at a time
+
+    See :func:`json_loads` for the meaning of `compact` and `records`.
+
+    Only the value being generated is held in memory, so the memory used
+    depends on the size of the largest value, not that of the document.
+    Values that don't match the path are skipped over without being decoded,
+    and if the path doesn't match the document, nothing is generated.
+    """
+
+    scanner = _Scanner(stream, _hooks(object_hook, compact, records), chunk_size)
+
+    path = path.split('.') if path else []
+
+    yield from scanner.items(path)
+
+    if scanner.peek() is not None:
+        raise scanner.error("Extra data", scanner.pos)
+
+
+# Mappings that are encoded as objects, though they aren't dicts
+
+_OTHER_MAPPINGS = (CompactThing, ThingRecord)
+
+
+def _default(obj):
+    """Encode what :mod:`json` can't, for :func:`json_dumps`."""
+
+    if isinstance(obj, _OTHER_MAPPINGS):
+        return dict(obj)
+    raise TypeError("Object of type %s is not JSON serializable" % (type(obj).__name__))
 
 
 def json_dumps(obj):
     """Produce consistent repeatable JSON from an object."""
 
-    return json.dumps(obj, indent=None, sort_keys=True)
+    return json.dumps(obj, indent=None, sort_keys=True, default=_default)
+
+
+_encoder = json.JSONEncoder(sort_keys=True, default=_default)
+
+# Containers with no more than this many items, however deeply
+# nested, are encoded in one go, by the C encoder if there is one
+
+_ONE_SHOT_ITEMS = 256
+
+_MAPPINGS = (dict,) + _OTHER_MAPPINGS
+
+_CONTAINERS = _MAPPINGS + (list, tuple)
+
+
+def _remaining(obj, budget):
+    """Return `budget` less the number of items in `obj`, however deeply they are nested.
+
+    Stops counting once the result is negative.
+    """
+
+    if not isinstance(obj, _CONTAINERS):
+        return budget
+
+    todo = [obj]
+    while todo:
+        obj = todo.pop()
+        budget -= len(obj)
+        if budget < 0:
+            return budget
+        for v in obj.values() if isinstance(obj, _MAPPINGS) else obj:
+            if isinstance(v, _CONTAINERS):
+                todo.append(v)
+    return budget
+
+
+def _encode_key(k):
+    """Encode a key as :func:`json.dumps` does."""
+
+    if not isinstance(k, str):
+        if k is None or isinstance(k, (bool, int, float)):
+            k = _encoder.encode(k)
+        else:
+            raise TypeError("keys must be str, int, float, bool or None, not %s" % (type(k).__name__))
+    return json.encoder.encode_basestring_ascii(k)
+
+
+def _pieces(obj, markers):
+    """Generate the pieces of the JSON encoding of `obj`."""
+
+    if _remaining(obj, _ONE_SHOT_ITEMS) >= 0:
+        yield _encoder.encode(obj)
+        return
+
+    marker = id(obj)
+    if marker in markers:
+        raise ValueError("Circular reference detected")
+    markers.add(marker)
+
+    is_dict = isinstance(obj, _MAPPINGS)
+    if is_dict:
+        (sep, close, make) = ('{', '}', dict)
+        entries = sorted(obj.items())
+    else:
+        # Look at the items as the encoder does, whatever a subclass does
+
+        (sep, close, make) = ('[', ']', list)
+        entries = list.__iter__(obj) if isinstance(obj, list) else tuple.__iter__(obj)
+
+    # Runs of small entries are encoded together, as a container of the
+    # same kind, without its brackets; large ones are encoded piece by piece
+
+    run = []
+    left = _ONE_SHOT_ITEMS
+    for entry in entries:
+        value = entry[1] if is_dict else entry
+        left = _remaining(value, left - 1)
+        if left >= 0:
+            run.append(entry)
+            continue
+
+        if run:
+            yield sep + _encoder.encode(make(run))[1:-1]
+            sep = ', '
+            run = []
+
+        left = _remaining(value, _ONE_SHOT_ITEMS - 1)
+        if left >= 0:
+            run.append(entry)
+            continue
+
+        yield (sep + _encode_key(entry[0]) + ': ') if is_dict else sep
+        yield from _pieces(value, markers)
+        sep = ', '
+        left = _ONE_SHOT_ITEMS
+
+    if run:
+        yield sep + _encoder.encode(make(run))[1:-1]
+    yield close
+
+    markers.discard(marker)
+
+
+def json_dumps_iter(obj, chunk_size=65536):
+    """Generate the JSON that :func:`json_dumps` would produce, in chunks.
+
+    :param obj: The object to encode
+    :param chunk_size: The size of chunk to produce; each is about this size,
+        or bigger if it holds one big string or number
+
+    Large containers are encoded a piece at a time, and small ones
+    in one go, so that the whole encoding never needs to be in memory.
+    """
+
+    chunk = []
+    size = 0
+    for piece in _pieces(obj, set()):
+        chunk.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield ''.join(chunk)
+            chunk = []
+            size = 0
+    if chunk:
+        yield ''.join(chunk)
+
+
+def json_dump(obj, stream, chunk_size=65536):
+    """Write the JSON that :func:`json_dumps` would produce to a stream, in chunks.
+
+    If the stream is a text stream, strings are written to it, and otherwise bytes.
+    """
+
+    if isinstance(stream, io.TextIOBase):
+        for chunk in json_dumps_iter(obj, chunk_size):
+            stream.write(chunk)
+    else:
+        for chunk in json_dumps_iter(obj, chunk_size):
+            stream.write(chunk.encode('ascii'))
+
+
+async def json_dump_async(obj, writer, chunk_size=65536):
+    """Write the JSON that :func:`json_dumps` would produce to an asynchronous stream.
+
+    The `writer` is expected to be like an :class:`asyncio.StreamWriter`:
+    bytes are written to it, and if it has a `drain` method, that is awaited
+    after each chunk.
+    """
+
+    drain = getattr(writer, 'drain', None)
+    for chunk in json_dumps_iter(obj, chunk_size):
+        writer.write(chunk.encode('ascii'))
+        if drain is not None:
+            await drain()
@@ -0,0 +1,123 @@
+"""
+Results that carry either a value or an error, as an alternative
+to raising exceptions where failure is common.
+
+.. autoclass:: Result
+
+.. autoclass:: Ok
+
+.. autoclass:: Err
+
+"""
+
+
+class Result:
+    """The result of an operation that may fail: either :class:`Ok` or :class:`Err`.
+
+    Returning a :class:`Result` is cheaper than raising an
+    exception, because an :class:`Err` does not create one.
+    """
+
+    __slots__ = ()
+
+    ok = False
+
+    @staticmethod
+    def capture(f, *args, **kwargs):
+        """Call `f` and return its result as :class:`Ok`, or
+        any :class:`XC` that it raises as :class:`Err`.
+
+        If `f` itself returns a :class:`Result`, that is returned unchanged.
+        """
+
+        from rjgtoys.xc._xc import XC
+
+        try:
+            value = f(*args, **kwargs)
+        except XC as e:
+            return Err.from_exception(e)
+        if isinstance(value, Result):
+            return value
+        return Ok(value)
+
+    def __bool__(self):
+        return self.ok
+
+
+class Ok(Result):
+    """A successful result.
+
+    :param value: The value of the result
+    """
+
+    __slots__ = ('value',)
+
+    ok = True
+
+    def __init__(self, value=None):
+        self.value = value
+
+    def unwrap(self):
+        """Return the value."""
+
+        return self.value
+
+    def value_or(self, default):
+        """Return the value."""
+
+        return self.value
+
+    def __eq__(self, other):
+        return isinstance(other, Ok) and self.value == other.value
+
+    def __repr__(self):
+        return "Ok(%r)" % (self.value,)
+
+
+class Err(Result):
+    """A failed result.
+
+    Holds the class of an :class:`XC` and the content it would
+    be constructed with, but no exception; the content is
+    not validated until an exception is made.
+
+    :param xc: The exception class
+    :param content: The exception content
+    """
+
+    __slots__ = ('xc', 'content')
+
+    def __init__(self, xc, **content):
+        self.xc = xc
+        self.content = content
+
+    @classmethod
+    def from_exception(cls, e):
+        """Make an :class:`Err` that holds the same as exception `e`."""
+
+        return cls(type(e), **e._content.dict())
+
+    def exception(self):
+        """Return the exception that this represents."""
+
+        return self.xc(**self.content)
+
+    def unwrap(self):
+        """Raise the exception that this represents."""
+
+        raise self.exception()
+
+    def value_or(self, default):
+        """Return `default`."""
+
+        return default
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, Err)
+            and self.xc is other.xc
+            and self.content == other.content
+        )
+
+    def __repr__(self):
+        return "Err(%s, %r)" % (self.xc.__name__, self.content)
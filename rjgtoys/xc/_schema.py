@@ -0,0 +1,146 @@
+"""
+An on-disk cache of the JSON schemas of exception content.
+
+The cache is a directory that holds one JSON file for each class,
+named by a hash of the class declaration (and those of its bases),
+so that a changed declaration simply misses.   Nothing else is
+needed to keep it up to date, but it should be cleared when
+pydantic is upgraded, because that can change the schemas too.
+
+It is disabled unless a directory is set, either by calling
+:func:`set_schema_cache` or with the environment variable
+``RJGTOYS_XC_SCHEMA_CACHE``.
+
+.. autofunction:: set_schema_cache
+
+"""
+
+import hashlib
+import json
+import os
+
+# Change this if the way schemas are derived changes
+
+_FORMAT = 3
+
+ENV_VAR = 'RJGTOYS_XC_SCHEMA_CACHE'
+
+_directory = os.environ.get(ENV_VAR) or None
+
+
+def set_schema_cache(directory):
+    """Set the directory used to cache content schemas, or None to stop using one."""
+
+    global _directory
+
+    _directory = directory
+
+
+def _describe(v, seen):
+    """Return a description of a value that goes into a content schema.
+
+    The description only changes if the value does: it does not depend
+    on where objects happen to be in memory, and it includes the
+    declarations of any models that are used, recursively.
+    """
+
+    if v is None or isinstance(v, (bool, int, float, str, bytes)):
+        return repr(v)
+
+    if isinstance(v, (list, tuple)):
+        return '[%s]' % (','.join(_describe(i, seen) for i in v))
+
+    if isinstance(v, (set, frozenset)):
+        return '{%s}' % (','.join(sorted(_describe(i, seen) for i in v)))
+
+    if isinstance(v, dict):
+        items = sorted(
+            '%s:%s' % (_describe(k, seen), _describe(i, seen)) for (k, i) in v.items()
+        )
+        return '{%s}' % (','.join(items))
+
+    name = '%s.%s' % (getattr(v, '__module__', None), getattr(v, '__qualname__', None))
+
+    if isinstance(v, type):
+        # Pydantic models and enumerations are described by their declarations
+
+        fields = getattr(v, '__fields__', None)
+        members = getattr(v, '__members__', None)
+        if (fields is None and members is None) or v in seen:
+            return name
+        seen.add(v)
+        if members is not None:
+            return name + _describe({k: m.value for (k, m) in members.items()}, seen)
+        config = vars(v.__config__)
+        config = {k: c for (k, c) in config.items() if not k.startswith('_')}
+        fields = {k: (f.outer_type_, f.field_info) for (k, f) in fields.items()}
+        return name + _describe((v.__doc__, config, fields), seen)
+
+    # Generic types, such as List[Inner]
+
+    args = getattr(v, '__args__', None)
+    if isinstance(args, tuple):
+        return '%s[%s]' % (getattr(v, '__origin__', None), _describe(args, seen))
+
+    # Pydantic fields are described by their settings
+
+    repr_args = getattr(v, '__repr_args__', None)
+    if repr_args is not None and not isinstance(v, type):
+        return '%s%s' % (type(v).__name__, _describe(dict(repr_args()), seen))
+
+    if callable(v):
+        return name
+
+    # Anything else is described by its type and representation, unless
+    # that depends on its address
+
+    text = repr(v)
+    if ' at 0x' in text:
+        text = ''
+    return '%s.%s(%s)' % (type(v).__module__, type(v).__qualname__, text)
+
+
+def class_key(cls):
+    """Return a hash of the declaration of an exception class and its bases."""
+
+    from rjgtoys.xc._xc import _XCType
+
+    h = hashlib.sha256(str(_FORMAT).encode('utf-8'))
+    seen = set()
+    for k in cls.__mro__:
+        if not isinstance(k, _XCType):
+            continue
+        attrs = _describe(k.__dict__['_xc_model_attrs'], seen)
+        h.update(repr((k.__module__, k.__qualname__, k.typename, attrs)).encode('utf-8'))
+    return h.hexdigest()
+
+
+def load(cls):
+    """Return the cached schema of a class, or None."""
+
+    if _directory is None:
+        return None
+
+    path = os.path.join(_directory, class_key(cls) + '.json')
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save(cls, schema):
+    """Save the schema of a class in the cache, if there is one."""
+
+    if _directory is None:
+        return
+
+    path = os.path.join(_directory, class_key(cls) + '.json')
+    tmp = '%s.%d.tmp' % (path, os.getpid())
+    try:
+        os.makedirs(_directory, exist_ok=True)
+        with open(tmp, 'w') as f:
+            json.dump(schema, f, sort_keys=True)
+        os.replace(tmp, path)
+    except OSError:
+        pass
@@ -0,0 +1,59 @@
+"""
+Summaries of exceptions.
+
+.. autoclass:: ExceptionSummary
+
+"""
+
+import traceback
+from typing import ClassVar, List
+
+from pydantic import BaseModel, Field
+
+
+class ExceptionSummary(BaseModel):
+    """A compact description of an exception.
+
+    Unlike the exception itself, a summary does not keep any stack
+    frames alive, and it can be serialised.
+    """
+
+    type: str = Field(..., title="The qualified name of the exception class")
+    message: str = Field(..., title="The string representation of the exception")
+    traceback: List[str] = Field(
+        ..., title="Where the exception was raised, innermost last"
+    )
+
+    # Bounds on the size of a summary
+
+    MAX_MESSAGE: ClassVar[int] = 1000
+    MAX_FRAMES: ClassVar[int] = 10
+
+    @classmethod
+    def from_exception(cls, e, max_message=None, max_frames=None):
+        """Summarise an exception.
+
+        The message is truncated to `max_message` characters, and only
+        the innermost `max_frames` entries of the traceback are kept.
+        """
+
+        max_message = max_message or cls.MAX_MESSAGE
+        max_frames = max_frames or cls.MAX_FRAMES
+
+        t = type(e)
+        message = str(e)
+        if len(message) > max_message:
+            message = message[:max_message] + '...'
+
+        frames = traceback.extract_tb(e.__traceback__)[-max_frames:]
+
+        return cls(
+            type="%s.%s" % (t.__module__, t.__qualname__),
+            message=message,
+            traceback=[
+                "%s:%d in %s" % (fs.filename, fs.lineno, fs.name) for fs in frames
+            ],
+        )
+
+    def __str__(self):
+        return "%s: %s" % (self.type, self.message)
@@ -2,10 +2,122 @@
 
 .. autoclass:: Thing
 .. autoclass:: ThingChain
+.. autoclass:: CompactThing
+.. autofunction:: compact_thing
+.. autoclass:: FrozenThing
+.. autofunction:: frozen_thing
+.. autoclass:: ThingRecord
+.. autofunction:: record_class
+.. autofunction:: record_hook
+.. autoclass:: ThingPath
+.. autoclass:: ThingPaths
+.. autofunction:: compile_path
 
 """
 
 import collections
+import collections.abc
+import functools
+import keyword
+import sys
+import weakref
+
+# Marks a missing value, where None might be a real one
+
+_MISSING = object()
+
+
+class ThingPath:
+    """A dotted path, such as ``"server.port"``, compiled for fast lookups.
+
+    Looking a path up finds the same value that :meth:`Thing.__getitem__`
+    would: at each level, the rest of the path is first tried as a
+    key in its own right, and then its first component.   But the
+    path is only split once, and no exceptions are raised along the way
+    (except where it passes through something that isn't a mapping).
+
+    It works on any objects that have a `get` method, not only on
+    :class:`Thing` objects.
+
+    Use :func:`compile_path` to get one.
+    """
+
+    __slots__ = ('path', '_steps')
+
+    def __init__(self, path):
+        self.path = path
+
+        keys = path.split('.')
+
+        # Each step is (rest of path, next key); the last has no next key
+
+        steps = [('.'.join(keys[i:]), keys[i]) for i in range(len(keys) - 1)]
+        steps.append((keys[-1], None))
+
+        self._steps = tuple(steps)
+
+    def get(self, obj, default=_MISSING):
+        """Return the value at this path in `obj`.
+
+        If there is no such value, returns `default`, or raises
+        :exc:`KeyError` if there is no default.
+        """
+
+        for (rest, key) in self._steps:
+            try:
+                get = obj.get
+            except AttributeError:
+                break
+            value = get(rest, _MISSING)
+            if value is not _MISSING:
+                return value
+            if key is None:
+                break
+            obj = get(key, _MISSING)
+            if obj is _MISSING:
+                break
+
+        if default is _MISSING:
+            raise KeyError(self.path)
+        return default
+
+    __call__ = get
+
+    def __repr__(self):
+        return "ThingPath(%r)" % (self.path)
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_path(path):
+    """Return a :class:`ThingPath` for a dotted path.
+
+    Compiled paths are cached, so this is cheap to call repeatedly.
+    """
+
+    return ThingPath(path)
+
+
+class ThingPaths:
+    """Several dotted paths, compiled to look up together.
+
+    :param paths: The paths to look up
+    """
+
+    __slots__ = ('paths', '_compiled')
+
+    def __init__(self, paths):
+        self.paths = tuple(paths)
+        self._compiled = tuple(compile_path(p) for p in self.paths)
+
+    def get(self, obj, default=None):
+        """Return a tuple of the values at each path in `obj`.
+
+        Missing values are replaced by `default`.
+        """
+
+        return tuple([p.get(obj, default) for p in self._compiled])
+
+    __call__ = get
 
 
 class Thing(dict):
@@ -24,18 +136,30 @@ class Thing(dict):
         """Get an item, allowing dots to separate path components."""
 
         try:
-            return super(Thing, self).__getitem__(name)
+            return dict.__getitem__(self, name)
         except KeyError:
             if '.' not in name:
                 raise
             # Otherwise try harder...
 
-        (prefix, tail) = name.split('.', 1)
-
-        return self[prefix][tail]
+        return compile_path(name).get(self)
 
     __getattr__ = __getitem__
 
+    def get_path(self, path, default=None):
+        """Get the value at a dotted path, or `default` if there is none."""
+
+        return compile_path(path).get(self, default)
+
+    def get_paths(self, paths, default=None):
+        """Get the values at several dotted paths, as a tuple.
+
+        Missing values are replaced by `default`.   To look up
+        the same paths repeatedly, use a :class:`ThingPaths`.
+        """
+
+        return tuple([compile_path(p).get(self, default) for p in paths])
+
     def merge(self, other):
         """A recursive 'update'.
 
@@ -47,64 +171,658 @@ class Thing(dict):
 
     @classmethod
     def dict_merge(cls, dest, other):
-        """Merge one dict-like object into another."""
+        """Merge one dict-like object into another.
 
-        #        print("merge %s into %s" % (other, dest))
+        Where both have a mapping for the same key, those are merged
+        too, and otherwise `other` takes precedence.   This works however
+        deeply the mappings are nested.
+        """
 
-        for (k, v) in other.items():
-            try:
-                orig = dest[k]
-            except KeyError:
-                dest[k] = v
-                continue
+        todo = [(dest, other)]
+        while todo:
+            (dest, other) = todo.pop()
+            for (k, v) in other.items():
+                orig = dest.get(k, _MISSING)
+                if isinstance(orig, dict) and isinstance(v, dict):
+                    todo.append((orig, v))
+                else:
+                    dest[k] = v
 
-            # Maybe it's another Thing, or similar
+    @classmethod
+    def merged(cls, *layers, lists='replace', sets='union'):
+        """Merge several layers, such as configuration sources, into a new :class:`Thing`.
 
-            try:
-                orig.merge(v)
-                continue
-            except AttributeError:
-                pass
+        :param layers: The mappings to merge; later ones take precedence
+        :param lists: How to merge lists: ``'replace'``, so the last wins,
+            or ``'extend'``, to join them up
+        :param sets: How to merge sets: ``'union'``, or ``'replace'``, so the last wins
 
-            # Maybe it's a dict or similar
+        Values of different kinds are never merged: the last value for
+        a key, and any values of the same kind that immediately precede it,
+        are merged, and any before those are ignored.
 
-            if isinstance(orig, dict):
-                dict_merge(orig, v)
-                continue
+        The layers are not changed, and subtrees that only come from one
+        layer are not copied; the result shares them.   So modifying the
+        result can modify the layers.
+        """
 
-            # Can't do lists or sets yet
+        if lists not in ('replace', 'extend'):
+            raise ValueError("Unknown list merge rule %r" % (lists,))
+        if sets not in ('replace', 'union'):
+            raise ValueError("Unknown set merge rule %r" % (sets,))
+
+        result = cls()
+        todo = [(result, layers)]
+
+        while todo:
+            (dest, sources) = todo.pop()
+
+            values = {}
+            for source in sources:
+                for (k, v) in source.items():
+                    values.setdefault(k, []).append(v)
+
+            for (k, vs) in values.items():
+                last = vs[-1]
+                kind = _kind(last)
+                if kind is None or len(vs) == 1:
+                    dest[k] = last
+                    continue
+
+                # Find the values of the same kind as the last
+
+                i = len(vs) - 1
+                while i > 0 and _kind(vs[i - 1]) is kind:
+                    i -= 1
+                run = vs[i:]
+
+                if len(run) == 1:
+                    dest[k] = last
+                elif kind is dict:
+                    sub = cls()
+                    dest[k] = sub
+                    todo.append((sub, run))
+                elif kind is list and lists == 'extend':
+                    dest[k] = [item for v in run for item in v]
+                elif kind is set and sets == 'union':
+                    dest[k] = type(last)().union(*run)
+                else:
+                    dest[k] = last
+
+        return result
+
+
+def _kind(value):
+    """Classify a value for :meth:`Thing.merged`."""
+
+    if isinstance(value, dict):
+        return dict
+    if isinstance(value, list):
+        return list
+    if isinstance(value, (set, frozenset)):
+        return set
+    return None
+
+
+class _ItemAttributes:
+    """A mixin that makes attributes read items, as they do for a :class:`Thing`.
+
+    Names that start with ``_`` are not looked up as items, so that
+    Python's own protocols, and the internals of the class, keep working.
+    """
 
-            # By default, other takes precedence
+    __slots__ = ()
 
-            dest[k] = v
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return self[name]
 
 
-class ThingChain(collections.ChainMap):
+class ThingChain(_ItemAttributes, collections.ChainMap):
     """This is a version of :class:`collections.ChainMap` adapted
-    for :class:`Thing` - it adds attribute-style access.
+    for :class:`Thing` - it adds attribute-style access, and dotted paths.
+
+    The chain is flattened: where several of the maps hold a mapping
+    for the same key, the value is itself a :class:`ThingChain` of
+    those mappings, so that (for example) ``chain.server.port`` finds
+    the port in whichever map provides it, just as ``chain['server.port']``
+    does.   A value that isn't a mapping hides any from maps further down.
+
+    The result of each lookup is cached.   The cache is cleared by any
+    change made through the chain (or a chain derived from it), or
+    to any :class:`Thing` among its maps: the chain makes each of those
+    an instance of a subclass of its own class that tells the chain
+    about changes, so writing to it is a little slower than to other
+    :class:`Thing` objects.   Changes made directly to other kinds of map,
+    such as a plain :class:`dict`, are not noticed; call :meth:`invalidate`
+    after making any.
+    """
+
+    def __init__(self, *maps, parent=None):
+        super(ThingChain, self).__init__(*maps)
+        self._cache = {}
+        self._parent = parent
+        for m in self.maps:
+            _watch(m, self)
+
+    def __getitem__(self, name):
+
+        value = self._cache.get(name, _MISSING)
+        if value is _MISSING:
+            value = self._resolve(name)
+            self._cache[name] = value
+        return value
+
+    def _resolve(self, name):
+        """Look up a name, or a dotted path, without using the cache."""
+
+        found = []
+        for m in self.maps:
+            v = m.get(name, _MISSING)
+            if v is _MISSING:
+                continue
+            if not isinstance(v, collections.abc.Mapping):
+                if not found:
+                    return v
+                break
+            found.append(v)
+
+        if found:
+            return ThingChain(*found, parent=self)
+
+        if isinstance(name, str) and '.' in name:
+            (prefix, tail) = name.split('.', 1)
+            value = self.get(prefix, _MISSING)
+            if isinstance(value, ThingChain):
+                return value[tail]
+
+        return self.__missing__(name)
+
+    def __setattr__(self, name, value):
+        if name.startswith('_') or name == 'maps':
+            object.__setattr__(self, name, value)
+        else:
+            self[name] = value
+
+    def __delattr__(self, name):
+        if name.startswith('_') or name == 'maps':
+            object.__delattr__(self, name)
+        else:
+            del self[name]
+
+    def get(self, name, default=None):
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def __contains__(self, name):
+        try:
+            self[name]
+        except KeyError:
+            return False
+        return True
 
-    This an abandoned experiment.  See test_thing.py for a test
-    case that demonstrates why I abandoned it.
+    def invalidate(self):
+        """Forget the results of lookups, and those of any chain this was derived from."""
 
+        chain = self
+        while chain is not None:
+            chain._cache.clear()
+            chain = chain._parent
+
+    def __setitem__(self, name, value):
+        super(ThingChain, self).__setitem__(name, value)
+        self.invalidate()
+
+    def __delitem__(self, name):
+        super(ThingChain, self).__delitem__(name)
+        self.invalidate()
+
+    def popitem(self):
+        try:
+            return super(ThingChain, self).popitem()
+        finally:
+            self.invalidate()
+
+    def pop(self, name, *args):
+        try:
+            return super(ThingChain, self).pop(name, *args)
+        finally:
+            self.invalidate()
+
+    def clear(self):
+        super(ThingChain, self).clear()
+        self.invalidate()
+
+    def __reduce__(self):
+        return (type(self), tuple(self.maps))
+
+
+class _WatchedThing:
+    """A mixin for a :class:`Thing` that is among the maps of some :class:`ThingChain` objects.
+
+    Any change to the thing clears the caches of those chains.
     """
 
+    __slots__ = ()
+
+    def _changed(self):
+        for chain in list(self._chains.values()):
+            chain.invalidate()
+
+    def __setitem__(self, name, value):
+        super(_WatchedThing, self).__setitem__(name, value)
+        self._changed()
+
+    def __delitem__(self, name):
+        super(_WatchedThing, self).__delitem__(name)
+        self._changed()
+
+    __setattr__ = __setitem__
+    __delattr__ = __delitem__
+
+    def clear(self):
+        super(_WatchedThing, self).clear()
+        self._changed()
+
+    def pop(self, name, *args):
+        try:
+            return super(_WatchedThing, self).pop(name, *args)
+        finally:
+            self._changed()
+
+    def popitem(self):
+        try:
+            return super(_WatchedThing, self).popitem()
+        finally:
+            self._changed()
+
+    def setdefault(self, name, default=None):
+        try:
+            return super(_WatchedThing, self).setdefault(name, default)
+        finally:
+            self._changed()
+
+    def update(self, *args, **kwargs):
+        try:
+            super(_WatchedThing, self).update(*args, **kwargs)
+        finally:
+            self._changed()
+
+    def __ior__(self, other):
+        try:
+            return super(_WatchedThing, self).__ior__(other)
+        finally:
+            self._changed()
+
+    def __reduce__(self):
+        return (self._unwatched, (dict(self),))
+
+
+# The watched version of each class of Thing
+
+_watched_classes = {}
+
+
+def _watch(thing, chain):
+    """Arrange for any change to `thing` to clear the cache of `chain`, if `thing` is a :class:`Thing`."""
+
+    if isinstance(thing, _WatchedThing):
+        thing._chains[id(chain)] = chain
+        return
+
+    cls = type(thing)
+    if not issubclass(cls, Thing) or issubclass(cls, FrozenThing):
+        return
+
+    watched = _watched_classes.get(cls)
+    if watched is None:
+        watched = type(
+            cls.__name__,
+            (_WatchedThing, cls),
+            dict(__module__=cls.__module__, __qualname__=cls.__qualname__, _unwatched=cls),
+        )
+        _watched_classes[cls] = watched
+
+    # Chains aren't hashable, so they are held by their ids
+
+    chains = weakref.WeakValueDictionary()
+    chains[id(chain)] = chain
+
+    object.__setattr__(thing, '_chains', chains)
+    object.__setattr__(thing, '__class__', watched)
+
+
+class _Shape:
+    """The keys of a :class:`CompactThing`, shared by all those that have the same keys."""
+
+    __slots__ = ('keys', 'index')
+
+    def __init__(self, keys):
+        self.keys = keys
+        self.index = {k: i for (i, k) in enumerate(keys)}
+
+
+# Shapes, by their keys.   Both the number of shapes, and the
+# number of keys they may have, are limited, so that data with
+# arbitrary keys doesn't fill this up.
+
+_shapes = {}
+
+MAX_SHAPES = 4096
+
+MAX_COMPACT_KEYS = 16
+
+
+class CompactThing(_ItemAttributes, collections.abc.Mapping):
+    """A compact, read-only, version of :class:`Thing`.
+
+    Holds only a tuple of values, and a reference to a set of keys
+    that is shared with all others that have the same keys.   Attribute
+    access and dotted paths work just as they do for a :class:`Thing`.
+
+    Use :func:`compact_thing` to make one.
+    """
+
+    __slots__ = ('_shape', '_values')
+
     def __getitem__(self, name):
+        i = self._shape.index.get(name)
+        if i is not None:
+            return self._values[i]
+        if isinstance(name, str) and '.' in name:
+            return compile_path(name).get(self)
+        raise KeyError(name)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("%s is read-only" % (type(self).__name__))
+
+    def get(self, name, default=None):
+        i = self._shape.index.get(name)
+        if i is None:
+            return default
+        return self._values[i]
+
+    def __contains__(self, name):
+        return name in self._shape.index
+
+    def __iter__(self):
+        return iter(self._shape.keys)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __repr__(self):
+        return "%s(%r)" % (type(self).__name__, dict(self))
+
+    def __reduce__(self):
+        return (compact_thing, (list(zip(self._shape.keys, self._values)),))
+
+
+def compact_thing(pairs):
+    """Make a :class:`CompactThing` from a list of (key, value) pairs.
+
+    Keys are interned, and each set of keys is shared with all other objects
+    that have the same keys.   Objects with many keys, or duplicate keys,
+    are made into a :class:`Thing` instead.
+
+    This is suitable for use as the `object_pairs_hook` of :func:`json.loads`.
+    """
+
+    if pairs:
+        (keys, values) = zip(*pairs)
+    else:
+        (keys, values) = ((), ())
+
+    shape = _shapes.get(keys)
+    if shape is None:
+        keys = tuple(map(sys.intern, keys))
+        if len(keys) > MAX_COMPACT_KEYS:
+            return Thing(zip(keys, values))
+        shape = _Shape(keys)
+        if len(shape.index) != len(keys):
+            return Thing(zip(keys, values))
+        if len(_shapes) < MAX_SHAPES:
+            _shapes[keys] = shape
+
+    self = _new(CompactThing)
+    _set_shape(self, shape)
+    _set_values(self, values)
+    return self
+
+
+_new = object.__new__
+_set_shape = CompactThing._shape.__set__
+_set_values = CompactThing._values.__set__
+
+
+class FrozenThing(Thing):
+    """A :class:`Thing` that can't be changed.
+
+    Any attempt to change it raises :exc:`TypeError`.   It's still a :class:`dict`, so
+    it can be encoded as JSON, and used wherever a :class:`Thing` can be read.
+    """
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("%s is read-only" % (type(self).__name__))
+
+    __setattr__ = __delattr__ = _read_only
+    __setitem__ = __delitem__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+    __ior__ = _read_only
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
 
+
+def _freeze(value):
+    """Return a list as a tuple, recursively; return anything else unchanged."""
+
+    if type(value) is list:
+        return tuple([_freeze(v) for v in value])
+    return value
+
+
+def frozen_thing(pairs):
+    """Make a :class:`FrozenThing` from (key, value) pairs, with any lists among the values made into tuples.
+
+    This is suitable for use as the `object_pairs_hook` of :func:`json.loads`,
+    which makes objects from the inside out, so that the whole
+    result is read-only (except, perhaps, at the top level).
+    """
+
+    return FrozenThing([(k, _freeze(v)) for (k, v) in pairs])
+
+
+class ThingRecord(_ItemAttributes, collections.abc.Mapping):
+    """The base class for fixed-layout records; see :func:`record_class`.
+
+    A record holds only a tuple of values, with the names of the fields
+    kept by its class.   It behaves as a read-only mapping, and like a
+    :class:`Thing`, fields can be read as attributes, and dotted paths
+    can be used as keys.
+    """
+
+    __slots__ = ('_values',)
+
+    # Set by record_class()
+
+    _keys = ()
+    _index = {}
+    _required = frozenset()
+    _defaults = ()
+
+    def __init__(self, values):
+        _set_record_values(self, tuple(values))
+
+    def __getitem__(self, name):
+        i = self._index.get(name)
+        if i is not None:
+            return self._values[i]
+        if isinstance(name, str) and '.' in name:
+            return compile_path(name).get(self)
+        raise KeyError(name)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("%s is read-only" % (type(self).__name__))
+
+    def get(self, name, default=None):
+        i = self._index.get(name)
+        if i is None:
+            return default
+        return self._values[i]
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):
+        return "%s(%r)" % (type(self).__name__, dict(self.items()))
+
+    def __reduce__(self):
+        return (type(self), (self._values,))
+
+    @classmethod
+    def from_pairs(cls, pairs):
+        """Make a record from (key, value) pairs, or return None if they don't fit.
+
+        The pairs must include every required field, and no others
+        than the fields of the record; missing fields are given their
+        default values.
+        """
+
+        index = cls._index
+        values = list(cls._defaults)
+        seen = set()
+        for (k, v) in pairs:
+            i = index.get(k)
+            if i is None or k in seen:
+                return None
+            values[i] = v
+            seen.add(k)
+
+        if not cls._required.issubset(seen):
+            return None
+        return _new_record(cls, tuple(values))
+
+
+_set_record_values = ThingRecord._values.__set__
+
+
+def _new_record(cls, values):
+    """Make a record of class `cls` from a tuple of values, in the order of its fields."""
+
+    self = _new(cls)
+    _set_record_values(self, values)
+    return self
+
+
+def record_class(example=None, schema=None, name='Record', module=None):
+    """Make a :class:`ThingRecord` class with the layout of an example, or a schema.
+
+    :param example: A mapping with the fields the records should have;
+        all the fields are required
+    :param schema: A JSON schema for an object: the records will have
+        the fields it lists as `properties`; those not listed as `required`
+        may be missing, and are then given the `default` from the schema,
+        or None
+    :param name: The name of the class
+    :param module: The name of the module the class belongs to; by default
+        that of the caller.   Records can only be pickled if their class
+        can be found by that name.
+    """
+
+    if module is None:
         try:
-            return super(ThingChain, self).__getitem__(name)
-        except KeyError:
-            if '.' not in name:
-                raise
-            # Otherwise try harder...
+            module = sys._getframe(1).f_globals.get('__name__', '__main__')
+        except (AttributeError, ValueError):
+            module = __name__
+
+    if example is not None:
+        keys = tuple(example)
+        required = frozenset(keys)
+        defaults = (None,) * len(keys)
+    elif schema is not None:
+        props = schema.get('properties', {})
+        keys = tuple(props)
+        required = frozenset(schema.get('required', ()))
+        defaults = tuple(props[k].get('default') for k in keys)
+    else:
+        raise TypeError("record_class needs an example or a schema")
+
+    keys = tuple(map(sys.intern, keys))
+
+    attrs = dict(
+        __slots__=(),
+        __module__=module,
+        _keys=keys,
+        _index={k: i for (i, k) in enumerate(keys)},
+        _required=required,
+        _defaults=defaults,
+    )
+
+    # Fields that are valid names, and don't hide anything else,
+    # get a fast attribute accessor
+
+    for (i, k) in enumerate(keys):
+        if not k.isidentifier() or keyword.iskeyword(k) or k.startswith('_'):
+            continue
+        if hasattr(ThingRecord, k):
+            continue
+        attrs[k] = property(lambda self, i=i: self._values[i])
+
+    return type(name, (ThingRecord,), attrs)
+
+
+def record_hook(classes):
+    """Return a function that makes records of any of some :class:`ThingRecord` classes.
+
+    The function is suitable for use as the `object_pairs_hook` of
+    :func:`json.loads`.   Each object is made into a record of the first of
+    the `classes` that it fits, or into a :class:`Thing` if it fits none.
+    """
 
-        (prefix, tail) = name.split('.', 1)
+    classes = tuple(classes)
 
-        for m in self.maps:
-            try:
-                return m[prefix][tail]
-            except KeyError:
-                pass
+    # For each sequence of keys that has been seen, the class to use,
+    # and whether the values are already in its order; the class is None
+    # if none of the classes fits
 
-        return self.__missing__(name)
+    chosen = {}
+    new = _new_record
 
-    __getattr__ = __getitem__
+    def hook(pairs):
+        if not pairs:
+            return decide(pairs, ())
+        (keys, values) = zip(*pairs)
+        try:
+            (cls, exact) = chosen[keys]
+        except KeyError:
+            return decide(pairs, keys)
+        if exact:
+            return new(cls, values)
+        if cls is None:
+            return Thing(pairs)
+        return cls.from_pairs(pairs)
+
+    def decide(pairs, keys):
+        for cls in classes:
+            record = cls.from_pairs(pairs)
+            if record is not None:
+                break
+        else:
+            cls = None
+            record = Thing(pairs)
+
+        if len(chosen) < MAX_SHAPES:
+            chosen[keys] = (cls, cls is not None and cls._keys == keys)
+        return record
+
+    return hook
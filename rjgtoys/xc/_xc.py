@@ -14,32 +14,90 @@ over an HTTP REST API.
 
 .. autoclass:: _XCType
 
+Pydantic is not imported until some exception is constructed,
+or its content model is otherwise needed; just declaring exceptions
+does not need it.
 
 """
 
-import urllib
-import json
+import collections.abc
+import importlib
+import threading
+import weakref
+import zlib
 
-from pydantic import BaseModel, Field
+from typing import Optional
 
-from rjgtoys.xc._json import json_loads, json_dumps
+
+class _Title:
+    """The declaration of a required field with a title, for XC content.
+
+    This is converted into a pydantic `Field` when the content model is
+    built, so unlike :func:`Title` it does not need pydantic; the
+    exceptions declared in this package use it, so that importing
+    the package stays cheap.
+    """
+
+    __slots__ = ('title',)
+
+    def __init__(self, title):
+        self.title = title
+
+    def __repr__(self):
+        return "Title(%r)" % (self.title)
 
 
 def Title(t):
-    """Simplifies model declarations a little."""
+    """Simplifies model declarations a little.
+
+    Returns a pydantic `Field` for a required field that has a title.
+    """
+
+    from pydantic import Field
 
     return Field(..., title=t)
 
 
-class _XCContentModel(BaseModel):
-    """
-    This is the base class for exception content - the values
-    of parameters passed to their constructors.
+def _field(v):
+    """Convert a content attribute value into what pydantic expects."""
 
-    It's essentially :class:`pydantic.BaseModel`.
-    """
+    if isinstance(v, _Title):
+        from pydantic import Field
+
+        return Field(..., title=v.title)
+    return v
+
+
+_content_model = None
+
+
+def _content_model_base():
+    """Return the base class for content models, creating it when first needed."""
+
+    global _content_model
 
-    pass
+    if _content_model is None:
+        from pydantic import BaseModel
+
+        class _XCContentModel(BaseModel):
+            """
+            This is the base class for exception content - the values
+            of parameters passed to their constructors.
+
+            It's essentially :class:`pydantic.BaseModel`.
+            """
+
+            pass
+
+        _content_model = _XCContentModel
+
+    return _content_model
+
+
+def __getattr__(name):
+    if name == '_XCContentModel':
+        return _content_model_base()
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
 
 
 """
@@ -54,18 +112,21 @@ can be kept separate.
 class _XCBase(Exception):
     """A hidden base class for exceptions."""
 
-    _model = _XCContentModel
-
     def __init__(self, **kwargs):
         super(_XCBase, self).__init__()
 
-        self._content = self._model.parse_obj(kwargs)
+        self._content = type(self)._model.parse_obj(kwargs)
+
+        if self.lightweight:
+            self.__suppress_context__ = True
 
     def __getattr__(self, name):
         return getattr(self._content, name)
 
     @classmethod
     def parse_json(cls, data):
+        from rjgtoys.xc._json import json_loads
+
         return cls(**json_loads(data))
 
     def __eq__(self, other):
@@ -74,8 +135,40 @@ class _XCBase(Exception):
         return (self.__class__ is other.__class__) and (self._content == other._content)
 
 
+# Content models may be built by any thread
+
+_model_lock = threading.RLock()
+
+# Declared classes may be imported by any thread; the lock is held
+# until the import is complete, so that others wait for the class
+
+_import_lock = threading.RLock()
+
+
 class _XCType(type):
-    """Metaclass for exceptions."""
+    """Metaclass for exceptions.
+
+    Every class it creates is recorded in a registry, indexed
+    by its `typename` and by its numeric `typecode`.
+
+    The content model of each class, `_model`, is only built
+    when it's first needed.
+    """
+
+    # The registry only holds weak references, so that classes made
+    # inside functions, or by rjgtoys.xc.remote, can be collected
+
+    _by_code = weakref.WeakValueDictionary()
+    _by_typename = weakref.WeakValueDictionary()
+
+    # Classes whose type codes clash with those of others, by type code
+
+    _clashes = {}
+
+    # Counts changes to the registry, so that anything derived from
+    # the set of classes can tell when it is out of date
+
+    _generation = 0
 
     def __new__(cls, name, bases, attrs):
         """Generate a new BaseException subclass.
@@ -90,6 +183,11 @@ class _XCType(type):
 
         qualname = '.'.join((attrs['__module__'], name))
         attrs.setdefault('typename', qualname)
+
+        # The type code must be stable between processes, so it's
+        # derived from the typename rather than the order of creation
+
+        attrs.setdefault('typecode', zlib.crc32(attrs['typename'].encode('utf-8')))
         # Does this 'inherit' correctly?
         if 'title' not in attrs:
             title = attrs.get('__doc__', '\n').splitlines()[0]
@@ -98,7 +196,15 @@ class _XCType(type):
         exc_attrs = {}
         model_attrs = {}
 
-        exc_attr_forced = ('typename', 'title', 'detail', 'status')
+        exc_attr_forced = (
+            'typename',
+            'title',
+            'detail',
+            'status',
+            'typecode',
+            'lightweight',
+            'size_budget',
+        )
 
         for (n, v) in attrs.items():
 
@@ -147,13 +253,206 @@ class _XCType(type):
 
         model_attrs['__doc__'] = exc_doc
 
-        # Build the content model class
+        # Keep what's needed to build the content model later
+
+        exc_attrs['_xc_model_attrs'] = model_attrs
+
+        kls = type.__new__(cls, name, bases, exc_attrs)
+
+        if exc_attrs.get('_xc_registered', True):
+            cls._register(kls)
+
+        return kls
+
+    @property
+    def _model(cls):
+        """The content model of this class."""
+
+        try:
+            return cls.__dict__['_xc_model']
+        except KeyError:
+            return cls._build_model()
+
+    def _build_model(cls):
+        """Build the content model of this class.
+
+        It's derived from the models of any bases that have them
+        (others, such as ExceptionGroup, are mixins).
+        """
+
+        with _model_lock:
+            try:
+                return cls.__dict__['_xc_model']
+            except KeyError:
+                pass
+
+            bases = tuple(b._model for b in cls.__bases__ if isinstance(b, _XCType))
 
-        model = type('_model', tuple(s._model for s in bases), model_attrs)
+            attrs = {k: _field(v) for (k, v) in cls.__dict__['_xc_model_attrs'].items()}
 
-        exc_attrs['_model'] = model
+            # Name the model after the class, so that schemas that
+            # include several content models can tell them apart
 
-        return type.__new__(cls, name, bases, exc_attrs)
+            attrs['__module__'] = cls.__module__
+            attrs['__qualname__'] = cls.__qualname__
+
+            model = type(cls.__name__, bases or (_content_model_base(),), attrs)
+
+            cls._xc_model = model
+
+            return model
+
+    @classmethod
+    def _register(cls, kls):
+        """Record a new class in the registry.
+
+        A class that has the same typename as one already registered
+        replaces it (this happens when a module is reloaded).
+
+        Different typenames can have the same type code; that's only
+        an error if the code is looked up, by :meth:`by_code`.
+        """
+
+        other = cls._by_code.get(kls.typecode)
+        if other is not None and other.typename != kls.typename:
+            clashes = cls._clashes.setdefault(kls.typecode, weakref.WeakSet())
+            clashes.update((other, kls))
+        else:
+            cls._by_code[kls.typecode] = kls
+        cls._by_typename[kls.typename] = kls
+        _XCType._generation += 1
+
+    @classmethod
+    def by_code(cls, typecode):
+        """Return the class that has a given type code, or None.
+
+        Classes that have been declared by :func:`declare_types` but not
+        yet imported can only be found if they use the default typecode.
+
+        Raises :exc:`TypeError` if classes with different typenames
+        have the code; they need explicit, distinct, typecodes.
+        """
+
+        clashes = cls._clashes.get(typecode)
+        if clashes is not None:
+            found = {k.typename: k for k in list(clashes)}
+            if len(found) > 1:
+                raise TypeError(
+                    "Type code %d is used by %s" % (typecode, ", ".join(sorted(found)))
+                )
+            if found:
+                return found.popitem()[1]
+
+        try:
+            return cls._by_code[typecode]
+        except KeyError:
+            pass
+
+        with _import_lock:
+            for typename in list(cls._declared()):
+                if zlib.crc32(typename.encode('utf-8')) == typecode:
+                    cls._import_declared(typename)
+
+            return cls._by_code.get(typecode)
+
+    @classmethod
+    def by_typename(cls, typename):
+        """Return the class that has a given typename, or None.
+
+        If the class has not been imported, but its location has
+        been declared by :func:`declare_types` or by an entry point,
+        it is imported.
+        """
+
+        try:
+            return cls._by_typename[typename]
+        except KeyError:
+            pass
+
+        with _import_lock:
+            if typename in cls._declared():
+                cls._import_declared(typename)
+
+            return cls._by_typename.get(typename)
+
+    # Where to find classes that have not been imported yet:
+    # typename -> 'module:Class'
+
+    _locations = {}
+
+    _entry_points_loaded = False
+
+    @classmethod
+    def _declared(cls):
+        """Return the locations of classes that have not been imported yet.
+
+        The entry points are only read when this is first needed.
+        """
+
+        with _import_lock:
+            if not cls._entry_points_loaded:
+                cls._entry_points_loaded = True
+                for (typename, location) in _entry_point_locations().items():
+                    cls._locations.setdefault(typename, location)
+
+        return cls._locations
+
+    @classmethod
+    def _import_declared(cls, typename):
+        """Import the class declared for a typename.
+
+        If it can't be found, the declaration is simply dropped, and
+        reports of that type are treated as being of an unknown type.
+        """
+
+        location = cls._locations.pop(typename, None)
+        if location is None:
+            return
+
+        (module, _, qualname) = location.partition(':')
+        try:
+            obj = importlib.import_module(module)
+            for name in filter(None, qualname.split('.')):
+                obj = getattr(obj, name)
+        except (ImportError, AttributeError):
+            pass
+
+
+# The entry point group in which packages can declare the locations of classes
+
+ENTRY_POINT_GROUP = 'rjgtoys.xc.types'
+
+
+def _entry_point_locations():
+    """Return the class locations declared by entry points."""
+
+    try:
+        from importlib import metadata
+    except ImportError:
+        return {}
+
+    eps = metadata.entry_points()
+    if hasattr(eps, 'select'):
+        eps = eps.select(group=ENTRY_POINT_GROUP)
+    else:
+        eps = eps.get(ENTRY_POINT_GROUP, ())
+
+    return {ep.name: ep.value for ep in eps}
+
+
+def declare_types(locations):
+    """Declare where to find some exception classes, without importing them.
+
+    :param locations: A dict that maps typenames to the location
+        of each class, as ``'module:Class'``
+
+    The module that defines a class is imported when its typename
+    is first seen by :meth:`XC.from_obj`.   Packages can make the
+    same declarations in entry points in the ``rjgtoys.xc.types``
+    group; those made here take precedence.
+    """
+
+    _XCType._locations.update(locations)
 
 
 class XC(_XCBase, metaclass=_XCType):
@@ -198,6 +497,27 @@ class XC(_XCBase, metaclass=_XCType):
 
     The above attributes are defined in RFC 7807.
 
+    typecode
+      A numeric identifier for the class, used in the compact binary
+      encoding produced by :meth:`to_bytes`.
+
+      If no value is set explicitly, a CRC-32 of the `typename` is used,
+      so that the code is the same in every process.
+
+    lightweight
+      If True, instances are intended to be raised and caught within a
+      few frames, as a means of flow control, and nobody is interested
+      in where they came from.   Defaults to False.
+
+      Implicit exception context is suppressed, :func:`raises` drops
+      the traceback frames below the function it wraps, and handlers
+      can call :meth:`detach` to release the frames that remain.
+
+    size_budget
+      If set, the approximate maximum size, in characters of JSON, of the
+      content in the dict produced by :meth:`to_dict`.   Defaults to None,
+      meaning no limit.
+
     """
 
     # The following are magically kept in the exception class, not the content
@@ -209,27 +529,176 @@ class XC(_XCBase, metaclass=_XCType):
 
     status: int = 400
 
+    typecode: int
+
+    lightweight: bool = False
+
+    size_budget: Optional[int] = None
+
     def __str__(self):
+        return self._format_detail(self._content.dict())
+
+    def _format_detail(self, values):
+        """Format the detail of this exception from some content values."""
+
         try:
-            return self.detail.format(**self._content.dict())
+            return self.detail.format(**values)
         except Exception as e:
             return "%s.__str__() -> %s" % (self.__class__.__name__, e)
 
-    def to_dict(self):
+    def __reduce__(self):
+        # The content model can't be pickled by reference, because it
+        # shares its name with this class; its values are already valid,
+        # so they need not be validated again when they are unpickled
+
+        content = self._content
+        return (_unpickle, (type(self), content.__dict__, content.__fields_set__))
+
+    def detach(self):
+        """Drop references to the traceback and any implicit context.
+
+        This releases the stack frames (and their local variables) that
+        would otherwise be kept alive for as long as this exception is.
+        An explicit cause, set by ``raise ... from``, is kept, because it
+        was attached on purpose; so are any frames it refers to.
+
+        Returns the exception itself, so that a handler can
+        write ``saved = e.detach()``.
+        """
+
+        self.__traceback__ = None
+        self.__context__ = None
+        return self
+
+    @classmethod
+    def content_schema(cls):
+        """Return the JSON schema of the content of this class.
+
+        The schema is only computed once for each class, and if a
+        schema cache directory has been set (see :func:`set_schema_cache`)
+        it's kept there, so that it need not even be computed once in
+        another process.   The result is shared, so must not be modified.
+        """
+
+        try:
+            return cls.__dict__['_xc_schema']
+        except KeyError:
+            pass
+
+        from rjgtoys.xc import _schema
+
+        schema = _schema.load(cls)
+        if schema is None:
+            schema = cls._model.schema()
+            _schema.save(cls, schema)
+
+        cls._xc_schema = schema
+        return schema
+
+    @classmethod
+    def tree_schema(cls):
+        """Return a JSON schema for the content of this class and all of its subclasses.
+
+        Each class has a definition, named by its typename, and the schema
+        allows any one of them.   Definitions that the content schemas
+        depend on are gathered into the same place.
+
+        The result is cached until another exception class is declared,
+        and is shared, so must not be modified.
+        """
+
+        cached = cls.__dict__.get('_xc_tree_schema')
+        if cached is not None and cached[0] == _XCType._generation:
+            return cached[1]
+
+        classes = sorted(
+            (k for k in _XCType._by_typename.values() if issubclass(k, cls)),
+            key=lambda k: k.typename,
+        )
+
+        definitions = {}
+        for k in classes:
+            schema = dict(k.content_schema())
+            definitions.update(schema.pop('definitions', {}))
+            definitions[k.typename] = schema
+
+        result = dict(
+            title=cls.title,
+            anyOf=[{'$ref': '#/definitions/%s' % (k.typename)} for k in classes],
+            definitions=definitions,
+        )
+
+        cls._xc_tree_schema = (_XCType._generation, result)
+        return result
+
+    def _content_dict(self):
+        """Return the content of this exception as it should be serialised.
+
+        Subclasses may override this to replace values that
+        cannot be serialised.
+        """
+
+        return self._content.dict()
+
+    def to_dict(self, budget=None):
         """Produce a JSON-encodable dict representing this exception.
 
         Returns an RFC7807-compliant JSON object.
+
+        If `budget` is given, or the class sets a `size_budget`, the
+        content is limited to about that many characters of JSON,
+        and the `instance` is an identifier derived from a hash of
+        the (full) content, rather than the content itself.
+
+        Any content fields that were truncated to fit the budget
+        are listed in an extra `truncated` member; see :func:`truncate_content`.
         """
 
-        content = self._content.dict()
+        content = self._content_dict()
+
+        if budget is None:
+            budget = self.size_budget
+
+        if budget is None:
+            from urllib.parse import urlencode
+
+            return dict(
+                type=self.typename,
+                title=self.title,
+                status=self.status,
+                detail=str(self),
+                instance="%s?%s" % (self.typename, urlencode(content)),
+                content=content,
+            )
+
+        import hashlib
+
+        text = _compact_json(content)
+        digest = hashlib.sha256(text.encode('utf-8')).hexdigest()[:32]
+
         data = dict(
             type=self.typename,
             title=self.title,
             status=self.status,
-            detail=str(self),
-            instance="%s?%s" % (self.typename, urllib.parse.urlencode(content)),
-            content=content,
+            instance="%s#%s" % (self.typename, digest),
         )
+
+        if len(text) <= budget:
+            data['content'] = content
+            detail = str(self)
+        else:
+            (data['content'], data['truncated']) = truncate_content(content, budget)
+
+            # Format the detail from the truncated values, not the whole content
+
+            values = self._content.dict()
+            values.update((k, data['content'][k]) for k in data['truncated'])
+            detail = self._format_detail(values)
+
+        if len(detail) > budget:
+            detail = detail[:budget] + '...'
+
+        data['detail'] = detail
         return data
 
     @classmethod
@@ -240,22 +709,316 @@ class XC(_XCBase, metaclass=_XCType):
         parsing the result of calling :meth:`to_json()` on
         an instance of this class or a subclass of it.
 
-        Returns an instance of the appropriate class, or
-        raises :exc:`TypeError` if no class can be identified.
+        Returns an instance of the appropriate class.   If the type is not
+        known, returns an :exc:`UnknownXC` that is also an instance of this class;
+        raises :exc:`TypeError` if the type is known, but is not a subclass of this one.
         """
 
         typename = data['type']
 
-        for kls in all_subclasses(cls):
-            if kls.typename == typename:
-                return kls(**data['content'])
+        kls = _XCType.by_typename(typename)
+        if kls is None:
+            kls = cls._unknown_class()
+        elif not issubclass(kls, cls):
+            raise TypeError("No %s type %s" % (cls.__name__, typename))
+
+        return kls._from_document(data)
+
+    @classmethod
+    def _unknown_class(cls):
+        """Return the class that represents unknown subclasses of this one."""
+
+        try:
+            return cls.__dict__['_xc_unknown']
+        except KeyError:
+            pass
+
+        kls = type(cls)(
+            'Unknown' + cls.__name__,
+            (UnknownXC, cls),
+            dict(
+                __module__=cls.__module__,
+                __doc__="An unknown %s" % (cls.__name__),
+                typename=cls.typename,
+                _xc_registered=False,
+            ),
+        )
+        cls._xc_unknown = kls
+        return kls
+
+    @classmethod
+    def _from_document(cls, data):
+        """Construct an instance of this class from a problem report."""
+
+        return cls(**data['content'])
+
+    @classmethod
+    def _construct(cls, values, fields_set=None, *args, **kwargs):
+        """Make an instance from content values, without validating them.
+
+        Any other arguments are passed to `__new__`.
+        """
+
+        self = cls.__new__(cls, *args, **kwargs)
+        Exception.__init__(self)
+        self._content = cls._model.construct(_fields_set=fields_set, **values)
+        if self.lightweight:
+            self.__suppress_context__ = True
+        return self
+
+    @classmethod
+    def _construct_document(cls, data):
+        """Make an instance from a problem report, without validating its content."""
 
-        raise TypeError("No %s type %s" % (cls.__name__, typename))
+        return cls._construct(data.get('content', {}))
 
     @classmethod
     def from_json(cls, data):
+        from rjgtoys.xc._json import json_loads
+
         return cls.from_obj(json_loads(data))
 
+    def to_bytes(self):
+        """Produce a compact binary representation of this exception.
+
+        The result is a CBOR array of two items: the `typecode` of the
+        class and the content of the exception.   The `title`, `detail`
+        and `status` are not included because they can all be derived
+        from the class.
+        """
+
+        from rjgtoys.xc._cbor import cbor_dumps
+
+        return cbor_dumps(self._to_parts())
+
+    def _to_parts(self):
+        """Return the list of items that make up the binary representation."""
+
+        return [self.typecode, self._content_dict()]
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Reconstruct an exception from the result of :meth:`to_bytes`.
+
+        Returns an instance of the appropriate class, or
+        raises :exc:`TypeError` if no class can be identified.
+        """
+
+        from rjgtoys.xc._cbor import cbor_loads
+
+        # The content goes straight to the model, so plain dicts will do
+
+        return cls._decode_parts(cbor_loads(data, object_hook=dict))
+
+    @classmethod
+    def _decode_parts(cls, parts):
+        """Reconstruct an exception from the result of :meth:`_to_parts`."""
+
+        typecode = parts[0]
+
+        kls = _XCType.by_code(typecode)
+        if kls is None or not issubclass(kls, cls):
+            raise TypeError("No %s type code %d" % (cls.__name__, typecode))
+
+        return kls._from_parts(parts)
+
+    @classmethod
+    def _from_parts(cls, parts):
+        """Construct an instance of this class from the result of :meth:`_to_parts`."""
+
+        return cls(**parts[1])
+
+
+def _unpickle(cls, values, fields_set, *args):
+    """Reconstruct an exception from the result of :meth:`XC.__reduce__`."""
+
+    return cls._construct(values, fields_set, *args)
+
+
+_compact_encoder = None
+
+
+def _compact_default(obj):
+    """Encode mappings that aren't dicts as objects, and anything else as a string."""
+
+    if isinstance(obj, collections.abc.Mapping):
+        return dict(obj)
+    return str(obj)
+
+
+def _compact_json(obj):
+    """Encode some content as compact JSON, for measurement and hashing."""
+
+    global _compact_encoder
+
+    if _compact_encoder is None:
+        import json
+
+        _compact_encoder = json.JSONEncoder(
+            sort_keys=True, separators=(',', ':'), default=_compact_default
+        ).encode
+
+    return _compact_encoder(obj)
+
+
+def _truncate_value(value, size):
+    """Truncate a single value so that its JSON is about `size` characters.
+
+    Returns the truncated value, and the number of items (or
+    characters, for a string) that were kept.   If `value` can't
+    be truncated, returns None in place of the count.
+    """
+
+    if isinstance(value, str):
+        # Characters may need escaping, so find the longest prefix
+        # whose JSON fits, by bisection
+
+        (lo, hi) = (0, len(value))
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if len(_compact_json(value[:mid])) <= size:
+                lo = mid
+            else:
+                hi = mid - 1
+        return (value[:lo], lo)
+
+    if isinstance(value, (list, tuple)):
+        kept = []
+        used = 1
+        for item in value:
+            used += len(_compact_json(item)) + 1
+            if used > size:
+                break
+            kept.append(item)
+        return (kept, len(kept))
+
+    if isinstance(value, dict):
+        kept = {}
+        used = 1
+        for k in sorted(value):
+            used += len(_compact_json({k: value[k]})) - 1
+            if used > size:
+                break
+            kept[k] = value[k]
+        return (kept, len(kept))
+
+    return (value, None)
+
+
+def truncate_content(content, budget):
+    """Truncate the fields of some exception content to fit a size budget.
+
+    Fields are considered smallest first; each may use an equal share of
+    whatever remains of the budget.   Strings are cut short, and lists and
+    dicts lose their trailing items.
+
+    Returns the truncated content and a dict that describes
+    each field that was truncated: it maps the field name to a dict
+    with members `length`, the original length of the field, and `kept`,
+    the length that remains.   Values that can't be truncated are
+    kept whole.
+    """
+
+    # The size of each field includes its name and punctuation
+
+    sizes = sorted(
+        (len(_compact_json(v)) + len(_compact_json(k)) + 2, k)
+        for (k, v) in content.items()
+    )
+
+    result = dict(content)
+    truncated = {}
+    remaining = budget - 1
+
+    for (i, (size, k)) in enumerate(sizes):
+        share = remaining // (len(sizes) - i)
+        if size <= share:
+            remaining -= size
+            continue
+
+        value = content[k]
+        overhead = len(_compact_json(k)) + 2
+        (result[k], kept) = _truncate_value(value, share - overhead)
+        if kept is None:
+            remaining -= size
+            continue
+
+        truncated[k] = dict(length=len(value), kept=kept)
+        remaining -= share
+
+    return (result, truncated)
+
+
+class UnknownXC(Exception):
+    """An exception decoded from a problem report of a type that is not known.
+
+    :meth:`XC.from_obj` returns one of these, that is also an instance of
+    the class it was called on, for any report of an unknown type.
+
+    It holds the report as its `document` attribute.   The members
+    of the report's content are available as attributes, and
+    :meth:`to_dict` returns the report unchanged.
+    """
+
+    @classmethod
+    def _from_document(cls, data):
+        # The content is only known to be valid for some other class
+
+        self = cls._construct_document(data)
+        self.document = data
+
+        typename = data['type']
+        self.typename = typename
+        self.typecode = zlib.crc32(typename.encode('utf-8'))
+        self.title = data.get('title', typename)
+        self.status = data.get('status', self.status)
+        return self
+
+    def __reduce__(self):
+        # The class was made by XC._unknown_class(), and can't be found by name
+
+        return (_unpickle_unknown, (type(self).__bases__[1], self.document))
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__['document']['content'][name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __str__(self):
+        return self.document.get('detail', self.typename)
+
+    def __eq__(self, other):
+        return self.__class__ is other.__class__ and self.document == other.document
+
+    def _content_dict(self):
+        return _plain(self.document.get('content', {}))
+
+    def to_dict(self, budget=None):
+        """Return the problem report that this was decoded from.
+
+        Any mappings in it, such as a :class:`CompactThing`, are returned as
+        plain dicts, so that the result can be encoded by :mod:`json`.
+        """
+
+        return _plain(self.document)
+
+
+def _plain(value):
+    """Return a copy of a decoded JSON value, with every mapping made into a dict."""
+
+    if isinstance(value, collections.abc.Mapping):
+        return {k: _plain(v) for (k, v) in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    return value
+
+
+def _unpickle_unknown(base, document):
+    """Reconstruct an exception from the result of :meth:`UnknownXC.__reduce__`."""
+
+    return base._unknown_class()._from_document(document)
+
 
 def all_subclasses(cls):
     # pylint: disable=line-too-long
@@ -0,0 +1,115 @@
+"""
+Load YAML into :class:`Thing` objects, as :mod:`rjgtoys.xc._json` does for JSON.
+
+This needs PyYAML (``pip install rjgtoys-xc[yaml]``), and uses its C
+loader, which is much quicker, if it was built with one.
+
+Only the 'safe' subset of YAML is accepted: no Python objects.   Mappings
+are made into :class:`Thing` objects as they are loaded, rather than being
+converted afterwards.
+
+.. autofunction:: yaml_loads
+.. autofunction:: yaml_load
+.. autofunction:: yaml_load_file
+
+"""
+
+import collections.abc
+
+import yaml
+
+from ._filecache import FileCache
+from ._thing import FrozenThing, Thing
+
+_SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+def _construct_pairs(loader, node):
+    """Generate the (key, value) pairs of a mapping node."""
+
+    loader.flatten_mapping(node)
+    for (key_node, value_node) in node.value:
+        key = loader.construct_object(key_node, deep=False)
+        if not isinstance(key, collections.abc.Hashable):
+            raise yaml.constructor.ConstructorError(
+                "while constructing a mapping",
+                node.start_mark,
+                "found unhashable key",
+                key_node.start_mark,
+            )
+        yield (key, loader.construct_object(value_node, deep=False))
+
+
+def _construct_thing(loader, node):
+    # Yield the object first, then fill it, so that aliases can refer to it
+
+    data = Thing()
+    yield data
+    for (key, value) in _construct_pairs(loader, node):
+        dict.__setitem__(data, key, value)
+
+
+def _construct_frozen_thing(loader, node):
+    data = FrozenThing()
+    yield data
+    for (key, value) in _construct_pairs(loader, node):
+        dict.__setitem__(data, key, value)
+
+
+def _construct_tuple(loader, node):
+    return tuple(loader.construct_sequence(node, deep=True))
+
+
+def _construct_frozenset(loader, node):
+    return frozenset(key for (key, _) in _construct_pairs(loader, node))
+
+
+class ThingLoader(_SafeLoader):
+    """A safe YAML loader that makes mappings into :class:`Thing` objects."""
+
+
+ThingLoader.add_constructor('tag:yaml.org,2002:map', _construct_thing)
+
+
+class FrozenThingLoader(_SafeLoader):
+    """A safe YAML loader that makes read-only things: :class:`FrozenThing`
+    objects, tuples and frozensets."""
+
+
+FrozenThingLoader.add_constructor('tag:yaml.org,2002:map', _construct_frozen_thing)
+FrozenThingLoader.add_constructor('tag:yaml.org,2002:seq', _construct_tuple)
+FrozenThingLoader.add_constructor('tag:yaml.org,2002:set', _construct_frozenset)
+
+
+def yaml_loads(s):
+    """Load a string (or bytes) from YAML returning a :class:`Thing`."""
+
+    return yaml.load(s, Loader=ThingLoader)
+
+
+def yaml_load(stream):
+    """Load YAML from a stream and return a :class:`Thing`."""
+
+    return yaml.load(stream.read(), Loader=ThingLoader)
+
+
+def _load_frozen(data):
+    return yaml.load(data, Loader=FrozenThingLoader)
+
+
+_files = FileCache(_load_frozen)
+
+
+def yaml_load_file(path):
+    """Load YAML from a file, and return a read-only :class:`FrozenThing`.
+
+    As for :func:`json_load_file`, what is loaded is kept, and returned
+    again for as long as the file stays the same, so it is read-only:
+    sequences are loaded as tuples, and sets as frozensets.   The cache
+    size is ``yaml_load_file.cache.maxsize``.
+    """
+
+    return _files.get(path)
+
+
+yaml_load_file.cache = _files
@@ -94,7 +94,7 @@ class XCDocumenter(ExceptionDocumenter):
             )
             return
 
-        schema = self.object._model.schema()
+        schema = self.object.content_schema()
 
         try:
             hints = get_type_hints(self.object._model)
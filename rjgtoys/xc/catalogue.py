@@ -0,0 +1,375 @@
+"""
+A catalogue of exception classes, for clients that want to decode
+problem reports without importing the modules that declare them.
+
+A catalogue file is built by a server, or as part of packaging,
+from the classes that some modules declare::
+
+    python -m rjgtoys.xc.catalogue errors.xcc myapp.errors myapp.api
+
+A client opens the file with :class:`Catalogue`, which maps it into
+memory and only reads the entries it needs, and decodes problem
+reports into :class:`Problem` objects.   Those carry the content
+of the report and the description of its class, and can be turned
+into real exceptions by :meth:`Problem.resolve`, which imports the class
+at that point.
+
+The file starts with a header, followed by two sorted indexes, one
+on a CRC-32 of the typename and one on the typecode, then a table that
+gives the position of each entry.   Each entry is a JSON object; see
+:func:`catalogue_entry`.
+
+.. autofunction:: catalogue_entry
+
+.. autofunction:: build_catalogue
+
+.. autoclass:: Catalogue
+   :members:
+
+.. autoclass:: Problem
+   :members:
+
+"""
+
+import importlib
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+
+from rjgtoys.xc._xc import _XCType
+
+MAGIC = b'RJGXCCAT'
+
+_HEADER = struct.Struct('<8sI')
+
+# Index items are (key, entry number)
+
+_NAME_ITEM = struct.Struct('<II')
+_CODE_ITEM = struct.Struct('<qI')
+
+# Entry positions are (offset, length)
+
+_ENTRY_ITEM = struct.Struct('<II')
+
+
+def _name_key(typename):
+    return zlib.crc32(typename.encode('utf-8'))
+
+
+def catalogue_entry(cls):
+    """Describe an exception class for a catalogue.
+
+    Returns a dict with members `type`, `typecode`, `title`,
+    `status`, `detail` (the template), `schema` (the JSON schema of
+    the content), `module` and `qualname` (where the class can
+    be found) and `bases` (the typenames of its exception bases).
+    """
+
+    return dict(
+        type=cls.typename,
+        typecode=cls.typecode,
+        title=getattr(cls, 'title', ''),
+        status=cls.status,
+        detail=getattr(cls, 'detail', ''),
+        schema=cls.content_schema(),
+        module=cls.__module__,
+        qualname=cls.__qualname__,
+        bases=[b.typename for b in cls.__bases__ if isinstance(b, _XCType)],
+    )
+
+
+def _encode_entry(cls):
+    """Return the catalogue entry for a class, as compact JSON in bytes."""
+
+    return json.dumps(
+        catalogue_entry(cls), sort_keys=True, separators=(',', ':')
+    ).encode('utf-8')
+
+
+def build_catalogue(path, classes=None):
+    """Write a catalogue file that describes some exception classes.
+
+    :param path: The name of the file to write
+    :param classes: The classes to describe; if None, all those that
+        are registered (so all those that have been declared)
+
+    The file is written under a temporary name and then renamed,
+    so that clients never see a partial catalogue.
+    """
+
+    if classes is None:
+        classes = _XCType._by_typename.values()
+    classes = list(classes)
+
+    entries = [_encode_entry(c) for c in classes]
+    count = len(entries)
+
+    names = sorted((_name_key(c.typename), i) for (i, c) in enumerate(classes))
+    codes = sorted((c.typecode, i) for (i, c) in enumerate(classes))
+
+    item_size = _NAME_ITEM.size + _CODE_ITEM.size + _ENTRY_ITEM.size
+    offset = _HEADER.size + count * item_size
+
+    parts = [_HEADER.pack(MAGIC, count)]
+    parts.extend(_NAME_ITEM.pack(*item) for item in names)
+    parts.extend(_CODE_ITEM.pack(*item) for item in codes)
+    for data in entries:
+        parts.append(_ENTRY_ITEM.pack(offset, len(data)))
+        offset += len(data)
+    parts.extend(entries)
+
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(b''.join(parts))
+    os.replace(tmp, path)
+
+
+class Catalogue:
+    """A catalogue file, opened for reading.
+
+    :param path: The name of the file
+
+    Entries are read from the file only when they are needed,
+    and are then cached.   A catalogue can be used as a context
+    manager, that closes it on exit.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, self._count) = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self._map.close()
+            raise ValueError("%s is not an exception catalogue" % (path))
+
+        self._names = _HEADER.size
+        self._codes = self._names + self._count * _NAME_ITEM.size
+        self._positions = self._codes + self._count * _CODE_ITEM.size
+
+        self._entries = {}
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, typename):
+        return self.entry(typename) is not None
+
+    def _read(self, n):
+        """Read entry number `n`."""
+
+        try:
+            return self._entries[n]
+        except KeyError:
+            pass
+
+        (offset, length) = _ENTRY_ITEM.unpack_from(
+            self._map, self._positions + n * _ENTRY_ITEM.size
+        )
+        entry = json.loads(self._map[offset : offset + length].decode('utf-8'))
+        self._entries[n] = entry
+        return entry
+
+    def _search(self, start, item, key):
+        """Generate the entry numbers in an index that have a given key."""
+
+        lo = 0
+        hi = self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if item.unpack_from(self._map, start + mid * item.size)[0] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        while lo < self._count:
+            (k, n) = item.unpack_from(self._map, start + lo * item.size)
+            if k != key:
+                break
+            yield n
+            lo += 1
+
+    def entry(self, typename):
+        """Return the entry for a typename, or None."""
+
+        for n in self._search(self._names, _NAME_ITEM, _name_key(typename)):
+            entry = self._read(n)
+            if entry['type'] == typename:
+                return entry
+        return None
+
+    def entry_by_code(self, typecode):
+        """Return the entry for a typecode, or None."""
+
+        for n in self._search(self._codes, _CODE_ITEM, typecode):
+            return self._read(n)
+        return None
+
+    def typenames(self):
+        """Return a list of all the typenames in the catalogue."""
+
+        return [self._read(n)['type'] for n in range(self._count)]
+
+    def is_a(self, typename, base):
+        """Is the type `typename` the same as, or derived from, the type `base`?"""
+
+        todo = [typename]
+        while todo:
+            t = todo.pop()
+            if t == base:
+                return True
+            entry = self.entry(t)
+            if entry is not None:
+                todo.extend(entry['bases'])
+        return False
+
+    def from_obj(self, data):
+        """Decode a problem report into a :class:`Problem`.
+
+        Raises :exc:`TypeError` if the type is not in the catalogue.
+        """
+
+        typename = data['type']
+        entry = self.entry(typename)
+        if entry is None:
+            raise TypeError("No catalogue entry for type %s" % (typename))
+
+        return Problem(self, entry, data['content'], document=data)
+
+    def from_json(self, data):
+        """Decode a problem report in JSON into a :class:`Problem`."""
+
+        return self.from_obj(json.loads(data))
+
+    def from_bytes(self, data):
+        """Decode the binary form of an exception into a :class:`Problem`.
+
+        Raises :exc:`TypeError` if the type is not in the catalogue.
+        """
+
+        from rjgtoys.xc._cbor import cbor_loads
+
+        parts = cbor_loads(data, object_hook=dict)
+
+        entry = self.entry_by_code(parts[0])
+        if entry is None:
+            raise TypeError("No catalogue entry for type code %d" % (parts[0]))
+
+        return Problem(self, entry, parts[1], parts=parts)
+
+
+class Problem:
+    """A decoded problem report, described by a catalogue entry.
+
+    The content is available as attributes, as it would be from
+    the exception itself, but it is not validated; that happens
+    when the report is turned into an exception by :meth:`resolve`.
+
+    :param catalogue: The :class:`Catalogue` that describes the type
+    :param entry: The catalogue entry for the type
+    :param content: The content of the report
+    :param document: The problem report, if decoded from one
+    :param parts: The decoded binary form, if decoded from that
+    """
+
+    __slots__ = ('catalogue', 'entry', 'content', '_document', '_parts')
+
+    def __init__(self, catalogue, entry, content, document=None, parts=None):
+        self.catalogue = catalogue
+        self.entry = entry
+        self.content = content
+        self._document = document
+        self._parts = parts
+
+    @property
+    def typename(self):
+        return self.entry['type']
+
+    @property
+    def title(self):
+        return self.entry['title']
+
+    @property
+    def status(self):
+        return self.entry['status']
+
+    def __getattr__(self, name):
+        # Keep Python's own protocols working, and don't look for
+        # the content if it hasn't been set yet (as when copying)
+
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return object.__getattribute__(self, 'content')[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __str__(self):
+        if self._document is not None:
+            detail = self._document.get('detail')
+            if detail is not None:
+                return detail
+        try:
+            return self.entry['detail'].format(**self.content)
+        except Exception as e:
+            return "%s.__str__() -> %s" % (self.entry['qualname'], e)
+
+    def __repr__(self):
+        return "Problem(%s, %r)" % (self.typename, self.content)
+
+    def is_a(self, typename):
+        """Is this problem of the type `typename`, or a type derived from it?"""
+
+        return self.catalogue.is_a(self.typename, typename)
+
+    def exception_class(self):
+        """Import and return the class of the exception."""
+
+        obj = importlib.import_module(self.entry['module'])
+        for name in self.entry['qualname'].split('.'):
+            obj = getattr(obj, name)
+        return obj
+
+    def resolve(self):
+        """Return the exception that this describes, importing its class if need be."""
+
+        kls = self.exception_class()
+        if self._document is not None:
+            return kls._from_document(self._document)
+        return kls._from_parts(self._parts)
+
+
+def main(argv=None):
+    """Build a catalogue file; the arguments are its name and modules to import."""
+
+    argv = sys.argv[1:] if argv is None else argv
+
+    if not argv:
+        print("usage: python -m rjgtoys.xc.catalogue OUTPUT [MODULE...]")
+        return 2
+
+    (path, modules) = (argv[0], argv[1:])
+
+    for name in modules:
+        importlib.import_module(name)
+
+    build_catalogue(path)
+
+    print("Wrote %d entries to %s" % (len(_XCType._by_typename), path))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
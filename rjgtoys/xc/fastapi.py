@@ -6,7 +6,7 @@ Helpers for starlette-based API servers.
 
 from typing import Union
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, create_model
 
 from starlette.requests import Request
 from starlette.responses import Response, JSONResponse
@@ -23,6 +23,8 @@ from fastapi.encoders import DictIntStrAny, SetIntStr
 from rjgtoys.xc.starlette import *
 
 from rjgtoys.xc import Error
+from rjgtoys.xc._xc import _XCType
+from rjgtoys.xc.raises import may_raise
 
 # Keep this for reference
 
@@ -40,6 +42,72 @@ class ErrorResponse(BaseModel):
 
 ErrorResponses = {400: {'model': ErrorResponse}}
 
+# Response models are made once for each exception class, and shared
+# by all the routes that use them
+
+_response_models = {}
+
+
+def error_response_model(cls):
+    """Return a model of the problem report produced by an exception class.
+
+    It's an :class:`ErrorResponse` whose `content` is described
+    by the content model of the class.
+    """
+
+    try:
+        return _response_models[cls]
+    except KeyError:
+        pass
+
+    model = create_model(
+        cls.__name__ + 'Response',
+        __base__=ErrorResponse,
+        __module__=cls.__module__,
+        content=(cls._model, Field(..., title=cls.title)),
+    )
+    model.__doc__ = cls.title
+
+    _response_models[cls] = model
+    return model
+
+
+def error_responses(endpoint):
+    """Describe the error responses of an endpoint, from what it may raise.
+
+    Returns a `responses` dict, as accepted by FastAPI routes, that has
+    an entry for each status code used by the :class:`XC` exceptions
+    that the endpoint is declared to raise by :func:`raises`, and by
+    their subclasses, since those may be raised too.   Only subclasses
+    that have been declared (imported) by the time this is called
+    are included.
+
+    If the endpoint makes no declaration, returns :data:`ErrorResponses`.
+    """
+
+    allowed = may_raise(endpoint)
+    if allowed == {Exception}:
+        return ErrorResponses
+
+    bases = tuple(cls for cls in allowed if isinstance(cls, _XCType))
+    classes = set(bases)
+    if bases:
+        declared = list(_XCType._by_typename.values())
+        classes.update(k for k in declared if issubclass(k, bases))
+
+    by_status = {}
+    for cls in sorted(classes, key=lambda c: c.typename):
+        by_status.setdefault(cls.status, []).append(cls)
+
+    responses = {}
+    for (status, classes) in by_status.items():
+        models = tuple(error_response_model(cls) for cls in classes)
+        responses[status] = dict(
+            model=Union[models] if len(models) > 1 else models[0],
+            description='; '.join(cls.title for cls in classes),
+        )
+    return responses
+
 
 class APIRoute(routing.APIRoute):
     """A version of the :cls:`fastapi.routing.APIRoute` that figures out the
@@ -92,11 +160,16 @@ class APIRoute(routing.APIRoute):
             rype = response_model
 
         responses = responses or {}
-        combined_responses = {**responses, **ErrorResponses}
+        combined_responses = {**error_responses(endpoint), **responses}
 
         if unexpected_args:
             print(f"xc.APIRoute unexpected_args: {unexpected_args}")
 
+        # Leave FastAPI to supply its own default
+
+        if response_class is not None:
+            unexpected_args['response_class'] = response_class
+
         super().__init__(
             path=path,
             endpoint=endpoint,
@@ -118,7 +191,6 @@ class APIRoute(routing.APIRoute):
             response_model_exclude_defaults=response_model_exclude_defaults,
             response_model_exclude_none=response_model_exclude_none,
             include_in_schema=include_in_schema,
-            response_class=response_class,
             dependency_overrides_provider=dependency_overrides_provider,
             callbacks=callbacks,
             **unexpected_args
@@ -138,7 +210,12 @@ class APIRouter(routing.APIRouter):
     ) -> None:
 
         if unexpected_args:
-            print(f"xc.APIRouter unexpected_args: {more_args}")
+            print(f"xc.APIRouter unexpected_args: {unexpected_args}")
+
+        # Leave FastAPI to supply its own default
+
+        if default_response_class is not None:
+            unexpected_args['default_response_class'] = default_response_class
 
         super().__init__(
             routes=routes,
@@ -146,6 +223,5 @@ class APIRouter(routing.APIRouter):
             default=default,
             dependency_overrides_provider=dependency_overrides_provider,
             route_class=route_class,
-            default_response_class=default_response_class,
             **unexpected_args
         )
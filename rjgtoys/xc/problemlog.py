@@ -0,0 +1,255 @@
+"""
+Read logs of problem reports, in parallel.
+
+A problem log is a file of problem reports in JSON, one to a line
+(NDJSON), such as a server might write as it reports errors::
+
+    with open('errors.log', 'a') as log:
+        log.write(json_dumps(e.to_dict()) + '\\n')
+
+Logs get large, so these functions split them into chunks, on line
+boundaries, and, where there is more than one CPU, decode the chunks in
+a pool of processes.   Each process maps the file into memory and reads
+only its own chunks, so nothing but the results pass between processes.
+
+Those results still have to be pickled and unpickled, though: for
+:func:`read_log`, passing an exception back from a worker costs about as
+much as decoding it in the first place, so a pool is slower than
+a single process unless there are CPUs to spare.
+
+To count the reports by type and status::
+
+    from rjgtoys.xc.problemlog import log_stats
+
+    stats = log_stats('errors.log')
+    print(stats.by_type.most_common(10))
+
+To decode the reports into exceptions, in the order they were written::
+
+    from rjgtoys.xc.problemlog import read_log
+
+    for e in read_log('errors.log'):
+        ...
+
+The exception classes must be declared in the worker processes too,
+so they should be importable, or declared with :func:`rjgtoys.xc.declare_types`.
+Reports of other types are decoded as :exc:`UnknownXC`.
+
+.. autofunction:: log_stats
+
+.. autoclass:: LogStats
+
+.. autofunction:: read_log
+
+.. autofunction:: log_chunks
+
+"""
+
+import collections
+import concurrent.futures
+import json
+import mmap
+import os
+
+from rjgtoys.xc import Error
+from rjgtoys.xc._thing import Thing
+
+# The size of the chunks that logs are split into
+
+CHUNK_SIZE = 1 << 22
+
+
+class LogStats:
+    """Statistics of the reports in a problem log.
+
+    total
+      The number of reports
+    by_type
+      A :class:`collections.Counter` of the reports by typename
+    by_status
+      A :class:`collections.Counter` of the reports by status
+    invalid
+      The number of lines that were not valid JSON
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.by_type = collections.Counter()
+        self.by_status = collections.Counter()
+        self.invalid = 0
+
+    def add(self, other):
+        """Add the statistics of another part of the log to these."""
+
+        self.total += other.total
+        self.by_type.update(other.by_type)
+        self.by_status.update(other.by_status)
+        self.invalid += other.invalid
+
+    def __repr__(self):
+        return "LogStats(total=%d, invalid=%d)" % (self.total, self.invalid)
+
+
+def _open(path):
+    """Map a file into memory; returns None if the file is empty."""
+
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def log_chunks(path, chunk_size=CHUNK_SIZE):
+    """Split a file into chunks of about `chunk_size` bytes, that end at the ends of lines.
+
+    Returns a list of (start, end) offsets.
+    """
+
+    data = _open(path)
+    if data is None:
+        return []
+
+    chunks = []
+    size = len(data)
+    start = 0
+    with data:
+        while start < size:
+            end = data.find(b'\n', min(start + chunk_size, size) - 1)
+            end = size if end < 0 else end + 1
+            chunks.append((start, end))
+            start = end
+    return chunks
+
+
+def _read_chunk(path, start, end):
+    """Return the lines of a chunk of a file that aren't blank."""
+
+    data = _open(path)
+    with data:
+        text = data[start:end]
+    return [line for line in text.split(b'\n') if line.strip()]
+
+
+# Decoders for the reports; log_stats doesn't need Things
+
+_plain_decoder = json.JSONDecoder()
+_thing_decoder = json.JSONDecoder(object_hook=Thing)
+
+
+def _decode_line(line, decoder):
+    """Decode a line that should hold exactly one JSON value.
+
+    Raises :exc:`ValueError` if it holds anything else.
+    """
+
+    text = line.decode('utf-8').strip()
+    (value, end) = decoder.raw_decode(text)
+    if end != len(text):
+        raise json.JSONDecodeError("Extra data", text, end)
+    return value
+
+
+def _decode_lines(lines, decoder=_plain_decoder):
+    """Decode lines of JSON; invalid lines become None."""
+
+    result = []
+    for line in lines:
+        try:
+            result.append(_decode_line(line, decoder))
+        except ValueError:
+            result.append(None)
+    return result
+
+
+def _chunk_stats(path, start, end):
+    """Return the :class:`LogStats` of a chunk of a log."""
+
+    stats = LogStats()
+    for report in _decode_lines(_read_chunk(path, start, end)):
+        if not isinstance(report, dict):
+            stats.invalid += 1
+            continue
+        stats.total += 1
+        stats.by_type[report.get('type')] += 1
+        stats.by_status[report.get('status')] += 1
+    return stats
+
+
+def _chunk_problems(path, start, end, base):
+    """Return the exceptions reported in a chunk of a log."""
+
+    result = []
+    for line in _read_chunk(path, start, end):
+        report = _decode_line(line, _thing_decoder)
+        if not isinstance(report, dict):
+            raise ValueError("Not a problem report: %r" % (line[:80],))
+        result.append(base.from_obj(report))
+    return result
+
+
+def _map(fn, path, chunks, workers, *args):
+    """Generate the results of `fn` for each chunk of a file, in order.
+
+    Uses a pool of `workers` processes, unless there's only one
+    worker or one chunk; no more than two chunks per worker are
+    in progress at a time, so that the results don't pile up
+    if they are consumed slowly.
+
+    If `workers` is None, a pool is only used if there is more than
+    one CPU, with one process per CPU.
+    """
+
+    if workers is None:
+        cpus = os.cpu_count() or 1
+        workers = cpus if cpus > 1 else 1
+
+    if workers <= 1 or len(chunks) <= 1:
+        for (start, end) in chunks:
+            yield fn(path, start, end, *args)
+        return
+
+    pending = collections.deque()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        try:
+            for (start, end) in chunks:
+                pending.append(pool.submit(fn, path, start, end, *args))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for f in pending:
+                f.cancel()
+
+
+def log_stats(path, workers=None, chunk_size=CHUNK_SIZE):
+    """Count the reports in a problem log, by type and status.
+
+    :param path: The name of the log file
+    :param workers: The number of processes to use; by default, one per CPU,
+        or none but this one if there is only one CPU
+    :param chunk_size: The approximate size of the chunks to split the log into
+
+    Returns a :class:`LogStats`.
+    """
+
+    stats = LogStats()
+    for part in _map(_chunk_stats, path, log_chunks(path, chunk_size), workers):
+        stats.add(part)
+    return stats
+
+
+def read_log(path, base=Error, workers=None, chunk_size=CHUNK_SIZE):
+    """Generate the exceptions reported in a problem log, in order.
+
+    :param path: The name of the log file
+    :param base: The class to decode reports with; see :meth:`XC.from_obj`
+    :param workers: The number of processes to use; by default, one per CPU,
+        or none but this one if there is only one CPU
+    :param chunk_size: The approximate size of the chunks to split the log into
+
+    Raises :exc:`ValueError` if a line is not a valid JSON object.
+    """
+
+    for part in _map(_chunk_problems, path, log_chunks(path, chunk_size), workers, base):
+        yield from part
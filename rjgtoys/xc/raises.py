@@ -3,28 +3,45 @@ Auto-document and enforce exception raising behaviour.
 
 """
 
+import collections
 import functools
 import inspect
-from dataclasses import dataclass
-import jinja2
+import sys
 
 from rjgtoys import xc
+from rjgtoys.xc._result import Err
 
+# From Python 3.11, a bare 'raise' takes the traceback from the
+# exception being re-raised; earlier versions use the one saved
+# when it was caught.
 
-@dataclass
-class ExceptionInfo:
-    module: str
-    name: str
-    qualname: str
-    title: str
-    isleaf: bool
+_RERAISE_USES_EXCEPTION_TRACEBACK = sys.version_info >= (3, 11)
+
+
+ExceptionInfo = collections.namedtuple(
+    'ExceptionInfo', ('module', 'name', 'qualname', 'title', 'isleaf')
+)
 
 
 class raises:
-    def __init__(self, *excs):
+
+    # If True, a disallowed exception is replaced by a BadExceptionBug
+    # that holds only a summary of it, and not the exception itself
+
+    summarize = False
+
+    def __init__(self, *excs, summarize=None, result=False):
 
         self._raises = tuple(self.flatten(excs))
 
+        if summarize is not None:
+            self.summarize = summarize
+
+        # If True, the function returns a Result, and any
+        # Err it returns must hold one of the allowed exceptions
+
+        self.result = result
+
         # Just a single None means the function may raise no exceptions at all
 
         if self._raises == (None,):
@@ -34,16 +51,10 @@ class raises:
 
         # Generate the enforcing function
 
-        @functools.wraps(f)
-        def _f(*args, **kwargs):
-            try:
-                return f(*args, **kwargs)
-            except self._raises:  # Allowed exceptions are just propagated
-                raise
-            except xc.Bug:  # Any bugs are just propagated
-                raise
-            except Exception as bug:
-                raise xc.BadExceptionBug(raised=bug) from bug
+        if self.result:
+            _f = self.result_wrapper(f)
+        else:
+            _f = self.wrapper(f)
 
         # Save the allowed exception list
 
@@ -72,6 +83,68 @@ class raises:
 
         return _f
 
+    def wrapper(self, f):
+        """Return a function that calls `f` and enforces the constraint on what it raises."""
+
+        @functools.wraps(f)
+        def _f(*args, **kwargs):
+            try:
+                return f(*args, **kwargs)
+            except self._raises as e:  # Allowed exceptions are just propagated
+                if getattr(e, 'lightweight', False):
+                    # ...without the frames below this one
+                    e.detach()
+                    if not _RERAISE_USES_EXCEPTION_TRACEBACK:
+                        raise e
+                raise
+            except xc.Bug:  # Any bugs are just propagated
+                raise
+            except Exception as bug:
+                if not self.summarize:
+                    raise xc.BadExceptionBug(raised=bug) from bug
+                bad = xc.BadExceptionBug(
+                    raised=xc.ExceptionSummary.from_exception(bug)
+                )
+            # Raised outside the handler so that the original exception
+            # does not become its context
+            raise bad
+
+        return _f
+
+    def result_wrapper(self, f):
+        """Return a function that calls `f`, which returns a :class:`Result`.
+
+        Allowed :class:`XC` exceptions raised by `f` are returned
+        as :class:`Err`, and an :class:`Err` that holds an exception
+        that is not allowed is treated as if `f` had raised it.
+        """
+
+        @functools.wraps(f)
+        def _f(*args, **kwargs):
+            try:
+                r = f(*args, **kwargs)
+            except self._raises as e:
+                if isinstance(e, xc.XC):
+                    return Err.from_exception(e)
+                raise
+            except xc.Bug:  # Any bugs are just propagated
+                raise
+            except Exception as bug:
+                if not self.summarize:
+                    raise xc.BadExceptionBug(raised=bug) from bug
+                bad = xc.BadExceptionBug(
+                    raised=xc.ExceptionSummary.from_exception(bug)
+                )
+            else:
+                if not isinstance(r, Err) or issubclass(r.xc, self._raises):
+                    return r
+                bad = r.exception()
+                if not issubclass(r.xc, xc.Bug):
+                    bad = xc.BadExceptionBug(raised=bad)
+            raise bad
+
+        return _f
+
     DEFAULT_TEMPLATE = """
 
     Raises:
@@ -95,6 +168,8 @@ class raises:
     def render_template(self, template, **args):
         """Find and render a template."""
 
+        import jinja2
+
         env = jinja2.Environment(loader=jinja2.FunctionLoader(self.get_template))
 
         tpl = env.get_template(template)
@@ -105,8 +180,31 @@ class raises:
 
         info = list(self.get_exception_info())
 
+        # Only use jinja2 if the template may have been changed
+
+        cls = type(self)
+        if (
+            cls.DEFAULT_TEMPLATE is raises.DEFAULT_TEMPLATE
+            and cls.get_template is raises.get_template
+            and cls.render_template is raises.render_template
+        ):
+            return self.render_default(info)
+
         return self.render_template('default', exceptions=info)
 
+    @staticmethod
+    def render_default(exceptions):
+        """Produce the same as the default template, without using jinja2."""
+
+        parts = ["\n\nRaises:\n\n"]
+        for e in exceptions:
+            name = ":exc:`~%s`" % (e.qualname)
+            if not e.isleaf:
+                name += " (or a subclass of it)"
+            parts.append("\n\n%s\n\n    %s\n" % (name, e.title))
+        parts.append("\n")
+        return "".join(parts)
+
     def get_exception_info(self):
 
         exceptions = []
@@ -0,0 +1,198 @@
+"""
+Exception classes for clients, made from a service's catalogue.
+
+A client need not import the package that declares the exceptions
+of a service in order to decode its errors; it can make equivalent
+classes from the catalogue that the service publishes (see
+:func:`rjgtoys.xc.starlette.catalogue_route`)::
+
+    from rjgtoys.xc import Error
+    from rjgtoys.xc.remote import load_catalogue
+
+    types = load_catalogue('http://service/errors', cache_path='errors.json')
+
+    try:
+        ...
+    except Error as e:
+        if isinstance(e, types['myservice.NotFound']):
+            ...
+
+The classes are ordinary :class:`XC` subclasses, registered as usual,
+so :meth:`XC.from_obj` produces instances of them.   Their content
+models are only built when they are first used, so making a class
+costs little more than making any other Python class.
+
+Where a real class has been imported, it's used instead of
+making a new one.
+
+.. autofunction:: load_catalogue
+
+.. autofunction:: fetch_catalogue
+
+.. autofunction:: synthesize
+
+"""
+
+import json
+import os
+import urllib.error
+import urllib.request
+
+from typing import Any, List, Optional
+
+from rjgtoys.xc import Error
+from rjgtoys.xc._xc import _Title, _XCType
+
+# How JSON schema types map to Python types
+
+_TYPES = {
+    'string': str,
+    'integer': int,
+    'number': float,
+    'boolean': bool,
+    'array': list,
+    'object': dict,
+}
+
+
+def _annotation(prop):
+    """Return the Python type for a property of a JSON schema."""
+
+    t = _TYPES.get(prop.get('type'), Any)
+    if t is list:
+        return List[_annotation(prop.get('items', {}))]
+    return t
+
+
+def _make_class(entry, bases):
+    """Make an exception class from a catalogue entry."""
+
+    schema = entry['schema']
+    required = schema.get('required', ())
+
+    annotations = {}
+    attrs = dict(
+        __module__=entry['module'],
+        __qualname__=entry['qualname'],
+        __doc__=entry['title'],
+        typename=entry['type'],
+        typecode=entry['typecode'],
+        title=entry['title'],
+        status=entry['status'],
+        detail=entry['detail'],
+        _xc_entry=entry,
+    )
+
+    for (name, prop) in schema.get('properties', {}).items():
+        t = _annotation(prop)
+        if name in required:
+            annotations[name] = t
+            attrs[name] = _Title(prop.get('title', name))
+        else:
+            annotations[name] = Optional[t]
+            attrs[name] = prop.get('default')
+
+    attrs['__annotations__'] = annotations
+
+    name = entry['qualname'].rsplit('.', 1)[-1]
+    return _XCType(name, tuple(bases), attrs)
+
+
+def synthesize(document, base=Error):
+    """Make exception classes from a catalogue document.
+
+    :param document: A catalogue, as served by :func:`rjgtoys.xc.starlette.catalogue_route`
+    :param base: The base class to use for a class whose bases are neither in
+        the catalogue nor declared here
+
+    Returns a dict that maps each typename in the catalogue to its class.
+
+    A typename that already has a class is only given a new one if
+    it was made from a different catalogue entry.
+    """
+
+    entries = {e['type']: e for e in document['types']}
+    classes = {}
+
+    def make(typename):
+        try:
+            return classes[typename]
+        except KeyError:
+            pass
+
+        entry = entries[typename]
+
+        kls = _XCType.by_typename(typename)
+        if kls is None or kls.__dict__.get('_xc_entry', entry) != entry:
+            bases = []
+            for b in entry['bases']:
+                if b in entries:
+                    bases.append(make(b))
+                else:
+                    bases.append(_XCType.by_typename(b) or base)
+
+            kls = _make_class(entry, bases or [base])
+
+        classes[typename] = kls
+        return kls
+
+    for typename in entries:
+        make(typename)
+
+    return classes
+
+
+def fetch_catalogue(url, cache_path=None, timeout=10):
+    """Fetch a catalogue document, using a copy saved on disk if it's still current.
+
+    :param url: The URL of the catalogue
+    :param cache_path: The name of a file in which to keep a copy of the catalogue,
+        with its `ETag`
+    :param timeout: How long to wait for the service, in seconds
+
+    If there is a saved copy, the service is asked for the catalogue only if it
+    has changed; if it hasn't, or the service can't be reached, the saved copy
+    is used.
+    """
+
+    cached = None
+    if cache_path is not None:
+        try:
+            with open(cache_path, 'r') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            cached = None
+
+    request = urllib.request.Request(url)
+    if cached is not None:
+        request.add_header('If-None-Match', cached['etag'])
+
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            document = json.loads(response.read().decode('utf-8'))
+            etag = response.headers.get('ETag')
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and cached is not None:
+            return cached['document']
+        raise
+    except urllib.error.URLError:
+        if cached is not None:
+            return cached['document']
+        raise
+
+    if cache_path is not None and etag:
+        tmp = cache_path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(dict(etag=etag, document=document), f)
+        os.replace(tmp, cache_path)
+
+    return document
+
+
+def load_catalogue(url, cache_path=None, base=Error, timeout=10):
+    """Fetch a catalogue and make classes for the exceptions it describes.
+
+    See :func:`fetch_catalogue` and :func:`synthesize`.
+    """
+
+    return synthesize(fetch_catalogue(url, cache_path, timeout=timeout), base=base)
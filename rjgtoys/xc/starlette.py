@@ -4,24 +4,157 @@ Helpers for starlette-based API servers.
 
 """
 
+import hashlib
+
 from typing import *
 
 from pydantic import BaseModel
 
 from starlette.requests import Request
-from starlette.responses import Response, JSONResponse
-from starlette.routing import BaseRoute
+from starlette.responses import Response, JSONResponse, StreamingResponse
+from starlette.routing import BaseRoute, Route
 from starlette.types import ASGIApp
 
 
 from rjgtoys.xc import Error, Title
+from rjgtoys.xc._group import XCGroup
+from rjgtoys.xc._json import json_dumps_iter
+from rjgtoys.xc._xc import _XCType
+from rjgtoys.xc.catalogue import _encode_entry
+
+
+class StreamingJSONResponse(StreamingResponse):
+    """A response that sends a JSON document in chunks, as it is encoded.
+
+    The document is encoded as by :func:`rjgtoys.xc._json.json_dumps`, but the
+    whole encoding is never held in memory, which matters for large documents
+    such as the reports of big batches of errors.
+    """
+
+    media_type = 'application/json'
+
+    def __init__(
+        self,
+        content,
+        status_code=200,
+        headers=None,
+        media_type=None,
+        background=None,
+        chunk_size=65536,
+    ):
+        super().__init__(
+            json_dumps_iter(content, chunk_size),
+            status_code=status_code,
+            headers=headers,
+            media_type=media_type,
+            background=background,
+        )
 
 
 async def handle_xc(request: Request, exc: Error):
+    """Produce a problem report in response to an exception.
+
+    Reports of an :exc:`XCGroup`, that can be any size, are streamed.
+    """
+
+    if isinstance(exc, XCGroup):
+        return StreamingJSONResponse(
+            exc.to_dict(),
+            status_code=exc.status,
+            media_type='application/problem+json',
+        )
 
-    #    print("Handing exception %s" % (exc))
     return JSONResponse(
         status_code=exc.status,
         content=exc.to_dict(),
         media_type='application/problem+json',
     )
+
+
+class CatalogueEndpoint:
+    """Serves a catalogue of the exceptions that a service may produce.
+
+    :param base: The base class of the exceptions to include
+
+    The catalogue is a JSON object with a member `types` that is a
+    list of entries as produced by :func:`rjgtoys.xc.catalogue.catalogue_entry`,
+    in order of typename.
+
+    The response body is only rebuilt when more exception classes
+    have been declared, and then only the entries for new classes are
+    computed.   Responses carry an `ETag`, so clients can poll cheaply
+    with `If-None-Match`.
+    """
+
+    def __init__(self, base=Error):
+        self.base = base
+        self.body = None
+        self.etag = None
+
+        self._generation = None
+
+        # Encoded entries, by typename: (class, bytes)
+
+        self._entries = {}
+
+    def refresh(self):
+        """Bring the body up to date with the classes that have been declared."""
+
+        if self._generation == _XCType._generation:
+            return
+
+        generation = _XCType._generation
+
+        entries = {}
+        for (typename, cls) in list(_XCType._by_typename.items()):
+            if not issubclass(cls, self.base):
+                continue
+            old = self._entries.get(typename)
+            if old is None or old[0] is not cls:
+                old = (cls, _encode_entry(cls))
+            entries[typename] = old
+
+        body = b'{"types":[%s]}' % (b','.join(entries[t][1] for t in sorted(entries)))
+
+        self._entries = entries
+        self.body = body
+        self.etag = '"%s"' % (hashlib.sha256(body).hexdigest()[:32])
+        self._generation = generation
+
+    def matches(self, request):
+        """Does the `If-None-Match` header of a request match the current body?"""
+
+        tags = request.headers.get('if-none-match')
+        if not tags:
+            return False
+
+        for tag in tags.split(','):
+            tag = tag.strip()
+            if tag == '*' or tag.replace('W/', '', 1) == self.etag:
+                return True
+        return False
+
+    async def serve(self, request: Request):
+        self.refresh()
+
+        headers = {'ETag': self.etag, 'Cache-Control': 'no-cache'}
+
+        if self.matches(request):
+            return Response(status_code=304, headers=headers)
+
+        return Response(self.body, media_type='application/json', headers=headers)
+
+
+def catalogue_route(path='/errors', base=Error, name='xc_catalogue'):
+    """Make a route that serves a catalogue of exceptions.
+
+    :param path: The path of the route
+    :param base: The base class of the exceptions to include
+    :param name: The name of the route
+
+    See :class:`CatalogueEndpoint`.   To add it to an application::
+
+        app.router.routes.append(catalogue_route())
+    """
+
+    return Route(path, CatalogueEndpoint(base).serve, methods=['GET'], name=name)
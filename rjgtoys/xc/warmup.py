@@ -0,0 +1,158 @@
+"""
+Prepare exception classes before a server forks its workers.
+
+Exception content models are normally built when they are first
+needed, which means that each worker of a pre-fork server builds
+its own copies, and the first error each worker reports is slow.
+
+Calling :func:`warmup` in the parent process, before it forks,
+builds everything once; if it also freezes the garbage collector
+state, the objects it made stay on pages that the workers share::
+
+    from rjgtoys.xc.warmup import warmup
+
+    warmup(['myapp.errors', 'myapp.api'])
+
+The modules to import can also be named, separated by commas, in the
+environment variable ``RJGTOYS_XC_WARMUP``.
+
+Classes whose locations have only been declared, by
+:func:`rjgtoys.xc.declare_types` or by entry points, are imported and
+prepared too if ``declared=True`` is passed.
+
+It can also be run as a command, which is a quick way to check that
+all the classes in some modules can be prepared, and to see how long
+that takes::
+
+    python -m rjgtoys.xc.warmup [--declared] myapp.errors myapp.api
+
+.. autofunction:: warmup
+
+"""
+
+import argparse
+import gc
+import importlib
+import os
+import sys
+import time
+import warnings
+
+from rjgtoys import xc
+from rjgtoys.xc._xc import _XCType, _compact_json
+
+# The environment variable that names modules to import
+
+ENV_VAR = 'RJGTOYS_XC_WARMUP'
+
+# Modules that this package imports only when they are first used
+
+_LAZY_MODULES = (
+    'urllib.parse',
+    'hashlib',
+    'rjgtoys.xc._json',
+    'rjgtoys.xc._cbor',
+)
+
+
+def env_modules():
+    """Return the list of modules named by the environment variable."""
+
+    names = os.environ.get(ENV_VAR, '')
+    return [n.strip() for n in names.split(',') if n.strip()]
+
+
+def _warn(kls, e):
+    warnings.warn("Can't prepare %s: %s" % (kls.typename, e), RuntimeWarning)
+
+
+def warmup(modules=None, freeze=True, declared=False, on_error=None):
+    """Import some modules and prepare every exception class they declare.
+
+    :param modules: The names of modules to import; if None, those
+        named by the ``RJGTOYS_XC_WARMUP`` environment variable
+    :param freeze: If True (the default), collect garbage and then
+        freeze the garbage collector state, if this version of Python
+        supports it
+    :param declared: If True, also import the classes whose locations
+        have been declared, but that have not been imported yet
+    :param on_error: Called as ``on_error(cls, exception)`` for each class
+        that can't be prepared; by default, a :exc:`RuntimeWarning` is issued
+
+    Builds the content model and JSON schema of every :class:`XC`
+    subclass that is registered, including those declared by this
+    package, and loads the parts of this package that are otherwise
+    imported on first use.
+
+    Returns the list of classes that were prepared; any that could
+    not be are left out.
+    """
+
+    if modules is None:
+        modules = env_modules()
+
+    if on_error is None:
+        on_error = _warn
+
+    for name in modules:
+        importlib.import_module(name)
+
+    if declared:
+        for typename in list(_XCType._declared()):
+            _XCType.by_typename(typename)
+
+    for name in _LAZY_MODULES:
+        importlib.import_module(name)
+
+    for name in xc._LAZY:
+        getattr(xc, name)
+
+    _compact_json(None)
+
+    classes = []
+    for kls in list(_XCType._by_typename.values()):
+        try:
+            kls._model
+            kls.content_schema()
+        except Exception as e:
+            on_error(kls, e)
+            continue
+        classes.append(kls)
+
+    if freeze:
+        gc.collect()
+        if hasattr(gc, 'freeze'):
+            gc.freeze()
+
+    return classes
+
+
+def main(argv=None):
+    """Prepare the classes in the modules named by `argv`, and report on them."""
+
+    p = argparse.ArgumentParser('python -m rjgtoys.xc.warmup')
+    p.add_argument(
+        '--declared', action='store_true', help="Also import the declared classes"
+    )
+    p.add_argument('modules', nargs='*', help="Modules to import")
+    args = p.parse_args(argv)
+
+    failed = []
+
+    def report(kls, e):
+        failed.append(kls)
+        print("Can't prepare %s: %s" % (kls.typename, e))
+
+    start = time.perf_counter()
+    classes = warmup(
+        args.modules or None, freeze=False, declared=args.declared, on_error=report
+    )
+    elapsed = time.perf_counter() - start
+
+    print("Prepared %d exception classes in %.1fms" % (len(classes), elapsed * 1000))
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
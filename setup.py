@@ -19,12 +19,13 @@ setup(
     ],
     extras_require = {
         'autodoc': ['sphinx_autodoc_typehints'],
-        'fastapi': ['fastapi>=0.61.1']
+        'fastapi': ['fastapi>=0.61.1'],
+        'yaml': ['PyYAML'],
     },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
-    python_requires='>=3.6'
+    python_requires='>=3.7'
 )
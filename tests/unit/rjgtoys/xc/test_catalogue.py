@@ -0,0 +1,168 @@
+"""
+Tests for exception catalogues.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from rjgtoys.xc import Error, Title
+from rjgtoys.xc.catalogue import Catalogue, Problem, build_catalogue
+
+
+class CatalogueError(Error):
+    """Base of the catalogue test errors."""
+
+
+class Listed(CatalogueError):
+    """An error that is in the catalogue."""
+
+    title = "A listed error"
+
+    name: str = Title("A name")
+    count: int = 0
+
+    detail = "{name} was listed {count} times"
+
+    status = 409
+
+
+class Unlisted(Error):
+    """An error that is not in the catalogue."""
+
+
+@pytest.fixture
+def catalogue(tmp_path):
+    path = str(tmp_path / 'errors.xcc')
+    build_catalogue(path, [Error, CatalogueError, Listed])
+    with Catalogue(path) as cat:
+        yield cat
+
+
+def test_catalogue_entries(catalogue):
+
+    assert len(catalogue) == 3
+    assert sorted(catalogue.typenames()) == sorted(
+        c.typename for c in (Error, CatalogueError, Listed)
+    )
+
+    entry = catalogue.entry(Listed.typename)
+    assert entry['title'] == "A listed error"
+    assert entry['status'] == 409
+    assert entry['schema']['required'] == ['name']
+    assert entry['bases'] == [CatalogueError.typename]
+
+    assert catalogue.entry_by_code(Listed.typecode) == entry
+
+    assert Unlisted.typename not in catalogue
+    assert catalogue.entry_by_code(Unlisted.typecode) is None
+
+
+def test_catalogue_decode(catalogue):
+
+    e = Listed(name="thing", count=2)
+
+    p = catalogue.from_obj(e.to_dict())
+
+    assert isinstance(p, Problem)
+    assert p.typename == Listed.typename
+    assert p.status == 409
+    assert p.name == "thing"
+    assert str(p) == str(e)
+    assert p.is_a(Error.typename)
+    assert not p.is_a(Unlisted.typename)
+
+    with pytest.raises(AttributeError):
+        p.missing
+
+    assert p.resolve() == e
+
+
+def test_catalogue_decode_without_detail(catalogue):
+
+    data = Listed(name="thing", count=2).to_dict()
+    del data['detail']
+
+    p = catalogue.from_obj(data)
+
+    assert str(p) == "thing was listed 2 times"
+
+
+def test_catalogue_problem_copy(catalogue):
+
+    import copy
+
+    p = catalogue.from_obj(Listed(name="thing").to_dict())
+
+    q = copy.copy(p)
+
+    assert q.name == "thing"
+    assert str(q) == str(p)
+
+
+def test_catalogue_decode_bytes(catalogue):
+
+    e = Listed(name="thing", count=2)
+
+    p = catalogue.from_bytes(e.to_bytes())
+
+    assert str(p) == str(e)
+    assert p.resolve() == e
+
+
+def test_catalogue_unknown_type(catalogue):
+
+    with pytest.raises(TypeError):
+        catalogue.from_obj(Unlisted().to_dict())
+
+    with pytest.raises(TypeError):
+        catalogue.from_bytes(Unlisted().to_bytes())
+
+
+def test_not_a_catalogue(tmp_path):
+
+    path = tmp_path / 'other'
+    path.write_bytes(b'something else')
+
+    with pytest.raises(ValueError):
+        Catalogue(str(path))
+
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), *(['..'] * 4)))
+
+DECODE = '''
+import sys
+
+from rjgtoys.xc.catalogue import Catalogue
+
+p = Catalogue(sys.argv[1]).from_json(sys.argv[2])
+print(p.message, 'rjgtoys.xc._group' in sys.modules)
+p.resolve()
+print('rjgtoys.xc._group' in sys.modules)
+'''
+
+
+def test_decode_does_not_import(tmp_path):
+    """Decoding does not import the class; resolving does."""
+
+    from rjgtoys.xc import XCGroup
+    from rjgtoys.xc._json import json_dumps
+
+    path = str(tmp_path / 'errors.xcc')
+    build_catalogue(path)
+
+    report = json_dumps(XCGroup([Error()]).to_dict())
+
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, (ROOT, env.get('PYTHONPATH'))))
+    result = subprocess.run(
+        [sys.executable, '-c', DECODE, path, report],
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        env=env,
+        check=True,
+    )
+
+    assert result.stdout.split() == ['Multiple', 'errors', 'False', 'True']
@@ -0,0 +1,144 @@
+"""
+Tests for the FastAPI helpers.
+"""
+
+import pytest
+
+pytest.importorskip('fastapi')
+
+import fastapi
+
+from rjgtoys.xc import Error, Title
+from rjgtoys.xc.raises import raises
+from rjgtoys.xc.fastapi import (
+    APIRouter,
+    ErrorResponses,
+    error_response_model,
+    error_responses,
+)
+
+
+class NotFoundError(Error):
+    """The thing was not found."""
+
+    status = 404
+
+    name: str = Title("The name of the thing")
+
+
+class ConflictError(Error):
+    """The thing already exists."""
+
+    status = 409
+
+    name: str = Title("The name of the thing")
+
+
+class BusyError(Error):
+    """The thing is busy."""
+
+    status = 409
+
+    until: int = Title("When the thing will be free")
+
+
+class ThingError(Error):
+    """Something is wrong with the thing."""
+
+    name: str = Title("The name of the thing")
+
+
+class ThingGoneError(ThingError):
+    """The thing has gone."""
+
+    status = 410
+
+
+router = APIRouter()
+
+
+@router.get('/get')
+@raises(NotFoundError)
+def get_thing(name: str) -> int:
+    """Get a thing."""
+
+    return 1
+
+
+@router.get('/put')
+@raises(ConflictError, BusyError, ValueError)
+def put_thing(name: str) -> int:
+    """Put a thing."""
+
+    return 1
+
+
+@router.get('/thing')
+@raises(ThingError)
+def check_thing(name: str) -> int:
+    """Check a thing."""
+
+    return 1
+
+
+@router.get('/other')
+def other(name: str) -> int:
+    """Undeclared."""
+
+    return 1
+
+
+def test_error_responses():
+
+    responses = error_responses(put_thing)
+
+    assert set(responses) == {409}
+    assert responses[409]['description'] == (
+        "The thing is busy.; The thing already exists."
+    )
+
+    assert error_responses(other) is ErrorResponses
+
+
+def test_error_responses_subclasses():
+
+    responses = error_responses(check_thing)
+
+    assert set(responses) == {400, 410}
+    assert responses[410]['description'] == "The thing has gone."
+
+
+def test_error_response_model_shared():
+
+    model = error_response_model(NotFoundError)
+
+    assert error_response_model(NotFoundError) is model
+    assert error_responses(get_thing)[404]['model'] is model
+
+
+def test_openapi():
+
+    app = fastapi.FastAPI()
+    app.include_router(router)
+
+    spec = app.openapi()
+    paths = spec['paths']
+
+    get = paths['/get']['get']['responses']
+    assert get['404']['content']['application/json']['schema'] == {
+        '$ref': '#/components/schemas/NotFoundErrorResponse'
+    }
+
+    put = paths['/put']['get']['responses']
+    refs = put['409']['content']['application/json']['schema']['anyOf']
+    assert refs == [
+        {'$ref': '#/components/schemas/BusyErrorResponse'},
+        {'$ref': '#/components/schemas/ConflictErrorResponse'},
+    ]
+
+    assert '400' in paths['/other']['get']['responses']
+
+    schemas = spec['components']['schemas']
+    content = schemas['BusyErrorResponse']['properties']['content']
+    assert content['allOf'] == [{'$ref': '#/components/schemas/BusyError'}]
+    assert 'until' in schemas['BusyError']['properties']
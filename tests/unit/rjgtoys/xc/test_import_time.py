@@ -0,0 +1,112 @@
+"""
+Check that importing rjgtoys.xc stays cheap.
+"""
+
+import os
+import subprocess
+import sys
+
+# The budget for 'import rjgtoys.xc', in microseconds, as reported
+# by 'python -X importtime', not counting the rjgtoys namespace package,
+# which is shared with other distributions (and imports pkg_resources).
+# Importing pydantic eagerly added about 75ms.
+
+IMPORT_BUDGET_US = 50000
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), *(['..'] * 4)))
+
+
+def run_python(code):
+    """Run some code in a fresh interpreter; return its stderr."""
+
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, (ROOT, env.get('PYTHONPATH'))))
+
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        env=env,
+        check=True,
+    )
+    return result
+
+
+def cumulative_import_time(stderr, module):
+    """Find the cumulative import time of a module in -X importtime output."""
+
+    for line in stderr.splitlines():
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1])
+
+    raise AssertionError("No import time reported for %s" % (module))
+
+
+def test_import_budget():
+
+    result = run_python("import rjgtoys.xc")
+
+    t = cumulative_import_time(result.stderr, 'rjgtoys.xc')
+    t -= cumulative_import_time(result.stderr, 'rjgtoys')
+
+    assert t < IMPORT_BUDGET_US, "import rjgtoys.xc took %dus" % (t)
+
+
+DECLARE = '''
+import sys
+
+from rjgtoys.xc import Error
+from rjgtoys.xc.raises import raises
+
+class Declared(Error):
+    """An exception."""
+
+    name: str
+
+    count: int = 0
+
+@raises(Declared)
+def f():
+    """A function."""
+
+print(" ".join(m for m in ('pydantic', 'jinja2') if m in sys.modules))
+'''
+
+
+def test_declaring_is_light():
+    """Declaring exceptions and functions that raise them does not need pydantic or jinja2."""
+
+    result = run_python(DECLARE)
+
+    assert result.stdout.strip() == ''
+
+
+SYNTHESIZE = '''
+import sys
+
+from rjgtoys.xc.remote import synthesize
+
+synthesize(dict(types=[dict(
+    type='remote.Failed',
+    typecode=1,
+    title="It failed",
+    status=400,
+    detail="Failed: {name}",
+    schema=dict(properties=dict(name=dict(type='string')), required=['name']),
+    module='remote',
+    qualname='Failed',
+    bases=['rjgtoys.xc.Error'],
+)]))
+
+print(" ".join(m for m in ('pydantic', 'jinja2') if m in sys.modules))
+'''
+
+
+def test_synthesizing_is_light():
+    """Synthesizing exceptions from a catalogue does not need pydantic or jinja2."""
+
+    result = run_python(SYNTHESIZE)
+
+    assert result.stdout.strip() == ''
@@ -0,0 +1,301 @@
+"""
+Tests for the JSON helpers.
+"""
+
+import asyncio
+import io
+import json
+import os
+import pickle
+
+import pytest
+
+from rjgtoys.xc._filecache import FileCache
+from rjgtoys.xc import _json
+from rjgtoys.xc._json import (
+    json_dump,
+    json_dump_async,
+    json_dumps,
+    json_dumps_iter,
+    json_iter,
+    json_load,
+    json_load_file,
+    json_loads,
+)
+from rjgtoys.xc._thing import CompactThing, FrozenThing, Thing, record_class
+
+DOC = {
+    "errors": [
+        {"n": i, "text": "a \"quoted\" ]} \\", "parts": [1, {"x": None}]}
+        for i in range(5)
+    ],
+    "meta": {"name": "café"},
+    "count": 5,
+    "odd \"key\"": [True, False],
+}
+
+DATA = json.dumps(DOC).encode('utf-8')
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 65536])
+@pytest.mark.parametrize('path,expected', [
+    ('errors.*', DOC['errors']),
+    ('errors.*.parts.*', [p for e in DOC['errors'] for p in e['parts']]),
+    ('meta', [DOC['meta']]),
+    ('count', [5]),
+    ('odd "key".*', [True, False]),
+    ('', [DOC]),
+    ('missing.*', []),
+    ('*', []),
+])
+def test_iter_paths(path, expected, chunk_size):
+
+    assert list(json_iter(io.BytesIO(DATA), path, chunk_size=chunk_size)) == expected
+
+
+def test_iter_top_level_array():
+
+    items = list(json_iter(io.BytesIO(b' [ {"a": {"b": 1}}, 2 , "three" ] ')))
+
+    assert items == [{'a': {'b': 1}}, 2, 'three']
+    assert type(items[0]) is Thing
+    assert items[0].a.b == 1
+
+    assert list(json_iter(io.BytesIO(b'[]'))) == []
+
+
+def test_iter_compact():
+
+    items = list(json_iter(io.BytesIO(DATA), 'errors.*', compact=True))
+
+    assert all(type(i) is CompactThing for i in items)
+    assert items[0]._shape is items[1]._shape
+
+
+@pytest.mark.parametrize('data', [b'[1, 2', b'[1 2]', b'[1] x', b'{"a": [1, '])
+def test_iter_invalid(data):
+
+    with pytest.raises(ValueError):
+        list(json_iter(io.BytesIO(data), chunk_size=2))
+
+
+def test_load_binary():
+
+    t = json_load(io.BytesIO(DATA))
+
+    assert t == DOC
+    assert type(t.meta) is Thing
+
+
+def test_load_file(tmp_path):
+
+    path = tmp_path / 'config.json'
+    path.write_bytes(DATA)
+
+    t = json_load_file(path)
+
+    assert json.loads(json_dumps(t)) == DOC
+    assert type(t) is FrozenThing
+    assert type(t.errors) is tuple
+    assert t.meta.name == 'café'
+    assert t['errors'][0].parts[1].x is None
+    assert json_load_file(str(path)) is t
+
+    # A changed file is loaded again
+
+    path.write_text('{"changed": [1, 2]}')
+    os.utime(path, ns=(1, 1))
+
+    u = json_load_file(path)
+    assert u == {'changed': (1, 2)}
+    assert json_dumps(u) == '{"changed": [1, 2]}'
+
+
+def test_load_file_read_only(tmp_path):
+
+    path = tmp_path / 'config.json'
+    path.write_bytes(DATA)
+
+    t = json_load_file(path)
+
+    with pytest.raises(TypeError):
+        t.count = 6
+    with pytest.raises(TypeError):
+        t.meta['name'] = 'other'
+    with pytest.raises(TypeError):
+        del t.meta.name
+    with pytest.raises(TypeError):
+        t.errors[0].update(n=1)
+    with pytest.raises(TypeError):
+        t.merge({'count': 6})
+    with pytest.raises(AttributeError):
+        t.errors.append(None)
+
+    assert pickle.loads(pickle.dumps(t)) == t
+
+
+def test_file_cache_eviction(tmp_path):
+
+    loads = []
+
+    def load(data):
+        loads.append(data)
+        return data
+
+    cache = FileCache(load, maxsize=2)
+
+    paths = []
+    for n in range(3):
+        path = tmp_path / ('%d.txt' % (n))
+        path.write_bytes(b'%d' % (n))
+        paths.append(path)
+
+    assert [cache.get(p) for p in paths] == [b'0', b'1', b'2']
+    assert len(cache) == 2
+
+    cache.get(paths[2])
+    cache.get(paths[0])
+    assert len(loads) == 4
+
+    cache.discard(paths[0])
+    cache.get(paths[0])
+    assert len(loads) == 5
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+BIG = {
+    'errors': [dict(n=i, name='é%d' % (i), tags=['a', 'b'], extra={}) for i in range(50)],
+    'counts': {str(i): i * 1.5 for i in range(40)},
+    'floats': {3.5: [None, True, False, float('inf'), (1, [2, (3,)])], 1.5: 'x'},
+    'nested': [[[list(range(20))]]],
+}
+
+
+@pytest.mark.parametrize('one_shot', [0, 1, 5, 256])
+@pytest.mark.parametrize('chunk_size', [1, 100, 65536])
+def test_dumps_iter(monkeypatch, one_shot, chunk_size):
+
+    monkeypatch.setattr(_json, '_ONE_SHOT_ITEMS', one_shot)
+
+    chunks = list(json_dumps_iter(BIG, chunk_size))
+
+    assert ''.join(chunks) == json_dumps(BIG)
+    if chunk_size == 1 and one_shot < 256:
+        assert len(chunks) > 1
+
+
+@pytest.mark.parametrize('obj', [{1: [1], 'a': 2}, {(1, 2): [1]}, set([1])])
+def test_dumps_iter_invalid(monkeypatch, obj):
+
+    monkeypatch.setattr(_json, '_ONE_SHOT_ITEMS', 0)
+
+    with pytest.raises(TypeError):
+        json_dumps(obj)
+    with pytest.raises(TypeError):
+        ''.join(json_dumps_iter(obj))
+
+
+def test_dumps_iter_circular(monkeypatch):
+
+    monkeypatch.setattr(_json, '_ONE_SHOT_ITEMS', 0)
+
+    a = [1]
+    a.append({'a': a})
+
+    with pytest.raises(ValueError):
+        ''.join(json_dumps_iter(a))
+
+
+def test_dump_streams():
+
+    text = io.StringIO()
+    json_dump(BIG, text, chunk_size=10)
+    assert text.getvalue() == json_dumps(BIG)
+
+    binary = io.BytesIO()
+    json_dump(BIG, binary, chunk_size=10)
+    assert binary.getvalue() == json_dumps(BIG).encode('ascii')
+
+
+def test_dump_async():
+
+    class Writer:
+        def __init__(self):
+            self.data = []
+            self.drained = 0
+
+        def write(self, data):
+            self.data.append(data)
+
+        async def drain(self):
+            self.drained += 1
+
+    w = Writer()
+    asyncio.run(json_dump_async(BIG, w, chunk_size=100))
+
+    assert b''.join(w.data) == json_dumps(BIG).encode('ascii')
+    assert w.drained == len(w.data) > 1
+
+
+@pytest.mark.parametrize('one_shot', [0, 256])
+def test_dumps_compact(monkeypatch, one_shot):
+
+    monkeypatch.setattr(_json, '_ONE_SHOT_ITEMS', one_shot)
+
+    text = json_dumps(BIG)
+    compact = json_loads(text, compact=True)
+
+    assert isinstance(compact['errors'][0], CompactThing)
+    assert json_dumps(compact) == text
+    assert ''.join(json_dumps_iter(compact, 10)) == text
+
+
+@pytest.mark.parametrize('kwargs', [
+    dict(object_hook=dict, compact=True),
+    dict(compact=True, records=[object]),
+    dict(object_hook=dict, records=[object]),
+])
+def test_loads_one_hook(kwargs):
+
+    with pytest.raises(ValueError):
+        json_loads('{}', **kwargs)
+
+
+@pytest.mark.parametrize('one_shot', [0, 256])
+def test_dumps_records(monkeypatch, one_shot):
+
+    monkeypatch.setattr(_json, '_ONE_SHOT_ITEMS', one_shot)
+
+    Error = record_class(BIG['errors'][0], name='Error')
+
+    text = json_dumps(BIG)
+    records = json_loads(text, records=[Error])
+
+    assert type(records['errors'][0]) is Error
+    assert json_dumps(records) == text
+    assert ''.join(json_dumps_iter(records, 10)) == text
+    assert json_dumps(records['errors'][0]) == json_dumps(BIG['errors'][0])
+
+
+NUMBERS = [i + 0.123456 for i in range(50)] + [1.5e-300, -2E+20, 7e5, 12345678901234567890]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 5, 7, 11])
+def test_iter_numbers(chunk_size):
+
+    data = json.dumps(NUMBERS + [True, False, None]).encode('ascii')
+
+    assert list(json_iter(io.BytesIO(data), chunk_size=chunk_size)) == json.loads(data)
+
+    for n in NUMBERS:
+        data = json.dumps(n).encode('ascii')
+        assert list(json_iter(io.BytesIO(data), '', chunk_size=chunk_size)) == [n]
+
+
+def test_iter_many_floats():
+
+    floats = [i + 0.123456 for i in range(200000)]
+
+    assert list(json_iter(io.BytesIO(json.dumps(floats).encode()))) == floats
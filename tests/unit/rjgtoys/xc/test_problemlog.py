@@ -0,0 +1,172 @@
+"""
+Tests for reading problem logs.
+"""
+
+import pytest
+
+from rjgtoys.xc import Error, Title, UnknownXC, XCGroup
+from rjgtoys.xc._json import json_dumps
+from rjgtoys.xc.problemlog import log_chunks, log_stats, read_log
+
+
+class LoggedError(Error):
+    """An error that was logged."""
+
+    status = 409
+
+    detail = "Item {n} failed"
+
+    n: int = Title("The item number")
+
+
+def reports(count):
+    for n in range(count):
+        if n % 10 == 0:
+            yield dict(type='other.Error', status=500, detail='Other', content={})
+        else:
+            yield LoggedError(n=n).to_dict()
+
+
+@pytest.fixture
+def log(tmp_path):
+    path = tmp_path / 'errors.log'
+    path.write_text(''.join(json_dumps(r) + '\n' for r in reports(100)))
+    return str(path)
+
+
+def test_chunks(log):
+
+    chunks = log_chunks(log, chunk_size=1000)
+
+    assert len(chunks) > 1
+    assert chunks[0][0] == 0
+    for (a, b) in zip(chunks, chunks[1:]):
+        assert a[1] == b[0]
+
+    with open(log, 'rb') as f:
+        data = f.read()
+
+    assert chunks[-1][1] == len(data)
+    for (start, end) in chunks:
+        assert data[end - 1 : end] == b'\n'
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_stats(log, workers):
+
+    stats = log_stats(log, workers=workers, chunk_size=1000)
+
+    assert stats.total == 100
+    assert stats.invalid == 0
+    assert stats.by_type[LoggedError.typename] == 90
+    assert stats.by_type['other.Error'] == 10
+    assert stats.by_status == {409: 90, 500: 10}
+
+
+def test_stats_invalid(log):
+
+    with open(log, 'a') as f:
+        f.write('not json\n\n[1]\n')
+
+    stats = log_stats(log, workers=1)
+
+    assert stats.total == 100
+    assert stats.invalid == 2
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_read(log, workers):
+
+    errors = list(read_log(log, workers=workers, chunk_size=1000))
+
+    assert len(errors) == 100
+    for (n, e) in enumerate(errors):
+        if n % 10 == 0:
+            assert isinstance(e, UnknownXC)
+        else:
+            assert type(e) is LoggedError
+            assert e.n == n
+
+
+# A line that was cut short, and the rest of another, that pair up
+
+SPLIT = '{"type": "A", "status": 400},{"type": "B", "x": [1\n2], "status": 500}'
+
+
+@pytest.mark.parametrize(
+    'line', ['not json', '1,2', '{"a": 1},{"b": 2}', '[1]', '"x"', SPLIT]
+)
+def test_read_invalid(log, line):
+
+    with open(log, 'a') as f:
+        f.write(line + '\n')
+
+    with pytest.raises(ValueError):
+        list(read_log(log, workers=1))
+
+
+@pytest.mark.parametrize('line', ['1,2', '{"a": 1},{"b": 2}'])
+def test_stats_several_values(log, line):
+
+    with open(log, 'a') as f:
+        f.write(line + '\n')
+
+    stats = log_stats(log, workers=1)
+
+    assert stats.total == 100
+    assert stats.invalid == 1
+
+
+def test_stats_split_values(log):
+
+    with open(log, 'a') as f:
+        f.write(SPLIT + '\n')
+
+    stats = log_stats(log, workers=1)
+
+    assert stats.total == 100
+    assert stats.invalid == 2
+
+
+def test_one_cpu_no_pool(log, monkeypatch):
+
+    import concurrent.futures
+    import os
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError("A pool was used")
+
+    monkeypatch.setattr(os, 'cpu_count', lambda: 1)
+    monkeypatch.setattr(concurrent.futures, 'ProcessPoolExecutor', no_pool)
+
+    assert log_stats(log, chunk_size=1000).total == 100
+    assert len(list(read_log(log, chunk_size=1000))) == 100
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_read_groups(tmp_path, workers):
+
+    groups = [
+        XCGroup([LoggedError(n=n), LoggedError(n=n + 1)], message="Group %d" % (n))
+        for n in range(20)
+    ]
+
+    path = tmp_path / 'groups.log'
+    path.write_text(''.join(json_dumps(g.to_dict()) + '\n' for g in groups))
+
+    errors = list(read_log(str(path), workers=workers, chunk_size=1000))
+
+    assert errors == groups
+    for (e, g) in zip(errors, groups):
+        assert type(e) is XCGroup
+        assert list(e.exceptions) == list(g.exceptions)
+
+
+def test_empty(tmp_path):
+
+    path = tmp_path / 'empty.log'
+    path.write_text('')
+
+    assert log_chunks(str(path)) == []
+    assert log_stats(str(path)).total == 0
+    assert list(read_log(str(path))) == []
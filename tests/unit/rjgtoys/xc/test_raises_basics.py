@@ -229,3 +229,121 @@ def test_raises_exception_nonraising_case():
         for _ in raises_exception(__name__+'.lower',LowerEx(),LowerEx1()):
             upper(False)
 
+
+
+#
+# Lightweight exceptions lose the frames below the @raises wrapper
+#
+
+from rjgtoys.xc import Error
+
+
+class LightError(Error):
+    """A lightweight exception."""
+
+    lightweight = True
+
+
+def raise_light_inner():
+    raise LightError()
+
+
+@raises(LightError)
+def raise_light():
+    raise_light_inner()
+
+
+def test_raises_lightweight_truncated():
+
+    try:
+        raise_light()
+    except LightError as e:
+        tb = e.__traceback__
+
+    names = []
+    while tb is not None:
+        names.append(tb.tb_frame.f_code.co_name)
+        tb = tb.tb_next
+
+    assert 'raise_light_inner' not in names
+
+
+@raises(LightError)
+def raise_light_from():
+    try:
+        raise KeyError('k')
+    except KeyError as e:
+        raise LightError() from e
+
+
+def test_raises_lightweight_keeps_cause():
+
+    with pytest.raises(LightError) as e:
+        raise_light_from()
+
+    assert isinstance(e.value.__cause__, KeyError)
+
+
+#
+# Disallowed exceptions can be summarised rather than kept
+#
+
+import json
+
+from rjgtoys.xc import ExceptionSummary
+
+
+@raises(None, summarize=True)
+def may_not_raise_summarized():
+    """This function is not allowed to raise any exceptions, but does."""
+
+    raise Allowed2("x" * 5000)
+
+
+def test_raise_bad_summarized():
+
+    with pytest.raises(BadExceptionBug) as e:
+        may_not_raise_summarized()
+
+    bug = e.value
+
+    assert isinstance(bug.raised, ExceptionSummary)
+    assert bug.raised.type.endswith('Allowed2')
+    assert bug.raised.traceback[-1].endswith('in may_not_raise_summarized')
+
+    # The original exception has not been kept
+
+    assert bug.__cause__ is None
+    assert bug.__context__ is None
+
+
+def test_bad_exception_to_dict_bounded():
+
+    with pytest.raises(BadExceptionBug) as e:
+        raise_bad(False)
+
+    data = e.value.to_dict()
+
+    text = json.dumps(data)
+
+    assert len(text) < 5000
+    assert data['content']['raised']['type'].endswith('Allowed2')
+
+
+class UsesTemplate(raises):
+    """Forces the template to be rendered by jinja2."""
+
+    def render_template(self, template, **args):
+        return super().render_template(template, **args)
+
+
+def test_render_default_matches_template():
+
+    pytest.importorskip('jinja2')
+
+    excs = (Allowed1, Allowed2, BadExceptionBug)
+
+    def f():
+        """Documented."""
+
+    assert raises(excs)(f).__doc__ == UsesTemplate(excs)(f).__doc__
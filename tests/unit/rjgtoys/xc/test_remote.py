@@ -0,0 +1,145 @@
+"""
+Tests for classes made from a remote catalogue.
+"""
+
+import http.server
+import json
+import threading
+import zlib
+
+import pytest
+
+from rjgtoys.xc import Bug, Error
+from rjgtoys.xc.remote import fetch_catalogue, load_catalogue, synthesize
+
+
+def entry(typename, bases, properties=None, required=(), status=400):
+    return dict(
+        type=typename,
+        typecode=zlib.crc32(typename.encode('utf-8')),
+        title="The %s error" % (typename),
+        status=status,
+        detail="Failed: {name}" if properties else "Failed",
+        schema=dict(
+            title=typename,
+            type='object',
+            properties=properties or {},
+            required=list(required),
+        ),
+        module='remote.errors',
+        qualname=typename.rsplit('.', 1)[-1],
+        bases=bases,
+    )
+
+
+DOCUMENT = dict(
+    types=[
+        entry(
+            'remote.NotFound',
+            ['remote.ApiError'],
+            properties=dict(
+                name=dict(title="A name", type='string'),
+                ids=dict(title="Some ids", type='array', items=dict(type='integer')),
+            ),
+            required=['name'],
+            status=404,
+        ),
+        entry('remote.ApiError', ['rjgtoys.xc.Error']),
+    ]
+)
+
+
+def test_synthesize():
+
+    types = synthesize(DOCUMENT)
+
+    api = types['remote.ApiError']
+    not_found = types['remote.NotFound']
+
+    assert issubclass(not_found, api)
+    assert issubclass(api, Error)
+    assert not_found.status == 404
+
+    e = Error.from_obj(dict(type='remote.NotFound', content=dict(name='x', ids=['1'])))
+
+    assert isinstance(e, not_found)
+    assert isinstance(e, api)
+    assert e.ids == [1]
+    assert str(e) == "Failed: x"
+    assert e.to_dict()['title'] == "The remote.NotFound error"
+
+    # Making them again gives the same classes
+
+    assert synthesize(DOCUMENT) == types
+
+
+def test_synthesize_prefers_real_classes():
+
+    document = dict(types=[entry(Bug.typename, ['rjgtoys.xc._xc.XC'])])
+
+    assert synthesize(document)[Bug.typename] is Bug
+
+
+def test_synthesize_replaces_changed():
+
+    types = synthesize(dict(types=[entry('remote.Changing', [])]))
+    changed = synthesize(dict(types=[entry('remote.Changing', [], status=409)]))
+
+    assert changed['remote.Changing'] is not types['remote.Changing']
+    assert changed['remote.Changing'].status == 409
+
+
+class CatalogueHandler(http.server.BaseHTTPRequestHandler):
+
+    etag = '"1"'
+    requests = []
+
+    def do_GET(self):
+        self.requests.append(self.headers.get('If-None-Match'))
+
+        if self.headers.get('If-None-Match') == self.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        body = json.dumps(DOCUMENT).encode('utf-8')
+        self.send_response(200)
+        self.send_header('ETag', self.etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = http.server.HTTPServer(('127.0.0.1', 0), CatalogueHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    CatalogueHandler.requests = []
+    yield 'http://127.0.0.1:%d/errors' % (httpd.server_address[1])
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_fetch_cached(server, tmp_path):
+
+    path = str(tmp_path / 'errors.json')
+
+    assert fetch_catalogue(server, path) == DOCUMENT
+    assert fetch_catalogue(server, path) == DOCUMENT
+
+    assert CatalogueHandler.requests == [None, '"1"']
+
+    types = load_catalogue(server, path)
+    assert set(types) == {'remote.ApiError', 'remote.NotFound'}
+
+
+def test_fetch_unreachable(server, tmp_path):
+
+    path = str(tmp_path / 'errors.json')
+    fetch_catalogue(server, path)
+
+    assert fetch_catalogue('http://127.0.0.1:1/errors', path) == DOCUMENT
@@ -0,0 +1,93 @@
+"""
+Test Result, Ok and Err, and their use with @raises
+"""
+
+import pytest
+
+from rjgtoys.xc import Error, Result, Ok, Err, BadExceptionBug
+from rjgtoys.xc.raises import raises, may_raise
+
+
+class NotFound(Error):
+
+    key: str
+
+    detail = "Not found: {key}"
+
+
+class Forbidden(Error):
+
+    key: str
+
+
+def test_ok():
+
+    r = Ok(42)
+
+    assert r
+    assert r.ok
+    assert r.unwrap() == 42
+    assert r.value_or(0) == 42
+    assert r == Ok(42)
+
+
+def test_err():
+
+    r = Err(NotFound, key='k')
+
+    assert not r
+    assert r.value_or(0) == 0
+    assert r.exception() == NotFound(key='k')
+
+    with pytest.raises(NotFound):
+        r.unwrap()
+
+
+def test_err_from_exception():
+
+    assert Err.from_exception(NotFound(key='k')) == Err(NotFound, key='k')
+
+
+def test_capture():
+
+    def fail():
+        raise NotFound(key='k')
+
+    assert Result.capture(lambda: 1) == Ok(1)
+    assert Result.capture(fail) == Err(NotFound, key='k')
+    assert Result.capture(lambda: Err(NotFound, key='j')) == Err(NotFound, key='j')
+
+
+@raises(NotFound, result=True)
+def lookup(key, how):
+    """Look something up."""
+
+    if how == 'ok':
+        return Ok(key)
+    if how == 'err':
+        return Err(NotFound, key=key)
+    if how == 'raise':
+        raise NotFound(key=key)
+    if how == 'forbidden':
+        return Err(Forbidden, key=key)
+    raise KeyError(key)
+
+
+def test_raises_result():
+
+    assert may_raise(lookup) == {NotFound}
+
+    assert lookup('a', 'ok') == Ok('a')
+    assert lookup('a', 'err') == Err(NotFound, key='a')
+    assert lookup('a', 'raise') == Err(NotFound, key='a')
+
+
+def test_raises_result_bad():
+
+    with pytest.raises(BadExceptionBug) as e:
+        lookup('a', 'forbidden')
+
+    assert e.value.raised == Forbidden(key='a')
+
+    with pytest.raises(BadExceptionBug):
+        lookup('a', 'other')
@@ -0,0 +1,111 @@
+"""
+Tests for the Starlette helpers.
+"""
+
+import pytest
+
+pytest.importorskip('starlette')
+
+from starlette.applications import Starlette
+from starlette.testclient import TestClient
+
+from rjgtoys.xc import Bug, Error, Title, XCGroup
+from rjgtoys.xc._json import json_dumps
+from rjgtoys.xc.starlette import StreamingJSONResponse, catalogue_route, handle_xc
+
+
+class ServedError(Error):
+    """Base of the served errors."""
+
+
+class FirstServed(ServedError):
+    """The first served error."""
+
+    status = 404
+
+    name: str = Title("A name")
+
+
+@pytest.fixture
+def client():
+    app = Starlette(routes=[catalogue_route('/errors', base=ServedError)])
+    return TestClient(app)
+
+
+def test_catalogue_served(client):
+
+    r = client.get('/errors')
+
+    assert r.status_code == 200
+    types = r.json()['types']
+    assert [t['type'] for t in types] == [FirstServed.typename, ServedError.typename]
+    assert types[0]['status'] == 404
+    assert types[0]['schema']['required'] == ['name']
+
+
+def test_catalogue_conditional(client):
+
+    r = client.get('/errors')
+    etag = r.headers['etag']
+
+    r = client.get('/errors', headers={'If-None-Match': etag})
+    assert r.status_code == 304
+    assert r.headers['etag'] == etag
+
+    r = client.get('/errors', headers={'If-None-Match': '"other", W/%s' % (etag)})
+    assert r.status_code == 304
+
+    r = client.get('/errors', headers={'If-None-Match': '"other"'})
+    assert r.status_code == 200
+
+
+def test_catalogue_refreshed(client):
+
+    etag = client.get('/errors').headers['etag']
+
+    class Unrelated(Bug):
+        """Not served."""
+
+    r = client.get('/errors', headers={'If-None-Match': etag})
+    assert r.status_code == 304
+
+    class SecondServed(ServedError):
+        """The second served error."""
+
+    r = client.get('/errors', headers={'If-None-Match': etag})
+    assert r.status_code == 200
+    assert r.headers['etag'] != etag
+    assert SecondServed.typename in [t['type'] for t in r.json()['types']]
+
+
+def test_group_streamed():
+
+    errors = [FirstServed(name='n%d' % (i)) for i in range(1000)]
+
+    async def fail(request):
+        raise XCGroup(errors, message="Batch failed")
+
+    app = Starlette()
+    app.add_route('/fail', fail)
+    app.add_exception_handler(Error, handle_xc)
+
+    r = TestClient(app).get('/fail')
+
+    assert r.status_code == XCGroup.status
+    assert r.headers['content-type'] == 'application/problem+json'
+    assert 'content-length' not in r.headers
+    assert r.text == json_dumps(XCGroup(errors, message="Batch failed").to_dict())
+
+
+def test_streaming_json_response():
+
+    async def big(request):
+        return StreamingJSONResponse({'items': list(range(10000))}, chunk_size=100)
+
+    app = Starlette()
+    app.add_route('/big', big)
+
+    r = TestClient(app).get('/big')
+
+    assert r.headers['content-type'] == 'application/json'
+    assert r.json() == {'items': list(range(10000))}
@@ -0,0 +1,422 @@
+"""
+Tests for :class:`Thing` and its helpers.
+"""
+
+import collections.abc
+
+import pytest
+
+from rjgtoys.xc._thing import (
+    CompactThing,
+    Thing,
+    ThingChain,
+    ThingPath,
+    ThingPaths,
+    compact_thing,
+    compile_path,
+    record_class,
+)
+from rjgtoys.xc._json import json_loads
+
+
+DOC = json_loads(
+    """
+    {
+        "server": {"host": "localhost", "port": 8000},
+        "a": {"b": {"c": {"d": 1}}},
+        "dotted.key": 2,
+        "x": {"dotted.key": 3},
+        "plain": {"inner": {"value": 4}},
+        "list": [1, 2, 3]
+    }
+    """
+)
+
+
+def test_dotted_getitem():
+
+    assert DOC['server.port'] == 8000
+    assert DOC['a.b.c.d'] == 1
+    assert DOC['dotted.key'] == 2
+    assert DOC['x.dotted.key'] == 3
+    assert DOC.a.b.c.d == 1
+
+    with pytest.raises(KeyError):
+        DOC['server.missing']
+
+    with pytest.raises(KeyError):
+        DOC['list.0']
+
+
+def test_compiled_path():
+
+    p = compile_path('a.b.c.d')
+
+    assert isinstance(p, ThingPath)
+    assert compile_path('a.b.c.d') is p
+
+    assert p.get(DOC) == 1
+    assert p(DOC) == 1
+
+    assert compile_path('a.b.missing').get(DOC, None) is None
+    assert compile_path('server.port.more').get(DOC, 'default') == 'default'
+
+    with pytest.raises(KeyError):
+        compile_path('a.b.missing').get(DOC)
+
+
+def test_compiled_path_plain_dicts():
+
+    assert compile_path('inner.value').get({'inner': {'value': 5}}) == 5
+
+
+def test_get_path():
+
+    assert DOC.get_path('plain.inner.value') == 4
+    assert DOC.get_path('plain.inner.missing') is None
+    assert DOC.get_path('plain.inner.missing', 0) == 0
+
+
+def test_get_paths():
+
+    paths = ('server.host', 'server.port', 'nowhere', 'x.dotted.key')
+    expected = ('localhost', 8000, None, 3)
+
+    assert DOC.get_paths(paths) == expected
+    assert ThingPaths(paths).get(DOC) == expected
+    assert ThingPaths(paths)(DOC, default=0)[2] == 0
+
+
+def test_merge():
+
+    t = Thing(a=Thing(b=1, c=2), d={'e': 3}, f=[1])
+    t.merge({'a': {'b': 10}, 'd': {'g': 4}, 'f': [2]})
+
+    assert t == {'a': {'b': 10, 'c': 2}, 'd': {'e': 3, 'g': 4}, 'f': [2]}
+
+
+def deep(depth, leaf):
+    d = leaf
+    for _ in range(depth):
+        d = {'n': d}
+    return d
+
+
+def test_merge_deep():
+
+    t = Thing(deep(5000, {'x': 1}))
+    t.merge(deep(5000, {'y': 2}))
+
+    inner = t
+    for _ in range(5000):
+        inner = inner['n']
+    assert inner == {'x': 1, 'y': 2}
+
+
+def test_merged():
+
+    base = {'server': {'host': 'localhost', 'port': 80}, 'shared': {'s': 1}, 'l': [1]}
+    site = {'server': {'port': 8000}, 'l': [2], 'tags': {'a'}}
+    local = {'server': {'debug': True}, 'l': [3], 'tags': {'b'}}
+
+    m = Thing.merged(base, site, local)
+
+    assert m == {
+        'server': {'host': 'localhost', 'port': 8000, 'debug': True},
+        'shared': {'s': 1},
+        'l': [3],
+        'tags': {'a', 'b'},
+    }
+    assert m.server.port == 8000
+
+    # Unchanged subtrees are shared, and the layers are not changed
+
+    assert m['shared'] is base['shared']
+    assert base['server'] == {'host': 'localhost', 'port': 80}
+
+
+def test_merged_rules():
+
+    layers = ({'l': [1], 's': {1}}, {'l': [2], 's': {2}}, {'l': [3], 's': {3}})
+
+    m = Thing.merged(*layers, lists='extend', sets='replace')
+
+    assert m == {'l': [1, 2, 3], 's': {3}}
+
+    # Values of different kinds are not merged
+
+    m = Thing.merged({'l': [1]}, {'l': 'x'}, {'l': [2]}, lists='extend')
+    assert m == {'l': [2]}
+
+    m = Thing.merged({'a': {'b': 1}}, {'a': None}, {'a': {'c': 2}})
+    assert m == {'a': {'c': 2}}
+
+    with pytest.raises(ValueError):
+        Thing.merged(lists='other')
+
+
+def test_merged_deep():
+
+    m = Thing.merged(deep(5000, {'x': 1}), deep(5000, {'y': 2}))
+
+    inner = m
+    for _ in range(5000):
+        inner = inner['n']
+    assert inner == {'x': 1, 'y': 2}
+
+
+@pytest.fixture
+def chain():
+    defaults = json_loads(
+        '{"server": {"host": "localhost", "port": 80, "tls": {"on": false}}, "name": "d"}'
+    )
+    env = Thing(server=Thing(port=8000, tls=Thing(on=True)))
+    request = {'server': {'host': 'example.com'}}
+    return (ThingChain(request, env, defaults), request, env, defaults)
+
+
+def test_chain_lookup(chain):
+
+    (c, request, env, defaults) = chain
+
+    assert c.name == 'd'
+    assert c.server.host == 'example.com'
+    assert c.server.port == 8000
+    assert c.server.tls.on is True
+    assert c['server.port'] == 8000
+    assert c['server.tls.on'] is True
+    assert c.get('server.missing') is None
+    assert dict(c.server.tls) == {'on': True}
+
+    with pytest.raises(KeyError):
+        c['nowhere']
+
+
+def test_chain_shadowing():
+
+    c = ThingChain({'a': 1}, {'a': {'b': 2}})
+
+    assert c.a == 1
+    assert c.get('a.b') is None
+
+
+def test_chain_cached(chain):
+
+    (c, request, env, defaults) = chain
+
+    assert c.server is c.server
+    assert c['server.port'] == 8000
+
+    # Changes to Things are noticed
+
+    env['server']['port'] = 9000
+    assert c['server.port'] == 9000
+
+    env['server'] = Thing(port=8080)
+    assert c['server.port'] == 8080
+    assert c.server.port == 8080
+
+    # Changes to other maps need invalidate()
+
+    assert c.server.host == 'example.com'
+    request['server']['host'] = 'example.org'
+    assert c.server.host == 'example.com'
+    c.invalidate()
+    assert c.server.host == 'example.org'
+
+
+def test_chain_watches_own_maps(chain):
+
+    import copy
+    import pickle
+
+    (c, request, env, defaults) = chain
+
+    assert c.server.port == 8000
+
+    # Writing to a Thing outside the chain leaves the cache alone
+
+    other = Thing(x=1)
+    other.x = 2
+    assert Thing.__setattr__ is dict.__setitem__
+    assert c._cache
+
+    # Things in the chain are still Things, and copy as plain ones
+
+    assert isinstance(env, Thing)
+    assert type(copy.copy(env)) is Thing
+    assert type(pickle.loads(pickle.dumps(env))) is Thing
+    assert pickle.loads(pickle.dumps(env)) == env
+
+    env.server.port = 9000
+    assert not c._cache
+    assert c.server.port == 9000
+
+
+def test_chain_contains(chain):
+
+    (c, request, env, defaults) = chain
+
+    assert 'server' in c
+    assert 'server.port' in c
+    assert 'server.tls.on' in c
+    assert 'server.missing' not in c
+    assert 'nowhere' not in c
+
+
+def test_chain_changes(chain):
+
+    (c, request, env, defaults) = chain
+
+    assert c['server.port'] == 8000
+
+    c.server.port = 1234
+    assert c['server.port'] == 1234
+    assert request['server']['port'] == 1234
+
+    c.name = 'r'
+    assert c.name == 'r'
+    assert request['name'] == 'r'
+
+    del c.name
+    assert c.name == 'd'
+
+    assert c.new_child({'name': 'child'}).name == 'child'
+
+
+def test_chain_protocols(chain):
+
+    import copy
+    import pickle
+
+    (c, request, env, defaults) = chain
+
+    assert not hasattr(c, '__html__')
+    assert copy.copy(c).server.port == 8000
+    assert pickle.loads(pickle.dumps(c)).server.port == 8000
+
+
+def test_compact_json():
+
+    text = '{"type": "x", "content": {"name": "a", "inner": {"n": 1}}, "list": [{"n": 2}]}'
+
+    t = json_loads(text, compact=True)
+
+    assert isinstance(t, CompactThing)
+    assert t == json_loads(text)
+    assert t.content.name == 'a'
+    assert t['content.inner.n'] == 1
+    assert t.list[0].n == 2
+    assert t.get('missing') is None
+    assert 'type' in t
+    assert list(t) == ['type', 'content', 'list']
+
+    with pytest.raises(KeyError):
+        t['content.missing']
+
+    with pytest.raises(AttributeError):
+        t.type = 'y'
+
+
+def test_compact_sharing():
+
+    a = json_loads('{"type": "x", "content": {}}', compact=True)
+    b = json_loads('{"type": "y", "content": {}}', compact=True)
+
+    assert a._shape is b._shape
+    assert a.type == 'x' and b.type == 'y'
+
+
+def test_compact_fallback():
+
+    # Duplicate keys, and lots of keys, make a Thing
+
+    t = json_loads('{"a": 1, "a": 2}', compact=True)
+    assert type(t) is Thing
+    assert t == {'a': 2}
+
+    many = dict(('k%d' % i, i) for i in range(100))
+    assert type(compact_thing(list(many.items()))) is Thing
+
+
+def test_compact_pickle():
+
+    import pickle
+
+    t = json_loads('{"a": {"b": [1, 2]}}', compact=True)
+    u = pickle.loads(pickle.dumps(t))
+
+    assert u == t
+    assert u._shape is t._shape
+
+
+def test_record_from_example():
+
+    Report = record_class(json_loads('{"type": "", "status": 0, "content": {}}'), name='Report')
+
+    r = json_loads('{"type": "x", "status": 400, "content": {"a": {"b": 1}}}', records=[Report])
+
+    assert type(r) is Report
+    assert isinstance(r, collections.abc.Mapping)
+    assert r == {'type': 'x', 'status': 400, 'content': {'a': {'b': 1}}}
+    assert r.type == 'x'
+    assert r.status == 400
+    assert r.content.a.b == 1
+    assert r['content.a.b'] == 1
+    assert r.get('missing', 2) == 2
+    assert list(r) == ['type', 'status', 'content']
+    assert len(r) == 3
+
+    # Nested objects that don't fit are Things
+
+    assert type(r.content) is Thing
+
+    with pytest.raises(KeyError):
+        r['missing']
+
+    with pytest.raises(AttributeError):
+        r.type = 'y'
+
+
+def test_record_order_and_fallback():
+
+    Report = record_class(dict(type='', status=0), name='Report')
+
+    r = json_loads('{"status": 1, "type": "x"}', records=[Report])
+    assert type(r) is Report
+    assert r.type == 'x' and r.status == 1
+
+    # Missing, extra and repeated keys don't fit
+
+    for text in ('{"type": "x"}', '{"type": "x", "status": 1, "more": 2}', '{"type": 1, "type": 2, "status": 3}'):
+        assert type(json_loads(text, records=[Report])) is Thing
+
+
+def test_record_from_schema():
+
+    schema = dict(
+        properties=dict(type={}, status=dict(default=500), detail={}),
+        required=['type'],
+    )
+
+    Report = record_class(schema=schema, name='Report')
+
+    r = json_loads('{"type": "x"}', records=[Report])
+    assert type(r) is Report
+    assert r == dict(type='x', status=500, detail=None)
+
+
+def test_record_pickle():
+
+    import pickle
+
+    r = Record((1, {'b': 2}))
+    u = pickle.loads(pickle.dumps(r))
+
+    assert type(u) is Record
+    assert u == r
+
+
+# Records must be declared at module level to be pickled
+
+Record = record_class(dict(a=None, c=None), name='Record')
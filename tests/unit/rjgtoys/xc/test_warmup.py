@@ -0,0 +1,89 @@
+"""
+Tests for preparing exception classes before forking.
+"""
+
+import gc
+
+import pytest
+
+from rjgtoys.xc import Error, Title, BadExceptionBug, declare_types
+from rjgtoys.xc import _xc
+from rjgtoys.xc.warmup import warmup, main
+
+
+def test_warmup_builds_models():
+    class Unprepared(Error):
+        """An exception that has not been used."""
+
+        name: str = Title("A name")
+
+    assert '_xc_model' not in Unprepared.__dict__
+
+    classes = warmup([], freeze=False)
+
+    assert Unprepared in classes
+    assert BadExceptionBug in classes
+    assert '_xc_model' in Unprepared.__dict__
+    assert '_xc_schema' in Unprepared.__dict__
+
+
+def test_warmup_imports_modules_from_env(monkeypatch):
+
+    monkeypatch.setenv('RJGTOYS_XC_WARMUP', 'rjgtoys.xc._group, ')
+
+    classes = warmup(freeze=False)
+
+    assert 'rjgtoys.xc.XCGroup' in [c.typename for c in classes]
+
+
+def test_warmup_command(capsys):
+
+    main(['rjgtoys.xc._group'])
+
+    assert capsys.readouterr().out.startswith("Prepared ")
+
+
+def test_warmup_reports_failures():
+
+    class Unbuildable(Error):
+        """An exception whose schema can't be built."""
+
+        thing: object
+
+        @classmethod
+        def content_schema(cls):
+            raise ValueError("no schema")
+
+    failed = []
+
+    classes = warmup([], freeze=False, on_error=lambda cls, e: failed.append(cls))
+
+    assert Unbuildable in failed
+    assert Unbuildable not in classes
+    assert BadExceptionBug in classes
+
+    with pytest.warns(RuntimeWarning):
+        warmup([], freeze=False)
+
+    # Don't leave it for other tests to find
+
+    del Unbuildable, failed
+    gc.collect()
+
+
+def test_warmup_declared(monkeypatch, tmp_path):
+
+    (tmp_path / 'warmed_module.py').write_text(
+        'from rjgtoys.xc import Error\n'
+        '\n'
+        'class Warmed(Error):\n'
+        '    typename = "test.Warmed"\n'
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(_xc._XCType, '_locations', {})
+    monkeypatch.setattr(_xc._XCType, '_entry_points_loaded', True)
+    declare_types({'test.Warmed': 'warmed_module:Warmed'})
+
+    classes = warmup([], freeze=False, declared=True)
+
+    assert 'test.Warmed' in [c.typename for c in classes]
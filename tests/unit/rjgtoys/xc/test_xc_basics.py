@@ -4,7 +4,7 @@ import json
 from pytest import raises
 
 
-from rjgtoys.xc import Bug, Error
+from rjgtoys.xc import Bug, Error, UnknownXC
 
 class ExampleError(Error):
 
@@ -59,18 +59,65 @@ def test_example_from_json():
     assert isinstance(e, ExampleError)
 
 
-def test_example_from_json_fails():
+def test_example_from_json_unknown():
 
     data = """
         {
-            "type": "NoSuchError"
+            "type": "NoSuchError",
+            "detail": "Something failed",
+            "status": 409,
+            "content": {"name": "thing"}
         }
     """
 
+    e = Error.from_json(data)
+
+    assert isinstance(e, UnknownXC)
+    assert isinstance(e, Error)
+    assert e.typename == "NoSuchError"
+    assert e.status == 409
+    assert e.name == "thing"
+    assert str(e) == "Something failed"
+    assert e.to_dict() == json.loads(data)
+
+    assert Error.from_json(data) == e
+    assert type(Bug.from_json(data)) is not type(e)
+    assert isinstance(Bug.from_json(data), Bug)
+
+
+def test_unknown_compact():
+
+    from rjgtoys.xc._json import json_loads
+    from rjgtoys.xc._xc import _compact_json
+
+    data = '{"type": "NoSuchError", "content": {"name": "thing", "items": [{"n": 1}]}}'
+
+    e = Error.from_obj(json_loads(data, compact=True))
+
+    assert isinstance(e, UnknownXC)
+    assert json.loads(json.dumps(e.to_dict())) == json.loads(data)
+    assert _compact_json(e._content_dict()) == '{"items":[{"n":1}],"name":"thing"}'
+
+
+def test_unknown_of_class_with_required_fields():
+
+    data = dict(type="NoSuchError", detail="Something failed", content={})
+
+    e = ExampleError.from_obj(data)
+
+    assert isinstance(e, UnknownXC)
+    assert isinstance(e, ExampleError)
+    assert str(e) == "Something failed"
+
+
+def test_example_from_json_fails():
+
+    data = ExampleError(name='example', code=1).to_dict()
+
     with raises(TypeError) as e:
-        Error.from_json(data)
+        Bug.from_obj(data)
 
-    assert str(e.value) == "No Error type NoSuchError"
+    assert str(e.value) == "No Bug type %s" % (ExampleError.typename)
 
 
 def test_example_parse_json():
@@ -109,3 +156,97 @@ def test_defaulted_ok():
     assert e.label == "missing"
 
 
+
+
+class LightweightError(Error):
+
+    lightweight = True
+
+    key: str
+
+
+def test_lightweight_is_not_content():
+
+    e = LightweightError(key='k')
+
+    assert e.lightweight
+    assert e.to_dict()['content'] == dict(key='k')
+
+
+def test_lightweight_suppresses_context():
+
+    with raises(LightweightError) as e:
+        try:
+            raise KeyError('k')
+        except KeyError:
+            raise LightweightError(key='k')
+
+    assert e.value.__suppress_context__
+
+
+def test_detach():
+
+    with raises(ExampleError) as e:
+        try:
+            raise KeyError('k')
+        except KeyError:
+            raise ExampleError(name='detach', code=5)
+
+    assert e.value.__traceback__ is not None
+    assert e.value.__context__ is not None
+
+    assert e.value.detach() is e.value
+
+    assert e.value.__traceback__ is None
+    assert e.value.__context__ is None
+
+
+def test_example_pickle():
+
+    import pickle
+
+    e = ExampleError(name='pickled', code=4)
+    f = pickle.loads(pickle.dumps(e))
+
+    assert f == e
+    assert str(f) == str(e)
+
+    u = Error.from_obj(dict(type='NoSuchError', detail='Something failed', content=dict(name='x')))
+    v = pickle.loads(pickle.dumps(u))
+
+    assert type(v) is type(u)
+    assert v == u
+    assert v.name == 'x'
+
+
+def test_title_is_a_pydantic_field():
+
+    from pydantic import BaseModel
+    from pydantic.fields import FieldInfo
+
+    from rjgtoys.xc import Title
+
+    assert isinstance(Title("A name"), FieldInfo)
+
+    class Model(BaseModel):
+
+        name: str = Title("A name")
+
+    assert Model.schema()['properties']['name']['title'] == "A name"
+
+    with raises(ValueError):
+        Model()
+
+
+def test_title_in_exception():
+
+    from rjgtoys.xc import Title
+
+    class Titled(Error):
+
+        name: str = Title("A name")
+
+    assert Titled._model.schema()['properties']['name']['title'] == "A name"
+
+    with raises(ValueError):
+        Titled()
@@ -0,0 +1,117 @@
+"""
+Test the compact binary encoding of XC exceptions.
+"""
+
+import gc
+import weakref
+
+from pytest import raises
+
+from rjgtoys.xc import Error, XC
+from rjgtoys.xc._xc import _XCType
+from rjgtoys.xc._cbor import cbor_dumps, cbor_loads
+
+
+class BinaryError(Error):
+
+    name: str
+
+    items: list = []
+
+    detail = "Binary error: name={name}"
+
+
+class CodedError(Error):
+
+    typecode = 12345
+
+
+def test_cbor_round_trip():
+
+    data = dict(
+        s="text",
+        i=[0, 23, 24, 255, 65536, 2 ** 40, -1, -500, 2 ** 70, -(2 ** 70)],
+        f=1.5,
+        b=b'\x00\x01',
+        t=True,
+        n=None,
+        nested=dict(a=[dict(b=1)]),
+    )
+
+    assert cbor_loads(cbor_dumps(data)) == data
+
+
+def test_cbor_keys_sorted():
+
+    assert cbor_dumps(dict(b=1, a=2)) == cbor_dumps(dict(a=2, b=1))
+
+
+def test_cbor_truncated():
+
+    with raises(ValueError):
+        cbor_loads(cbor_dumps(["abc"])[:-1])
+
+
+def test_typecode_registered():
+
+    assert _XCType.by_code(BinaryError.typecode) is BinaryError
+    assert _XCType.by_code(CodedError.typecode) is CodedError
+    assert CodedError.typecode == 12345
+
+
+def test_typecode_clash():
+
+    class ClashingError(Error):
+
+        typecode = 12345
+
+    data = CodedError().to_bytes()
+
+    with raises(TypeError):
+        _XCType.by_code(12345)
+
+    with raises(TypeError):
+        Error.from_bytes(data)
+
+    # Once the clashing class has gone, the code is usable again
+
+    del ClashingError
+    gc.collect()
+
+    assert _XCType.by_code(12345) is CodedError
+    assert Error.from_bytes(data) == CodedError()
+
+
+def test_registry_is_weak():
+
+    def declare():
+        class Temporary(Error):
+            pass
+
+        return weakref.ref(Temporary)
+
+    ref = declare()
+    gc.collect()
+
+    assert ref() is None
+
+
+def test_binary_round_trip():
+
+    e = BinaryError(name='bin', items=[1, 'two', 3.0, dict(four=4)])
+
+    data = e.to_bytes()
+
+    f = Error.from_bytes(data)
+
+    assert f == e
+    assert f.to_dict() == e.to_dict()
+
+
+def test_binary_wrong_base():
+
+    class Unrelated(XC):
+        pass
+
+    with raises(TypeError):
+        Error.from_bytes(Unrelated().to_bytes())
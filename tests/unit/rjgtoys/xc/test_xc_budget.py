@@ -0,0 +1,115 @@
+"""
+Test size budgets in XC.to_dict()
+"""
+
+import json
+
+from rjgtoys.xc import Error, XC
+
+
+class ManyFailed(Error):
+
+    ids: list
+
+    why: str = "unknown"
+
+    detail = "Failed ids: {ids}"
+
+
+class LimitedFailed(ManyFailed):
+
+    size_budget = 100
+
+
+def test_no_budget():
+
+    e = ManyFailed(ids=list(range(10)))
+
+    data = e.to_dict()
+
+    assert 'truncated' not in data
+    assert '?' in data['instance']
+
+
+def test_within_budget():
+
+    e = ManyFailed(ids=list(range(10)))
+
+    data = e.to_dict(budget=1000)
+
+    assert 'truncated' not in data
+    assert data['content'] == e.to_dict()['content']
+    assert data['instance'].startswith(ManyFailed.typename + '#')
+
+
+def test_over_budget():
+
+    e = ManyFailed(ids=list(range(10000)), why='x' * 1000)
+
+    data = e.to_dict(budget=500)
+
+    assert len(json.dumps(data['content'], separators=(',', ':'))) <= 500
+    assert len(data['detail']) < 600
+
+    truncated = data['truncated']
+    assert truncated['ids']['length'] == 10000
+    assert truncated['ids']['kept'] == len(data['content']['ids'])
+    assert data['content']['ids'] == list(range(truncated['ids']['kept']))
+    assert truncated['why']['length'] == 1000
+
+
+def test_instance_is_content_addressed():
+
+    a = ManyFailed(ids=list(range(10000)))
+    b = ManyFailed(ids=list(range(10000)))
+    c = ManyFailed(ids=list(range(10001)))
+
+    assert a.to_dict(budget=100)['instance'] == b.to_dict(budget=100)['instance']
+    assert a.to_dict(budget=100)['instance'] != c.to_dict(budget=100)['instance']
+
+
+def test_class_budget():
+
+    e = LimitedFailed(ids=list(range(1000)))
+
+    data = e.to_dict()
+
+    assert 'ids' in data['truncated']
+
+    # Can still be decoded
+
+    f = XC.from_obj(data)
+
+    assert isinstance(f, LimitedFailed)
+
+
+def test_over_budget_non_ascii():
+
+    e = ManyFailed(ids=[], why='é' * 5000)
+
+    data = e.to_dict(budget=1000)
+
+    assert len(json.dumps(data['content'], separators=(',', ':'))) <= 1000
+    assert data['truncated']['why']['kept'] == len(data['content']['why'])
+    assert data['content']['why'] == 'é' * data['truncated']['why']['kept']
+
+
+class WhyFailed(ManyFailed):
+
+    detail = "Failed because {why}"
+
+
+def test_detail_is_truncated_content():
+
+    e = WhyFailed(ids=[], why='x' * 10000)
+
+    data = e.to_dict(budget=500)
+
+    assert data['detail'] == "Failed because " + data['content']['why']
+
+
+def test_type_hints():
+
+    import typing
+
+    assert typing.get_type_hints(XC)['size_budget'] == typing.Optional[int]
@@ -0,0 +1,130 @@
+"""
+Tests for classes that are imported when their typename is first seen.
+"""
+
+import sys
+import zlib
+
+import pytest
+
+from rjgtoys.xc import Error, UnknownXC, declare_types
+from rjgtoys.xc import _xc
+from rjgtoys.xc._cbor import cbor_dumps
+
+MODULE = '''
+from rjgtoys.xc import Error
+
+class Declared(Error):
+    """A declared error."""
+
+    typename = "{typename}"
+
+    name: str
+'''
+
+
+@pytest.fixture
+def locations(monkeypatch, tmp_path):
+    """Provide a fresh set of declarations, and somewhere to put modules."""
+
+    monkeypatch.setattr(_xc._XCType, '_locations', {})
+    monkeypatch.setattr(_xc._XCType, '_entry_points_loaded', False)
+    monkeypatch.setattr(_xc, '_entry_point_locations', lambda: {})
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    def make_module(module, typename):
+        (tmp_path / (module + '.py')).write_text(MODULE.format(typename=typename))
+
+    return make_module
+
+
+def test_declared_type_imported(locations):
+
+    locations('declared_one', 'test.DeclaredOne')
+    declare_types({'test.DeclaredOne': 'declared_one:Declared'})
+
+    assert 'declared_one' not in sys.modules
+
+    e = Error.from_obj(dict(type='test.DeclaredOne', content=dict(name='x')))
+
+    assert type(e) is sys.modules['declared_one'].Declared
+    assert e.name == 'x'
+
+
+def test_declared_type_by_code(locations):
+
+    locations('declared_two', 'test.DeclaredTwo')
+    declare_types({'test.DeclaredTwo': 'declared_two:Declared'})
+
+    data = cbor_dumps([zlib.crc32(b'test.DeclaredTwo'), dict(name='x')])
+
+    e = Error.from_bytes(data)
+
+    assert type(e) is sys.modules['declared_two'].Declared
+    assert e.name == 'x'
+
+
+def test_entry_point_type(locations, monkeypatch):
+
+    locations('declared_three', 'test.DeclaredThree')
+    monkeypatch.setattr(
+        _xc,
+        '_entry_point_locations',
+        lambda: {'test.DeclaredThree': 'declared_three:Declared'},
+    )
+
+    e = Error.from_obj(dict(type='test.DeclaredThree', content=dict(name='x')))
+
+    assert type(e) is sys.modules['declared_three'].Declared
+
+
+def test_declared_type_missing(locations):
+
+    declare_types(
+        {
+            'test.NoModule': 'no_such_module:Declared',
+            'test.NoClass': 'sys:NoSuchClass',
+        }
+    )
+
+    for typename in ('test.NoModule', 'test.NoClass'):
+        e = Error.from_obj(dict(type=typename, content=dict(name='x')))
+
+        assert isinstance(e, UnknownXC)
+        assert e.name == 'x'
+
+
+SLOW_MODULE = '''
+import time
+
+time.sleep(0.2)
+
+from rjgtoys.xc import Error
+
+class Declared(Error):
+    """A declared error that is slow to import."""
+
+    typename = "test.Slow"
+'''
+
+
+def test_declared_type_threads(locations, tmp_path):
+
+    import threading
+
+    (tmp_path / 'declared_slow.py').write_text(SLOW_MODULE)
+    declare_types({'test.Slow': 'declared_slow:Declared'})
+
+    results = []
+
+    def decode():
+        results.append(Error.from_obj(dict(type='test.Slow', content={})))
+
+    threads = [threading.Thread(target=decode) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(results) == 4
+    assert all(type(e) is sys.modules['declared_slow'].Declared for e in results)
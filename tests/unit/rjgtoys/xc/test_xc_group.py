@@ -0,0 +1,171 @@
+"""
+Test XCGroup and XCCollector
+"""
+
+import sys
+import json
+
+import pytest
+
+from rjgtoys.xc import Error, UnknownXC, XC, XCGroup, XCCollector
+
+
+class ItemMissing(Error):
+
+    id: int
+
+    detail = "Item {id} is missing"
+
+
+class ItemTooBig(Error):
+
+    id: int
+    size: int
+
+    detail = "Item {id} is too big: {size}"
+
+
+def make_group():
+    return XCGroup(
+        [ItemMissing(id=1), ItemTooBig(id=2, size=100)], message="Batch failed"
+    )
+
+
+def test_group_members():
+
+    g = make_group()
+
+    assert g.message == "Batch failed"
+    assert str(g) == "Batch failed"
+    assert [type(e) for e in g.exceptions] == [ItemMissing, ItemTooBig]
+
+
+def test_group_only_xc():
+
+    with pytest.raises(TypeError):
+        XCGroup([ValueError('bad')])
+
+
+def test_group_to_dict():
+
+    data = make_group().to_dict()
+
+    assert data['type'] == 'rjgtoys.xc.XCGroup'
+    assert [e['type'] for e in data['errors']] == [
+        ItemMissing.typename,
+        ItemTooBig.typename,
+    ]
+
+    # It's valid JSON
+
+    json.dumps(data)
+
+
+def test_group_from_obj():
+
+    g = make_group()
+
+    h = Error.from_obj(json.loads(json.dumps(g.to_dict())))
+
+    assert isinstance(h, XCGroup)
+    assert h.message == g.message
+    assert list(h.exceptions) == list(g.exceptions)
+
+
+def test_group_bytes():
+
+    g = make_group()
+
+    h = XC.from_bytes(g.to_bytes())
+
+    assert isinstance(h, XCGroup)
+    assert h.to_dict() == g.to_dict()
+
+
+@pytest.mark.skipif(sys.version_info < (3, 11), reason="needs ExceptionGroup")
+def test_group_split():
+
+    (missing, rest) = make_group().split(ItemMissing)
+
+    assert isinstance(missing, XCGroup)
+    assert missing.message == "Batch failed"
+    assert missing.exceptions == (ItemMissing(id=1),)
+    assert rest.exceptions == (ItemTooBig(id=2, size=100),)
+
+
+def test_collector():
+
+    errors = XCCollector(message="Some items failed")
+
+    assert not errors
+    assert errors.group() is None
+
+    errors.check()
+
+    errors.add(ItemMissing, id=1)
+    errors.add(ItemMissing, id=1)
+    errors.add(ItemMissing(id=1))
+    errors.add(ItemTooBig(id=2, size=3))
+
+    assert len(errors) == 2
+
+    with pytest.raises(XCGroup) as e:
+        errors.check()
+
+    assert e.value.message == "Some items failed"
+    assert list(e.value.exceptions) == [ItemMissing(id=1), ItemTooBig(id=2, size=3)]
+
+
+def test_unknown_group():
+
+    data = make_group().to_dict()
+    data['type'] = 'NoSuchGroup'
+
+    g = XCGroup.from_obj(data)
+
+    assert isinstance(g, UnknownXC)
+    assert isinstance(g, XCGroup)
+    assert g.message == "Batch failed"
+    assert [type(e) for e in g.exceptions] == [ItemMissing, ItemTooBig]
+    assert g.to_dict() == data
+
+
+def test_group_pickle():
+
+    import pickle
+
+    g = make_group()
+    u = pickle.loads(pickle.dumps(g))
+
+    assert type(u) is XCGroup
+    assert u == g
+    assert u.message == "Batch failed"
+    assert list(u.exceptions) == list(g.exceptions)
+
+
+def test_group_args():
+
+    g = make_group()
+
+    assert g.args[0] == "Batch failed"
+    assert list(g.args[1]) == list(g.exceptions)
+    assert "Batch failed" in repr(g)
+
+    data = g.to_dict()
+    data['type'] = 'NoSuchGroup'
+    assert XCGroup.from_obj(data).args[0] == "Batch failed"
+
+
+def test_group_budget():
+
+    g = XCGroup([ItemMissing(id=i) for i in range(1000)], message="Many")
+
+    data = g.to_dict(budget=1000)
+
+    assert 1 <= len(data['errors']) < 1000
+    assert len(json.dumps(data['errors'], separators=(',', ':'))) <= 1000
+    assert data['truncated']['errors'] == dict(length=1000, kept=len(data['errors']))
+
+    # Without a budget, all the members are reported
+
+    assert len(g.to_dict()['errors']) == 1000
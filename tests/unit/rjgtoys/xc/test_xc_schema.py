@@ -0,0 +1,135 @@
+"""
+Tests for content schemas.
+"""
+
+import os
+
+import pytest
+
+from pydantic import BaseModel
+
+from rjgtoys.xc import Error, Title, set_schema_cache
+from rjgtoys.xc import _schema
+
+
+class SchemaError(Error):
+    """Base of the schema test errors."""
+
+    name: str = Title("A name")
+
+
+class Inner(BaseModel):
+    """Some nested content."""
+
+    size: int
+
+
+class Nested(Error):
+    """An error with nested content."""
+
+    inner: Inner = Title("Some nested content")
+
+
+def test_content_schema_memoized():
+
+    schema = SchemaError.content_schema()
+
+    assert schema['properties']['name']['title'] == "A name"
+    assert SchemaError.content_schema() is schema
+
+
+@pytest.fixture
+def schema_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(_schema, '_directory', None)
+    set_schema_cache(str(tmp_path))
+    return tmp_path
+
+
+def declare(title):
+    class Cached(Error):
+        """A cached error."""
+
+        name: str = Title(title)
+
+    return Cached
+
+
+def test_content_schema_cached_on_disk(schema_cache):
+
+    first = declare("A name")
+    schema = first.content_schema()
+
+    assert len(os.listdir(str(schema_cache))) == 1
+
+    # The same declaration again is found in the cache,
+    # without building the content model
+
+    again = declare("A name")
+    assert again.content_schema() == schema
+    assert '_xc_model' not in again.__dict__
+
+    # A different one is not
+
+    changed = declare("Another name")
+    assert changed.content_schema()['properties']['name']['title'] == "Another name"
+    assert len(os.listdir(str(schema_cache))) == 2
+
+
+def test_tree_schema():
+
+    schema = SchemaError.tree_schema()
+
+    assert schema['anyOf'] == [{'$ref': '#/definitions/%s' % (SchemaError.typename)}]
+    assert SchemaError.tree_schema() is schema
+
+    class Derived(SchemaError):
+        """A derived error."""
+
+        size: int
+
+    tree = SchemaError.tree_schema()
+
+    assert tree is not schema
+    assert set(tree['definitions']) == {SchemaError.typename, Derived.typename}
+
+
+def test_tree_schema_gathers_definitions():
+
+    tree = Nested.tree_schema()
+
+    inner = tree['definitions'][Nested.typename]['properties']['inner']
+
+    assert inner['allOf'] == [{'$ref': '#/definitions/Inner'}]
+    assert 'size' in tree['definitions']['Inner']['properties']
+
+
+def test_class_key_is_stable():
+
+    from pydantic import Field
+
+    def declare_factory():
+        class Factory(Error):
+            """An error with a default factory."""
+
+            tags: list = Field(default_factory=lambda: [])
+
+        return Factory
+
+    assert _schema.class_key(declare_factory()) == _schema.class_key(declare_factory())
+
+
+def test_class_key_includes_nested_models():
+
+    def declare_nested(size_type):
+        class Part(BaseModel):
+            size: size_type
+
+        class Holder(Error):
+            """An error with nested content."""
+
+            part: Part = Title("A part")
+
+        return Holder
+
+    assert _schema.class_key(declare_nested(int)) == _schema.class_key(declare_nested(int))
+    assert _schema.class_key(declare_nested(int)) != _schema.class_key(declare_nested(str))
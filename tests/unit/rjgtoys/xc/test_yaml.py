@@ -0,0 +1,75 @@
+"""
+Tests for the YAML helpers.
+"""
+
+import io
+import os
+
+import pytest
+
+pytest.importorskip('yaml')
+
+from rjgtoys.xc._thing import FrozenThing, Thing
+from rjgtoys.xc._yaml import yaml_load, yaml_load_file, yaml_loads
+
+DOC = """
+defaults: &defaults
+  host: localhost
+  port: 80
+
+servers:
+  - <<: *defaults
+    name: a
+  - <<: *defaults
+    name: b
+    tags: !!set {x, y}
+"""
+
+
+def test_loads():
+
+    t = yaml_loads(DOC)
+
+    assert type(t) is Thing
+    assert type(t.servers[0]) is Thing
+    assert t.servers[0] == dict(host='localhost', port=80, name='a')
+    assert t['servers'][1].tags == {'x', 'y'}
+    assert t['defaults.port'] == 80
+
+    t.servers[0].port = 81
+    assert t.servers[0].port == 81
+
+
+def test_load_stream():
+
+    assert yaml_load(io.BytesIO(DOC.encode('utf-8'))) == yaml_loads(DOC)
+
+
+def test_unsafe():
+
+    import yaml
+
+    with pytest.raises(yaml.YAMLError):
+        yaml_loads('!!python/object/apply:os.system ["true"]')
+
+
+def test_load_file(tmp_path):
+
+    path = tmp_path / 'config.yaml'
+    path.write_text(DOC)
+
+    t = yaml_load_file(path)
+
+    assert type(t) is FrozenThing
+    assert type(t.servers) is tuple
+    assert t.servers[1].tags == frozenset(['x', 'y'])
+    assert t.servers[1].name == 'b'
+    assert yaml_load_file(str(path)) is t
+
+    with pytest.raises(TypeError):
+        t.servers[0].port = 81
+
+    path.write_text('changed: true\n')
+    os.utime(path, ns=(1, 1))
+
+    assert yaml_load_file(path) == {'changed': True}